@@ -0,0 +1 @@
+# Offline benchmarks for BS23 Frontdesk Agent
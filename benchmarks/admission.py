@@ -0,0 +1,131 @@
+"""Admission control: p95 latency of admitted calls as offered load grows.
+
+Builds the same setup as ``benchmarks.load_test``: the fake Groq server in
+a subprocess, the real client and the compiled graph. For each level in
+``--callers``, that many callers arrive over ``--ramp`` seconds, first
+with every caller admitted and then with ``FrontdeskLoad`` deciding.
+Admission follows the worker's rule: the load is refreshed as each caller
+arrives and every half second, and a caller arriving at or above the
+threshold is handed off (LiveKit would dispatch it to another worker).
+
+The load reads this process's CPU and the loop lag and model requests in
+flight that a ``LoadReporter`` publishes, as a job process's reporter
+would. The fake server's CPU is left out; in production the model runs
+remotely.
+
+Reported per level and mode: callers admitted and handed off, peak
+concurrent calls, and time to first token and loop lag for the admitted
+calls. With admission, p95 should stay flat once the offered load passes
+capacity; without it, every call slows down.
+
+Run from the repository root::
+
+    python -m benchmarks.admission --callers 50,100,200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import shutil
+import tempfile
+import time
+from types import SimpleNamespace
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+os.environ.setdefault("FRONTDESK_ADMISSION", "1")
+
+import bs23_frontdesk_agent
+from benchmarks.load_test import LevelStats, LoopMonitor, caller, percentiles, start_server
+from subagents.admission import FrontdeskLoad, LoadReporter
+from subagents.tool_node import create_tool_nodes
+
+
+async def offer(graph, llm, callers, args, rng, load):
+    """Run one level; ``load`` is ``None`` to admit every caller."""
+    worker = SimpleNamespace(active_jobs=[])
+    stats = LevelStats()
+    result = {"admitted": 0, "handed_off": 0, "peak": 0}
+    # Callers join on arrival, not after another random delay
+    call_args = argparse.Namespace(**{**vars(args), "ramp": 0.0})
+
+    async def refresh():
+        while True:
+            await asyncio.to_thread(load, worker)
+            await asyncio.sleep(0.5)
+
+    async def arrive(caller_rng):
+        await asyncio.sleep(caller_rng.uniform(0, args.ramp))
+        if load is not None and await asyncio.to_thread(load, worker) >= load.threshold:
+            result["handed_off"] += 1
+            return
+        job = object()
+        worker.active_jobs.append(job)
+        result["admitted"] += 1
+        result["peak"] = max(result["peak"], len(worker.active_jobs))
+        try:
+            await caller(graph, llm, call_args, caller_rng, stats)
+        finally:
+            worker.active_jobs.remove(job)
+
+    refresher = asyncio.create_task(refresh()) if load is not None else None
+    monitor = LoopMonitor().start()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        await asyncio.gather(*(arrive(random.Random(rng.random())) for _ in range(callers)))
+    await monitor.stop()
+    if refresher is not None:
+        refresher.cancel()
+        await asyncio.gather(refresher, return_exceptions=True)
+    return result, stats, monitor
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", default="50,100,200", help="comma-separated offered loads")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--think", type=float, default=2.0, help="mean seconds between a caller's turns")
+    parser.add_argument("--ramp", type=float, default=10.0, help="seconds over which callers arrive")
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--tokens-per-second", type=float, default=250.0)
+    parser.add_argument("--threshold", type=float, default=0.75)
+    args = parser.parse_args()
+
+    server, base_url = await start_server(args)
+    os.environ["GROQ_API_BASE"] = base_url
+    directory = tempfile.mkdtemp(prefix="admission-benchmark-")
+    try:
+        http_client = bs23_frontdesk_agent.create_http_client()
+        llm = bs23_frontdesk_agent.create_llm(http_client)
+        graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, tool_nodes=create_tool_nodes())
+        reporter = LoadReporter(directory).start()
+        rng = random.Random(25)
+
+        warm = argparse.Namespace(**{**vars(args), "turns": 2, "think": 0.0, "ramp": 0.0})
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            await caller(graph, llm, warm, rng, LevelStats())
+
+        for callers in (int(level) for level in args.callers.split(",")):
+            for admission in (False, True):
+                load = FrontdeskLoad(directory, threshold=args.threshold, children=False) if admission else None
+                result, stats, monitor = await offer(graph, llm, callers, args, rng, load)
+                first = percentiles(stats.first_token)
+                lag = percentiles(monitor.lags)
+                print(
+                    f"{callers:4d} offered  admission {'on ' if admission else 'off'}  admitted {result['admitted']:4d}  "
+                    f"handed off {result['handed_off']:4d}  peak {result['peak']:4d}  errors {stats.errors}  "
+                    f"first token p50/p95/p99 {first[0]:5.0f}/{first[1]:5.0f}/{first[2]:5.0f} ms  "
+                    f"loop lag p99 {lag[2]:6.1f} ms"
+                )
+                if load is not None:
+                    print(f"{'':14}CPU per call {load.cpu_per_call:.4f} cores, last load {load.components}")
+        await reporter.aclose()
+        await http_client.aclose()
+    finally:
+        server.terminate()
+        await server.wait()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
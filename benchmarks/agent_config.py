@@ -0,0 +1,65 @@
+"""Agent config compile cost: compiling ``frontdesk_english.json`` vs the disk memo.
+
+Reports the time to compile the config into a spec, to load the memoized
+spec by config hash, and to build the LangGraph from a spec, then runs one
+turn through the config-built graph.
+
+Run from the repository root::
+
+    python -m benchmarks.agent_config --runs 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import SPECIALIST_REPLY, measure_turn
+from subagents.agent_config import compile_agent_config, config_hash, load_agent_spec
+from subagents.intent_router import AGENT_CONFIG_PATH
+
+
+def _time(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    config_bytes = AGENT_CONFIG_PATH.read_bytes()
+    llm = LatencyFakeChatModel(reply=SPECIALIST_REPLY, first_token_latency=0.0, token_interval=0.0)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        spec = load_agent_spec(AGENT_CONFIG_PATH, cache_dir)
+        cases = (
+            ("compile", lambda: compile_agent_config(json.loads(config_bytes), config_hash(config_bytes))),
+            ("memo load", lambda: load_agent_spec(AGENT_CONFIG_PATH, cache_dir)),
+            ("graph build", lambda: bs23_frontdesk_agent.create_graph_from_spec(spec, llm)),
+        )
+        for label, fn in cases:
+            samples = _time(fn, args.runs)
+            print(f"{label:<12} p50={statistics.median(samples):7.3f} ms  max={max(samples):7.3f} ms")
+
+    print(f"nodes: {', '.join(spec['nodes'])}")
+    print(f"routes: {spec['routes']}")
+    graph = bs23_frontdesk_agent.create_graph_from_spec(spec, llm)
+    _, _, full = asyncio.run(measure_turn(graph, utterance="Are there any job openings for developers?"))
+    print(f"one turn through the config graph: {full * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
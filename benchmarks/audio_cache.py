@@ -0,0 +1,160 @@
+"""TTS audio cache: time to the first greeting frame and repeated-reply playback.
+
+Uses a latency-controlled fake TTS (``--ttfb`` before the first frame, then
+audio at ``--realtime-factor`` times real time) and the latency fake chat
+model, and compares:
+
+1. The previous greeting: the LLM streams the welcome text and TTS starts
+   on its first sentence.
+2. The fixed welcome text sent straight to TTS (first call, cache miss).
+3. The welcome text played from the memory-mapped cache (every later call).
+
+It then replays a canned reply through ``FrontdeskAgent.tts_node`` to show
+when the reply gets stored and that later plays skip TTS.
+
+Run from the repository root::
+
+    python -m benchmarks.audio_cache
+"""
+
+import argparse
+import asyncio
+import contextlib
+import math
+import os
+import statistics
+import struct
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from livekit import rtc
+from livekit.agents import Agent, tts as agents_tts
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from voice.agent import FrontdeskAgent
+from voice.audio_cache import FRAME_MS, TTSAudioCache
+
+WELCOME = bs23_frontdesk_agent.DEFAULT_WELCOME_MESSAGE
+CANNED_REPLY = "Our office is open Sunday to Thursday, from nine in the morning to six in the evening."
+
+# Roughly how long TTS audio lasts per character of text
+SECONDS_PER_CHAR = 0.06
+
+
+class SynthesizedEvent:
+    def __init__(self, frame):
+        self.frame = frame
+
+
+class LatencyFakeTTS:
+    """Stand-in for a TTS plugin: a tone of the text's spoken length, after a delay."""
+
+    provider = "fake"
+    model = "latency-fake"
+    sample_rate = 24000
+    num_channels = 1
+    capabilities = agents_tts.TTSCapabilities(streaming=False)
+
+    def __init__(self, ttfb, realtime_factor):
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.requests = 0
+
+    @contextlib.asynccontextmanager
+    async def synthesize(self, text):
+        self.requests += 1
+        yield self._frames(text)
+
+    async def _frames(self, text):
+        await asyncio.sleep(self.ttfb)
+        samples = self.sample_rate * FRAME_MS // 1000
+        for index in range(int(len(text) * SECONDS_PER_CHAR * 1000 / FRAME_MS)):
+            tone = struct.pack(f"<{samples}h", *(int(3000 * math.sin(2 * math.pi * 440 * (index * samples + n) / self.sample_rate)) for n in range(samples)))
+            await asyncio.sleep(FRAME_MS / 1000 / self.realtime_factor)
+            yield SynthesizedEvent(rtc.AudioFrame(tone, self.sample_rate, 1, samples))
+
+
+async def _first_frame(frames):
+    started = time.perf_counter()
+    first = None
+    count = 0
+    async for _ in frames:
+        if first is None:
+            first = time.perf_counter() - started
+        count += 1
+    return first, time.perf_counter() - started, count
+
+
+async def _llm_then_tts(llm, tts):
+    """Previous greeting: the LLM streams the welcome text, TTS starts on its first sentence."""
+    text = ""
+    async for chunk in llm.astream([{"role": "user", "content": bs23_frontdesk_agent.DEFAULT_GREETING}]):
+        text += chunk.content
+        if "." in text:
+            break
+    first_sentence = text.split(".", 1)[0]
+    async with tts.synthesize(first_sentence + ".") as stream:
+        async for event in stream:
+            yield event.frame
+    # The rest of the reply has streamed in while the first sentence played
+    async with tts.synthesize(WELCOME[len(first_sentence) + 1:]) as stream:
+        async for event in stream:
+            yield event.frame
+
+
+async def greeting(args):
+    llm = LatencyFakeChatModel(reply=WELCOME, first_token_latency=args.llm_latency, token_interval=0.02)
+    tts = LatencyFakeTTS(args.ttfb, args.realtime_factor)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = TTSAudioCache(directory)
+        results = {
+            "LLM + TTS (old)": await _first_frame(_llm_then_tts(llm, tts)),
+            "fixed text, TTS (miss)": await _first_frame(cache.synthesize(WELCOME, tts)),
+        }
+        hits = [await _first_frame(TTSAudioCache(directory).synthesize(WELCOME, tts)) for _ in range(args.plays)]
+        results["cached (mmap)"] = (statistics.median(hit[0] for hit in hits), statistics.median(hit[1] for hit in hits), hits[0][2])
+        for label, (first, total, frames) in results.items():
+            print(f"{label:<24} first frame {first * 1000:8.2f} ms  all {frames} frames {total * 1000:8.1f} ms")
+        size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        print(f"cached greeting: {size / 1024:.0f} KiB on disk, TTS requests {tts.requests}")
+
+
+async def canned_reply(args):
+    tts = LatencyFakeTTS(args.ttfb, args.realtime_factor)
+
+    async def default_tts_node(agent, text, model_settings):
+        async with tts.synthesize("".join([chunk async for chunk in text])) as stream:
+            async for event in stream:
+                yield event.frame
+
+    async def one_chunk():
+        yield CANNED_REPLY
+
+    with tempfile.TemporaryDirectory() as directory:
+        agent = FrontdeskAgent(instructions="", audio_cache=TTSAudioCache(directory), session_tts=tts)
+        original, Agent.default.tts_node = Agent.default.tts_node, default_tts_node
+        try:
+            for play in range(1, 5):
+                first, total, frames = await _first_frame(agent.tts_node(one_chunk(), None))
+                print(f"canned reply play {play}: first frame {first * 1000:8.2f} ms, {frames} frames, TTS requests so far {tts.requests}")
+        finally:
+            Agent.default.tts_node = original
+        print(f"audio cache: {agent.audio_cache.stats()}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttfb", type=float, default=0.2)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--realtime-factor", type=float, default=10.0)
+    parser.add_argument("--plays", type=int, default=20)
+    args = parser.parse_args()
+    await greeting(args)
+    await canned_reply(args)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
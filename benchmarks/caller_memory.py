@@ -0,0 +1,126 @@
+"""Caller memory: store latency, and what loading it costs at call start.
+
+Fills each store with ``--callers`` caller profiles, then measures:
+
+- ``aget`` of a profile, as ``load_caller_memory`` does at call start, for
+  ``SQLiteMemoryStore`` and LangGraph's ``InMemoryStore``.
+- The delay before the greeting starts when memory is loaded first versus
+  concurrently with the greeting (``--greeting`` seconds of speech), for a
+  store ``--remote-latency`` seconds away.
+- The post-call update, ``remember_call`` with the latency fake model, which
+  runs after the call and adds nothing to any turn.
+
+Run from the repository root::
+
+    python -m benchmarks.caller_memory --callers 10000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+from langgraph.store.memory import InMemoryStore
+
+from benchmarks.fake_llm import LatencyFakeChatModel
+from subagents.caller_memory import MEMORY_KEY, MEMORY_NAMESPACE, SQLiteMemoryStore, load_caller_memory, remember_call
+
+EXTRACTION_REPLY = (
+    '{"previous_purpose": "Asked about QA engineer openings", '
+    '"preferred_contact": "email", "requested_employee": "HR team"}'
+)
+
+TRANSCRIPT = [
+    ("assistant", "Thank you for calling Brain Station 23. This is Sabnam, how may I help you today?"),
+    ("user", "Hi, do you have openings for QA engineers?"),
+    ("assistant", "We do. Could I have your email so HR can send you the details?"),
+    ("user", "Sure, please email me, I'd rather not be called during work hours."),
+]
+
+
+class RemoteStore:
+    """A store ``latency`` seconds away, for the call-start comparison."""
+
+    def __init__(self, store, latency):
+        self.store = store
+        self.latency = latency
+
+    async def aget(self, namespace, key):
+        await asyncio.sleep(self.latency)
+        return await self.store.aget(namespace, key)
+
+
+async def fill(store, callers):
+    for index in range(callers):
+        await store.aput((MEMORY_NAMESPACE, f"phone:{index:010d}"), MEMORY_KEY, {
+            "previous_purpose": "Meeting request", "preferred_contact": "phone", "requested_employee": "", "calls": 1,
+        })
+
+
+async def get_latency(store, callers, rng, samples=2000):
+    latencies = []
+    for _ in range(samples):
+        caller_id = f"phone:{rng.randrange(callers):010d}"
+        started = time.perf_counter()
+        await load_caller_memory(store, caller_id)
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def call_start(store, greeting, concurrent):
+    """Seconds until the greeting starts, and until memory is ready."""
+    started = time.perf_counter()
+    load = asyncio.create_task(load_caller_memory(store, "phone:0000000001"))
+    if not concurrent:
+        await load
+    greeting_starts = time.perf_counter() - started
+    await asyncio.sleep(greeting)
+    await load
+    return greeting_starts, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", type=int, default=10000)
+    parser.add_argument("--greeting", type=float, default=3.0, help="seconds of welcome message")
+    parser.add_argument("--remote-latency", type=float, default=0.15)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    args = parser.parse_args()
+    rng = random.Random(20)
+    directory = tempfile.mkdtemp(prefix="caller-memory-benchmark-")
+
+    try:
+        stores = {"sqlite": SQLiteMemoryStore(os.path.join(directory, "memory.sqlite3")), "in-memory": InMemoryStore()}
+        for label, store in stores.items():
+            await fill(store, args.callers)
+            latencies = await get_latency(store, args.callers, rng)
+            print(
+                f"{label:<10} aget p50={statistics.median(latencies) * 1e6:6.0f} us  "
+                f"p99={statistics.quantiles(latencies, n=100)[98] * 1e6:6.0f} us"
+            )
+
+        remote = RemoteStore(stores["sqlite"], args.remote_latency)
+        for concurrent in (False, True):
+            greeting_starts, ready = await call_start(remote, args.greeting, concurrent)
+            label = "concurrent" if concurrent else "load first"
+            print(
+                f"{label:<10} greeting starts after {greeting_starts * 1000:5.0f} ms, "
+                f"memory ready for the first turn at {ready * 1000:5.0f} ms"
+            )
+
+        llm = LatencyFakeChatModel(reply=EXTRACTION_REPLY, first_token_latency=args.llm_latency, token_interval=0.01)
+        started = time.perf_counter()
+        profile = await remember_call(stores["sqlite"], llm, "phone:0000000001", TRANSCRIPT,
+                                      await load_caller_memory(stores["sqlite"], "phone:0000000001"))
+        print(f"post-call update {(time.perf_counter() - started) * 1000:5.0f} ms after hang-up: {profile}")
+        stores["sqlite"].close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
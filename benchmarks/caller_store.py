@@ -0,0 +1,167 @@
+"""Caller store: write throughput under concurrent calls, lookup latency and reopen time.
+
+Simulates ``--calls`` calls finishing at once. Each call runs the
+``collect_caller_info`` tool in the default executor, as ``ParallelToolNode``
+runs sync tools, and a third of the callers have called before. The store
+is measured with and without an fsync per batch. For comparison, a naive
+store appends and syncs one record per tool call. Most of a tool call is
+langchain's tool wrapper, so the store's own write path is also measured on
+its own: ``--records`` records queued from one thread, then written.
+Afterwards:
+
+- Lookups by phone number of known callers, and of unknown numbers.
+- Reopen time, from the index checkpoint and from a full log replay.
+
+Run from the repository root::
+
+    python -m benchmarks.caller_store --calls 5000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Tools open the process's store from here; the benchmark uses its own
+TEMP_DIR = tempfile.mkdtemp(prefix="caller-store-benchmark-")
+os.environ["CALLER_STORE_DIR"] = os.path.join(TEMP_DIR, "default")
+
+import tools.caller_store as caller_store
+from tools.caller_store import CallerStore
+from tools.communication_tools import collect_caller_info
+
+
+def callers(count, rng):
+    """Tool arguments per call; a third of the calls come from earlier callers."""
+    known = []
+    result = []
+    for index in range(count):
+        if known and rng.random() < 1 / 3:
+            phone, email = rng.choice(known)
+        else:
+            phone, email = f"+8801{rng.randrange(10**9):09d}", f"caller{index}@example.com"
+            known.append((phone, email))
+        result.append({"name": f"Caller {index}", "email": email, "phone": phone, "purpose": "Meeting request"})
+    return result
+
+
+class NaiveStore:
+    """One append and fsync per record, in the tool call."""
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, "naive.log")
+
+    def record(self, **details):
+        with open(self.path, "ab") as f:
+            f.write(json.dumps(details).encode() + b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+async def run_calls(store, arguments, workers):
+    """Run every call's tool at once; returns tool latencies and seconds until all records are written."""
+    caller_store._STORE = store
+    loop = asyncio.get_running_loop()
+    latencies = []
+
+    def call(args):
+        started = time.perf_counter()
+        collect_caller_info.invoke(args)
+        latencies.append(time.perf_counter() - started)
+
+    with ThreadPoolExecutor(workers) as pool:
+        started = time.perf_counter()
+        await asyncio.gather(*(loop.run_in_executor(pool, call, args) for args in arguments))
+        if hasattr(store, "flush"):
+            await asyncio.to_thread(store.flush)
+        elapsed = time.perf_counter() - started
+    return latencies, elapsed
+
+
+def _report(label, latencies, elapsed, calls):
+    print(
+        f"{label:<24} tool p50={statistics.median(latencies) * 1e6:6.0f} us  "
+        f"p99={statistics.quantiles(latencies, n=100)[98] * 1e6:7.0f} us  "
+        f"{calls / elapsed:8.0f} records/s written"
+    )
+
+
+def write_directly(store, arguments, count):
+    """Records per second through ``record`` and the writer, without the tool wrapper."""
+    started = time.perf_counter()
+    for index in range(count):
+        store.record(**arguments[index % len(arguments)])
+    queued = time.perf_counter() - started
+    store.flush()
+    return count / queued, count / (time.perf_counter() - started)
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=32, help="executor threads running tools")
+    args = parser.parse_args()
+    rng = random.Random(19)
+    arguments = callers(args.calls, rng)
+
+    try:
+        for fsync in (True, False):
+            directory = os.path.join(TEMP_DIR, f"fsync-{fsync}")
+            store = CallerStore(directory, fsync=fsync)
+            latencies, elapsed = await run_calls(store, arguments, args.workers)
+            _report(f"store, fsync={'on' if fsync else 'off'}", latencies, elapsed, args.calls)
+            print(f"{'':<24} {store.stats()}")
+            queued, written = write_directly(store, arguments, args.records)
+            print(f"{'':<24} record() alone: {queued:8.0f} records/s queued, {written:8.0f} records/s written")
+            store.close()
+
+        naive_dir = os.path.join(TEMP_DIR, "naive")
+        os.makedirs(naive_dir)
+        latencies, elapsed = await run_calls(NaiveStore(naive_dir), arguments, args.workers)
+        _report("naive append+fsync", latencies, elapsed, args.calls)
+
+        directory = os.path.join(TEMP_DIR, "fsync-True")
+        store, opened = timed(CallerStore, directory)
+        known = [item["phone"] for item in arguments]
+        hits = []
+        for phone in rng.sample(known, min(2000, len(known))):
+            record, seconds = timed(store.lookup, phone)
+            assert record is not None
+            hits.append(seconds)
+        misses = [timed(store.lookup, f"+8809{rng.randrange(10**9):09d}")[1] for _ in range(2000)]
+        store.close()
+        print(
+            f"lookup                   hit p50={statistics.median(hits) * 1e6:5.1f} us  "
+            f"p99={statistics.quantiles(hits, n=100)[98] * 1e6:5.1f} us  "
+            f"miss p50={statistics.median(misses) * 1e6:5.1f} us"
+        )
+
+        os.remove(os.path.join(directory, "callers.idx"))
+        store, replayed = timed(CallerStore, directory)
+        store.close()
+        log_bytes = os.path.getsize(os.path.join(directory, "callers.log"))
+        index_bytes = os.path.getsize(os.path.join(directory, "callers.idx"))
+        print(
+            f"reopen                   from index {opened * 1000:5.1f} ms  full replay {replayed * 1000:5.1f} ms  "
+            f"(log {log_bytes / 1024:.0f} KiB, index {index_bytes / 1024:.0f} KiB)"
+        )
+    finally:
+        caller_store._STORE = None
+        shutil.rmtree(TEMP_DIR)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
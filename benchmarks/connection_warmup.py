@@ -0,0 +1,87 @@
+"""First-turn and later-turn request latency with and without pooled, warmed connections.
+
+A local HTTP server stands in for the Groq endpoint and charges
+``--handshake-ms`` for every new connection (the TCP + TLS setup a remote
+API costs); requests on a kept-alive connection skip it. Three client
+strategies are compared over a short simulated call whose turns are
+``--turn-gap`` seconds apart:
+
+* ``per-call``: a fresh client per call, as when everything was built in entrypoint
+* ``sdk-default``: a shared client with the Groq SDK's 5 s keep-alive expiry
+* ``prewarmed``: the prewarm client (120 s keep-alive) plus a warm-up request at call start
+
+Run from the repository root::
+
+    python -m benchmarks.connection_warmup --handshake-ms 150 --turn-gap 6
+"""
+
+import argparse
+import asyncio
+import os
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+
+
+async def start_server(handshake_ms):
+    async def handle(reader, writer):
+        await asyncio.sleep(handshake_ms / 1000)
+        try:
+            while True:
+                request = await reader.readuntil(b"\r\n\r\n")
+                if not request:
+                    break
+                body = b'{"object": "list", "data": []}'
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/openai/v1/models"
+
+
+async def run_call(client, url, turns, turn_gap, warm_up):
+    if warm_up:
+        await client.get(url)
+    latencies = []
+    for turn in range(turns):
+        if turn:
+            await asyncio.sleep(turn_gap)
+        started = time.perf_counter()
+        await client.get(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handshake-ms", type=float, default=150)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--turn-gap", type=float, default=6.0)
+    args = parser.parse_args()
+
+    server, url = await start_server(args.handshake_ms)
+    strategies = {
+        "per-call": (lambda: bs23_frontdesk_agent.create_http_client(5.0), False),
+        "sdk-default": (lambda: bs23_frontdesk_agent.create_http_client(5.0), False),
+        "prewarmed": (lambda: bs23_frontdesk_agent.create_http_client(), True),
+    }
+    async with server:
+        for label, (factory, warm_up) in strategies.items():
+            client = factory()
+            if label != "per-call":
+                # Shared clients have served an earlier call in this process
+                await client.get(url)
+            latencies = await run_call(client, url, args.turns, args.turn_gap, warm_up)
+            await client.aclose()
+            turns = "  ".join(f"{latency:6.1f}" for latency in latencies)
+            print(f"{label:<12} per-turn request latency (ms): {turns}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
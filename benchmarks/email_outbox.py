@@ -0,0 +1,188 @@
+"""Email outbox: tool latency, delivery throughput, retries and dead letters.
+
+Runs the ``send_email`` tool against a throwaway outbox while ``EmailSender``
+delivers to a minimal SMTP server on localhost. The server answers the
+commands ``smtplib`` sends without TLS or auth (EHLO, MAIL, RCPT, DATA, RSET,
+NOOP, QUIT), adds ``--rtt`` seconds to every reply to stand in for a remote
+relay, and fails some recipients on purpose:
+
+- ``retry-*@example.com`` is refused with 451 on its first two attempts,
+  then accepted.
+- ``bounce-*@example.com`` is refused with 550 every time and should be
+  dead-lettered after one attempt.
+
+aiosmtpd's ``Controller`` makes an equivalent stand-in where it is installed.
+For comparison, the same messages are then delivered synchronously, one SMTP
+session per message, as a tool doing the work inline would.
+
+Run from the repository root::
+
+    python -m benchmarks.email_outbox --messages 200
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import smtplib
+import statistics
+import tempfile
+import time
+from email.message import EmailMessage
+
+# A throwaway outbox, and retries quick enough to watch
+OUTBOX_DIR = tempfile.mkdtemp(prefix="outbox-benchmark-")
+os.environ["EMAIL_OUTBOX_PATH"] = os.path.join(OUTBOX_DIR, "outbox.sqlite3")
+os.environ.setdefault("EMAIL_RETRY_BASE_SECONDS", "0.2")
+
+from tools.communication_tools import send_email
+from tools.email_outbox import EmailSender, SMTPTransport, get_email_outbox
+
+
+class StandInSMTP:
+    """Just enough of an SMTP server for ``smtplib``."""
+
+    def __init__(self, rtt):
+        self.rtt = rtt
+        self.accepted = 0
+        self.sessions = 0
+        self.attempts = {}
+
+    async def handle(self, reader, writer):
+        self.sessions += 1
+        writer.write(b"220 stand-in ESMTP\r\n")
+        recipients = []
+        while line := await reader.readline():
+            command = line.decode().strip()
+            verb = command[:4].upper()
+            await asyncio.sleep(self.rtt)
+            if verb in ("EHLO", "HELO"):
+                reply = "250-stand-in\r\n250 8BITMIME"
+            elif verb == "MAIL":
+                recipients, reply = [], "250 OK"
+            elif verb == "RCPT":
+                address = command.split(":", 1)[1].strip("<> ")
+                reply = self._recipient(address)
+                if reply.startswith("250"):
+                    recipients.append(address)
+            elif verb == "DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while (await reader.readline()) != b".\r\n":
+                    pass
+                self.accepted += len(recipients)
+                reply = "250 queued"
+            elif verb in ("RSET", "NOOP"):
+                recipients, reply = [], "250 OK"
+            elif verb == "QUIT":
+                writer.write(b"221 bye\r\n")
+                break
+            else:
+                reply = "502 not implemented"
+            writer.write(reply.encode() + b"\r\n")
+            await writer.drain()
+        writer.close()
+
+    def _recipient(self, address):
+        attempt = self.attempts[address] = self.attempts.get(address, 0) + 1
+        if address.startswith("bounce-"):
+            return "550 mailbox unavailable"
+        if address.startswith("retry-") and attempt <= 2:
+            return "451 try again later"
+        return "250 OK"
+
+
+def recipients(count):
+    """Mostly deliverable addresses, with 5% slow and 2% bouncing mailboxes."""
+    result = []
+    for index in range(count):
+        prefix = "bounce" if index % 50 == 7 else "retry" if index % 20 == 3 else "caller"
+        result.append(f"{prefix}-{index}@example.com")
+    return result
+
+
+def send_inline(port, addresses):
+    """One SMTP session per message, as an inline tool call would do."""
+    latencies = []
+    for address in addresses:
+        message = EmailMessage()
+        message["From"] = "frontdesk@example.com"
+        message["To"] = address
+        message["Subject"] = "Meeting request"
+        message.set_content("A caller asked for a meeting.")
+        started = time.perf_counter()
+        try:
+            with smtplib.SMTP("127.0.0.1", port) as smtp:
+                smtp.send_message(message)
+        except smtplib.SMTPException:
+            pass
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--rtt", type=float, default=0.005, help="seconds the server adds to each reply")
+    parser.add_argument("--batch-size", type=int, default=20)
+    args = parser.parse_args()
+
+    server = StandInSMTP(args.rtt)
+    listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    addresses = recipients(args.messages)
+
+    try:
+        outbox = get_email_outbox()
+        transport = SMTPTransport("127.0.0.1", port, starttls=False, sender="frontdesk@example.com")
+        sender = EmailSender(outbox, transport, batch_size=args.batch_size, max_attempts=5)
+
+        # The tool as the graph calls it, with the sender not yet running
+        latencies = []
+        for address in addresses:
+            started = time.perf_counter()
+            send_email.invoke({"subject": "Meeting request", "message": "A caller asked for a meeting.", "to_email": address})
+            latencies.append(time.perf_counter() - started)
+        raw = []
+        for address in addresses:
+            started = time.perf_counter()
+            outbox.enqueue(address, "x", "y")
+            raw.append(time.perf_counter() - started)
+        outbox._db.execute("DELETE FROM outbox WHERE subject = 'x'")
+        print(
+            f"send_email tool call  p50={statistics.median(latencies) * 1e6:7.0f} us  "
+            f"max={max(latencies) * 1e6:7.0f} us  (enqueue alone p50={statistics.median(raw) * 1e6:.0f} us)"
+        )
+
+        started = time.perf_counter()
+        sender.start()
+        await sender.drain()
+        first_pass = time.perf_counter() - started
+        # Retries come due after the backoff; wait for them too
+        while (counts := outbox.counts()).get("pending") or counts.get("sending"):
+            await sender.drain()
+            await asyncio.sleep(0.05)
+        settled = time.perf_counter() - started
+        await sender.aclose()
+        stats = sender.stats()
+        print(
+            f"outbox sender         first pass {first_pass:5.2f} s ({stats['batches']} batches)  "
+            f"settled {settled:5.2f} s  {args.messages / first_pass:6.0f} msg/s on the first pass"
+        )
+        print(f"                      {stats}  server sessions {server.sessions}")
+        outbox.close()
+    finally:
+        shutil.rmtree(OUTBOX_DIR)
+
+    server.attempts.clear()
+    sessions = server.sessions
+    inline = await asyncio.to_thread(send_inline, port, addresses)
+    print(
+        f"inline SMTP per call  p50={statistics.median(inline) * 1000:7.1f} ms  "
+        f"total {sum(inline):5.2f} s  server sessions {server.sessions - sessions}"
+    )
+    listener.close()
+    await listener.wait_closed()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
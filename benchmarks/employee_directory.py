@@ -0,0 +1,121 @@
+"""Employee directory lookups: indexed fuzzy search vs the old linear scan.
+
+Generates a synthetic directory (``--employees``, default 50k) from syllable
+names, loads it through SQLite like a production source would, and times
+exact, misspelled and sound-alike lookups embedded in caller utterances.
+The baseline is the previous ``search_employee`` loop (substring checks over
+every entry, first hit wins).
+
+Run from the repository root::
+
+    python -m benchmarks.employee_directory --employees 50000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+
+from tools.employee_directory import load_employee_directory
+
+ONSETS = ["b", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "z", "ch", "sh", "th", "br", "kr", "st"]
+VOWELS = ["a", "e", "i", "o", "u", "ai", "ee", "oo"]
+CODAS = ["", "", "n", "r", "l", "s", "m", "k", "nd", "rt"]
+
+TITLES = ["Software Engineer", "Senior Developer", "QA Engineer", "Project Manager", "Designer", "HR Executive"]
+DEPARTMENTS = ["Engineering", "Operations", "Quality Assurance", "Design", "Human Resources", "Finance"]
+
+
+def _name(rng, syllables):
+    return "".join(rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS) for _ in range(syllables)).capitalize()
+
+
+def _misspell(rng, name):
+    """Drop, double or swap one inner letter, as STT transcripts often do."""
+    index = rng.randrange(1, len(name) - 1)
+    edit = rng.choice(("drop", "double", "swap"))
+    if edit == "drop":
+        return name[:index] + name[index + 1:]
+    if edit == "double":
+        return name[:index] + name[index] + name[index:]
+    return name[:index] + name[index + 1] + name[index] + name[index + 2:]
+
+
+def build_sqlite(path, count, rng):
+    first_names = sorted({_name(rng, rng.choice((1, 2))) for _ in range(3000)})
+    last_names = sorted({_name(rng, rng.choice((2, 3))) for _ in range(8000)})
+    rows = []
+    for _ in range(count):
+        name = f"{rng.choice(first_names)} {rng.choice(last_names)}"
+        email = name.lower().replace(" ", ".") + "@brainstation-23.com"
+        rows.append((name, rng.choice(TITLES), rng.choice(DEPARTMENTS), email))
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE employees (name TEXT, title TEXT, department TEXT, email TEXT)")
+        connection.executemany("INSERT INTO employees VALUES (?, ?, ?, ?)", rows)
+    return rows
+
+
+def linear_scan(data, query):
+    """Previous behaviour of ``search_employee``."""
+    name_lower = query.lower()
+    for name, info in data.items():
+        if name in name_lower or any(part in name_lower for part in name.split()):
+            return info
+    return None
+
+
+def _time(fn, queries):
+    samples = []
+    for query in queries:
+        started = time.perf_counter()
+        result = fn(query)
+        samples.append(((time.perf_counter() - started) * 1000, result))
+    return samples
+
+
+def _report(label, samples):
+    values = sorted(sample[0] for sample in samples)
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    print(f"{label:<22} p50={statistics.median(values):8.3f} ms  p99={p99:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--employees", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(23)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "employees.db")
+        rows = build_sqlite(path, args.employees, rng)
+        started = time.perf_counter()
+        employees = load_employee_directory(path)
+        print(f"loaded and indexed {len(employees)} employees from SQLite in {(time.perf_counter() - started) * 1000:.0f} ms")
+
+    targets = rng.sample(rows, args.queries)
+    cases = {
+        "exact full name": [f"Can I speak with {row[0]}" for row in targets],
+        "misspelled surname": [f"I'm looking for {row[0].split()[0]} {_misspell(rng, row[0].split()[1])}" for row in targets],
+        "surname only": [f"Is {row[0].split()[1]} available" for row in targets],
+    }
+    for label, queries in cases.items():
+        samples = _time(employees.search, queries)
+        _report(label, samples)
+        found = sum(any(match.employee.name == row[0] for match in result) for (_, result), row in zip(samples, targets))
+        top1 = sum(bool(result) and result[0].employee.name == row[0] for (_, result), row in zip(samples, targets))
+        print(f"{'':<22} target in top 5: {found / len(targets):.0%}  top 1: {top1 / len(targets):.0%}")
+
+    data = {row[0].lower(): {"name": row[0]} for row in rows}
+    queries = cases["exact full name"][:50]
+    samples = _time(lambda query: linear_scan(data, query), queries)
+    _report("linear scan (old)", samples)
+    correct = sum(result is not None and result["name"] == row[0] for (_, result), row in zip(samples, targets))
+    print(f"{'':<22} correct first hit: {correct / len(queries):.0%}")
+
+
+if __name__ == "__main__":
+    main()
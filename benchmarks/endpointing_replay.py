@@ -0,0 +1,240 @@
+"""Endpointing replay: end-of-speech-to-response latency and false interruptions per setting.
+
+Replays caller speech through the turn-taking rules the session applies
+(``voice.session_settings``) for a sweep of settings:
+
+- End of turn: the VAD reports end of speech after ``min_silence_duration``
+  of silence, then the session waits ``min_endpointing_delay`` more; speech
+  resuming within that total keeps the turn open. A turn closed before the
+  caller finished is *premature*. Latency runs from the labelled end of the
+  caller's turn to the endpoint, plus ``--response-latency`` for the reply.
+- Interruptions: caller speech while the agent talks interrupts it once it
+  lasts ``min_interruption_duration``. Bursts not labelled as interruptions
+  (backchannels, coughs, line noise) are *false interruptions*; labelled
+  interruptions that never reach the threshold are *missed*.
+
+Recordings are caller-channel WAV files, each with a JSON sidecar of the same
+name holding the labels, in seconds::
+
+    {"caller_turns": [[0.4, 3.1], ...], "agent_speech": [[3.6, 8.2], ...],
+     "interruptions": [7.1, ...]}
+
+Silero runs once per recording with a short silence setting to find the raw
+speech segments; each setting is then applied to those segments. Without
+``--recordings`` the harness generates synthetic calls: multi-phrase turns
+with log-normal pauses, backchannels and real interruptions.
+
+The turn detector model can hold a turn open up to ``max_endpointing_delay``
+when the words look unfinished; that extension depends on the transcript and
+is not simulated, so premature rates are an upper bound.
+
+Run from the repository root::
+
+    python -m benchmarks.endpointing_replay
+    python -m benchmarks.endpointing_replay --recordings calls/ --config frontdesk_english.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import wave
+from pathlib import Path
+
+from livekit import rtc
+
+from subagents.agent_config import load_agent_spec
+from voice.session_settings import endpointing_split
+
+# Silence used to split raw speech segments; shorter than any setting swept
+RAW_MIN_SILENCE = 0.05
+
+# The session's previous defaults: Silero's 0.55 s plus a 0.5 s endpointing delay
+PREVIOUS_DEFAULTS = {"wait": 1.05, "vad": 0.55, "interruption": 0.5}
+
+WAIT_TIMES = [0.3, 0.4, 0.5, 0.6, 0.8]
+INTERRUPTION_DURATIONS = [0.3, 0.5, 0.8]
+
+
+class Call:
+    """Raw caller speech segments and the labels of one call."""
+
+    def __init__(self, segments, caller_turns, agent_speech, interruptions):
+        self.segments = segments
+        self.caller_turns = caller_turns
+        self.agent_speech = agent_speech
+        self.interruptions = interruptions
+
+
+async def speech_segments(path):
+    """``(start, end)`` of caller speech in a WAV file, from Silero."""
+    from livekit.agents.vad import VADEventType
+    from livekit.plugins import silero
+
+    vad = silero.VAD.load(min_silence_duration=RAW_MIN_SILENCE)
+    stream = vad.stream()
+    with wave.open(str(path), "rb") as f:
+        sample_rate, channels = f.getframerate(), f.getnchannels()
+        samples = sample_rate // 100
+        while data := f.readframes(samples):
+            stream.push_frame(rtc.AudioFrame(data, sample_rate, channels, len(data) // (2 * channels)))
+    stream.end_input()
+
+    segments = []
+    async for event in stream:
+        if event.type == VADEventType.END_OF_SPEECH:
+            # samples_index counts at the inference rate, which is the VAD's own
+            end = event.samples_index / vad._opts.sample_rate - event.silence_duration
+            segments.append((max(0.0, end - event.speech_duration), end))
+    await stream.aclose()
+    return segments
+
+
+async def load_recordings(directory):
+    calls = []
+    for path in sorted(Path(directory).glob("*.wav")):
+        labels = json.loads(path.with_suffix(".json").read_text())
+        calls.append(Call(
+            await speech_segments(path),
+            [tuple(turn) for turn in labels["caller_turns"]],
+            [tuple(span) for span in labels.get("agent_speech", [])],
+            labels.get("interruptions", []),
+        ))
+    return calls
+
+
+def synthetic_calls(count, rng):
+    """Calls with hesitant multi-phrase turns, backchannels and barge-ins."""
+    calls = []
+    for _ in range(count):
+        segments, caller_turns, agent_speech, interruptions = [], [], [], []
+        now = 0.5
+        turns = rng.randint(4, 8)
+        for turn in range(turns):
+            turn_start = now
+            for phrase in range(rng.choice([1, 1, 2, 2, 3])):
+                if phrase:
+                    # Mid-turn pauses: median 0.35 s, a long tail past a second
+                    now += rng.lognormvariate(-1.05, 0.6)
+                length = rng.uniform(0.6, 2.8)
+                segments.append((now, now + length))
+                now += length
+            caller_turns.append((turn_start, now))
+
+            agent_start = now + 0.8
+            agent_end = agent_start + rng.uniform(2.0, 7.0)
+            agent_speech.append((agent_start, agent_end))
+            now = agent_end + rng.uniform(0.2, 0.8)
+            at = agent_start + rng.uniform(0.5, 1.5)
+            while at < agent_end - 0.5:
+                kind = rng.random()
+                if kind < 0.08 and turn < turns - 1:
+                    # Real barge-in; the caller's next turn starts here
+                    interruptions.append(at)
+                    agent_speech[-1] = (agent_start, at + 0.3)
+                    now = at
+                    break
+                if kind < 0.35:
+                    # Backchannel ("mm-hm", "okay") or a cough
+                    segments.append((at, at + rng.lognormvariate(-1.2, 0.45)))
+                at += rng.uniform(1.0, 2.5)
+        segments.sort()
+        calls.append(Call(segments, caller_turns, agent_speech, interruptions))
+    return calls
+
+
+def endpoint(turn, segments, vad_silence, delay):
+    """When the session closes ``turn``, and whether the caller was still mid-turn."""
+    start, end = turn
+    inside = [segment for segment in segments if segment[1] > start and segment[0] < end + 0.3]
+    for (_, speech_end), (next_start, _) in zip(inside, inside[1:]):
+        if next_start - speech_end >= vad_silence + delay and speech_end < end - 0.05:
+            return speech_end + vad_silence + delay, True
+    last_end = inside[-1][1] if inside else end
+    return max(last_end, end) + vad_silence + delay, False
+
+
+def interruptions(call, min_duration):
+    """``(false, missed, real)`` interruption counts for one call."""
+    false = missed = 0
+    for agent_start, agent_end in call.agent_speech:
+        real = [at for at in call.interruptions if agent_start <= at <= agent_end + 0.5]
+        for start, end in call.segments:
+            if not agent_start <= start < agent_end:
+                continue
+            if any(abs(start - at) < 0.3 for at in real):
+                continue
+            if min(end, agent_end) - start >= min_duration:
+                false += 1
+        for at in real:
+            burst = [end - start for start, end in call.segments if abs(start - at) < 0.3]
+            if not burst or max(burst) < min_duration:
+                missed += 1
+    return false, missed, len(call.interruptions)
+
+
+def evaluate(calls, wait_time, min_duration, response_latency, vad_silence=None):
+    if vad_silence is None:
+        vad_silence, delay = endpointing_split(wait_time)
+    else:
+        delay = wait_time - vad_silence
+    latencies, premature, turns = [], 0, 0
+    false = missed = real = 0
+    for call in calls:
+        for turn in call.caller_turns:
+            fired, early = endpoint(turn, call.segments, vad_silence, delay)
+            turns += 1
+            premature += early
+            if not early:
+                latencies.append(fired - turn[1] + response_latency)
+        counts = interruptions(call, min_duration)
+        false, missed, real = false + counts[0], missed + counts[1], real + counts[2]
+    agent_turns = sum(len(call.agent_speech) for call in calls)
+    return {
+        "latency_p50": statistics.median(latencies),
+        "latency_p90": statistics.quantiles(latencies, n=10)[-1],
+        "premature": premature / turns,
+        "false_per_100": 100 * false / agent_turns,
+        "missed": missed / real if real else 0.0,
+    }
+
+
+def _row(label, result):
+    print(
+        f"{label:<34} p50 {result['latency_p50'] * 1000:5.0f} ms  p90 {result['latency_p90'] * 1000:5.0f} ms  "
+        f"premature {result['premature']:5.1%}  false interruptions/100 agent turns {result['false_per_100']:5.1f}  "
+        f"missed {result['missed']:5.1%}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--recordings", help="directory of caller WAV files with JSON labels")
+    parser.add_argument("--config", help="agent config whose session settings to include")
+    parser.add_argument("--calls", type=int, default=300, help="synthetic calls when no recordings are given")
+    parser.add_argument("--response-latency", type=float, default=0.6, help="LLM + TTS time to first audio (s)")
+    args = parser.parse_args()
+
+    if args.recordings:
+        calls = await load_recordings(args.recordings)
+    else:
+        calls = synthetic_calls(args.calls, random.Random(15))
+    print(f"{len(calls)} calls, {sum(len(call.caller_turns) for call in calls)} caller turns")
+
+    _row(
+        "previous defaults (0.55 s + 0.5 s)",
+        evaluate(calls, PREVIOUS_DEFAULTS["wait"], PREVIOUS_DEFAULTS["interruption"], args.response_latency, PREVIOUS_DEFAULTS["vad"]),
+    )
+    if args.config:
+        session = load_agent_spec(args.config)["session"]
+        wait_time = session.get("wait_time_before_detecting_end_of_speech", PREVIOUS_DEFAULTS["wait"])
+        min_duration = session.get("minimum_speech_duration_for_interruptions", PREVIOUS_DEFAULTS["interruption"])
+        _row(f"{Path(args.config).stem} ({wait_time} s, {min_duration} s)", evaluate(calls, wait_time, min_duration, args.response_latency))
+    for wait_time in WAIT_TIMES:
+        for min_duration in INTERRUPTION_DURATIONS:
+            _row(f"wait {wait_time} s, interrupt after {min_duration} s", evaluate(calls, wait_time, min_duration, args.response_latency))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
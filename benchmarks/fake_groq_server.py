@@ -0,0 +1,127 @@
+"""Local stand-in for the Groq chat completions API.
+
+Serves ``POST /openai/v1/chat/completions``, streamed (server-sent events) or
+not, and ``GET /openai/v1/models`` for the connection warm-up. The reply
+comes after ``first_token_latency`` seconds and then streams at
+``tokens_per_second``, one word per token. Point ``ChatGroq`` at it with
+``GROQ_API_BASE=http://127.0.0.1:<port>``, so the load test exercises the
+real client path: langchain-groq, the Groq SDK and the pooled ``httpx``
+client.
+
+Replies are chosen by ``reply(messages)``. By default, intent classifier
+prompts get GENERAL and everything else gets a short specialist answer.
+
+Run on its own from the repository root::
+
+    python -m benchmarks.fake_groq_server --port 8765
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from aiohttp import web
+
+SPECIALIST_REPLY = (
+    "Certainly, I can help you with that. Could you tell me your name and the purpose of your call? "
+    "Once I have that, I will pass your message along right away."
+)
+
+
+def default_reply(messages):
+    """GENERAL for the intent classifier, a specialist answer otherwise."""
+    text = " ".join(str(message.get("content", "")) for message in messages)
+    return "GENERAL" if "intent classifier" in text else SPECIALIST_REPLY
+
+
+class FakeGroqServer:
+    """Groq-compatible chat completions with configurable latency and token rate."""
+
+    def __init__(self, first_token_latency=0.25, tokens_per_second=250.0, reply=default_reply, model="latency-fake"):
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.model = model
+        self.requests = 0
+        self.active = 0
+        self.max_active = 0
+        self._runner = None
+        self.port = None
+
+    async def start(self, host="127.0.0.1", port=0):
+        app = web.Application()
+        app.router.add_post("/openai/v1/chat/completions", self._completions)
+        app.router.add_get("/openai/v1/models", self._models)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{self.port}"
+
+    async def close(self):
+        await self._runner.cleanup()
+
+    async def _models(self, request):
+        return web.json_response({"object": "list", "data": [{"id": self.model, "object": "model"}]})
+
+    async def _completions(self, request):
+        body = await request.json()
+        self.requests += 1
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            words = self.reply(body.get("messages", [])).split(" ")
+            tokens = [word if index == 0 else " " + word for index, word in enumerate(words)]
+            completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+            usage = {"prompt_tokens": sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", [])),
+                     "completion_tokens": len(tokens)}
+            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+            await asyncio.sleep(self.first_token_latency)
+            if not body.get("stream"):
+                await asyncio.sleep(len(tokens) / self.tokens_per_second)
+                return web.json_response({
+                    "id": completion_id, "object": "chat.completion", "created": int(time.time()), "model": self.model,
+                    "choices": [{"index": 0, "message": {"role": "assistant", "content": "".join(tokens)}, "finish_reason": "stop"}],
+                    "usage": usage,
+                })
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            for index, token in enumerate(tokens):
+                if index:
+                    await asyncio.sleep(1 / self.tokens_per_second)
+                delta = {"role": "assistant", "content": token} if index == 0 else {"content": token}
+                await response.write(self._event(completion_id, delta, None))
+            await response.write(self._event(completion_id, {}, "stop", {"usage": usage}))
+            await response.write(b"data: [DONE]\n\n")
+            await response.write_eof()
+            return response
+        finally:
+            self.active -= 1
+
+    def _event(self, completion_id, delta, finish_reason, extra=None):
+        chunk = {
+            "id": completion_id, "object": "chat.completion.chunk", "created": int(time.time()), "model": self.model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        if extra:
+            # Groq reports streamed usage under x_groq on the last chunk
+            chunk["x_groq"] = {"id": completion_id, **extra}
+        return f"data: {json.dumps(chunk)}\n\n".encode()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.25)
+    parser.add_argument("--tokens-per-second", type=float, default=250.0)
+    args = parser.parse_args()
+    server = FakeGroqServer(args.latency, args.tokens_per_second)
+    print(f"GROQ_API_BASE={await server.start(port=args.port)}", flush=True)
+    await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""Offline stand-in for ChatGroq with configurable latency."""
+
+import asyncio
+import json
+import time
+from typing import Any, Callable, Optional, Union
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+
+class LatencyFakeChatModel(BaseChatModel):
+    """Chat model that answers like a remote LLM: a first-token delay, then
+    one token every ``token_interval`` seconds.
+
+    ``reply`` is either a fixed string or a callable receiving the prompt
+    messages, which lets benchmarks answer the intent classifier and the
+    specialists differently from a single model instance. A callable may
+    return an ``AIMessage`` with ``tool_calls`` to exercise tool loops.
+    """
+
+    reply: Union[str, Callable[[list], Union[str, AIMessage]]] = "Certainly, I can help you with that today."
+    first_token_latency: float = 0.3
+    token_interval: float = 0.02
+    # Extra time to first token per prompt token (about four characters)
+    prompt_token_latency: float = 0.0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "latency-fake"
+
+    def _reply_for(self, messages) -> AIMessage:
+        self.calls += 1
+        reply = self.reply(messages) if callable(self.reply) else self.reply
+        return reply if isinstance(reply, AIMessage) else AIMessage(content=reply)
+
+    def bind_tools(self, tools, tool_choice=None, **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], tool_choice=tool_choice, **kwargs)
+
+    def _usage(self, messages, message) -> dict:
+        """Token usage as Groq reports it, counting four prompt characters per token."""
+        input_tokens = sum(len(message.content) for message in messages) // 4
+        output_tokens = len(self._tokens(message.content))
+        return {"input_tokens": input_tokens, "output_tokens": output_tokens, "total_tokens": input_tokens + output_tokens}
+
+    def _prefill_latency(self, messages) -> float:
+        prompt_chars = sum(len(message.content) for message in messages)
+        return self.first_token_latency + self.prompt_token_latency * prompt_chars / 4
+
+    @staticmethod
+    def _tokens(text: str) -> list:
+        words = text.split(" ")
+        return [word + " " for word in words[:-1]] + words[-1:]
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self._reply_for(messages)
+        time.sleep(self._prefill_latency(messages) + self.token_interval * len(self._tokens(message.content)))
+        message = message.model_copy(update={"usage_metadata": self._usage(messages, message), "response_metadata": {"model_name": self._llm_type}})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self._reply_for(messages)
+        await asyncio.sleep(self._prefill_latency(messages) + self.token_interval * len(self._tokens(message.content)))
+        message = message.model_copy(update={"usage_metadata": self._usage(messages, message), "response_metadata": {"model_name": self._llm_type}})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager: Optional[Any] = None, **kwargs: Any):
+        message = self._reply_for(messages)
+        await asyncio.sleep(self._prefill_latency(messages))
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content="", tool_call_chunks=tool_call_chunks))
+            return
+        tokens = self._tokens(message.content)
+        for index, token in enumerate(tokens):
+            if index:
+                await asyncio.sleep(self.token_interval)
+            # Usage arrives with the last chunk, as in Groq's streamed responses
+            usage = self._usage(messages, message) if index == len(tokens) - 1 else None
+            metadata = {"model_name": self._llm_type} if usage else {}
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage, response_metadata=metadata))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
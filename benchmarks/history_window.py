@@ -0,0 +1,91 @@
+"""Prompt size and latency over a simulated 30-minute call, full history vs windowed.
+
+Each simulated turn appends a caller message and a specialist reply. At
+sampled turns the employee specialist runs once with the full history and
+once with a ``ConversationHistory`` window; the fake model charges
+``--prompt-token-ms`` per prompt token to model prefill cost.
+
+Run from the repository root::
+
+    python -m benchmarks.history_window --call-minutes 30 --seconds-per-turn 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from benchmarks.fake_llm import LatencyFakeChatModel
+from subagent_prompts.employee_prompts import generate_employee_specialist_prompt
+from subagents.base import build_specialist_messages, run_specialist
+from subagents.history import ConversationHistory
+
+CALLER_LINE = "My name is Rahim from Acme Corp, I need to reach someone about the integration we discussed last week."
+AGENT_LINE = "Certainly, I have noted that. Could you share the best phone number and email to reach you?"
+SUMMARY = " ".join(["Caller Rahim from Acme Corp asked about an integration."] * 8)
+
+
+def _reply(messages):
+    return SUMMARY if "running summary" in messages[0].content else AGENT_LINE
+
+
+def _prompt_chars(messages):
+    return sum(len(message["content"]) for message in messages)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--call-minutes", type=float, default=30)
+    parser.add_argument("--seconds-per-turn", type=float, default=10)
+    parser.add_argument("--samples", type=int, default=7)
+    parser.add_argument("--prompt-token-ms", type=float, default=0.05)
+    args = parser.parse_args()
+
+    llm = LatencyFakeChatModel(
+        reply=_reply, first_token_latency=0.2, token_interval=0.0, prompt_token_latency=args.prompt_token_ms / 1000
+    )
+    history = ConversationHistory(llm)
+    system_message = generate_employee_specialist_prompt()
+    turns = int(args.call_minutes * 60 / args.seconds_per_turn)
+    sample_every = max(1, turns // (args.samples - 1))
+
+    messages = [SystemMessage(content="You are Sabnam, the virtual receptionist for Brain Station 23.")]
+    print(f"{turns} turns; prompt tokens ~ chars / 4")
+    print(" turn  minute | full: tokens  build µs  llm ms | windowed: tokens  build µs  llm ms")
+    for turn in range(1, turns + 1):
+        messages.append(HumanMessage(content=f"{CALLER_LINE} (turn {turn})"))
+        state = {"messages": messages}
+
+        # Every turn goes through the window so background summaries keep up
+        started = time.perf_counter()
+        windowed_messages = build_specialist_messages(state, system_message, history, "employee_specialist")
+        windowed_build = (time.perf_counter() - started) * 1e6
+
+        if turn == 1 or turn % sample_every == 0 or turn == turns:
+            started = time.perf_counter()
+            full_messages = build_specialist_messages(state, system_message)
+            full_build = (time.perf_counter() - started) * 1e6
+
+            started = time.perf_counter()
+            await run_specialist(state, llm, system_message)
+            full_llm = (time.perf_counter() - started) * 1000
+            started = time.perf_counter()
+            await run_specialist(state, llm, system_message, history, "employee_specialist")
+            windowed_llm = (time.perf_counter() - started) * 1000
+
+            print(
+                f"{turn:5d} {turn * args.seconds_per_turn / 60:7.1f} |"
+                f" {_prompt_chars(full_messages) // 4:12d} {full_build:9.1f} {full_llm:7.1f} |"
+                f" {_prompt_chars(windowed_messages) // 4:16d} {windowed_build:9.1f} {windowed_llm:7.1f}"
+            )
+
+        messages.append(AIMessage(content=AGENT_LINE))
+        # Let background summary refreshes run between caller turns
+        await asyncio.sleep(0.25)
+
+    await history.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
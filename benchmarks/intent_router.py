@@ -0,0 +1,65 @@
+"""Offline accuracy/latency benchmark for the local intent router.
+
+Classifies the labeled utterances in ``benchmarks/data/intent_utterances.jsonl``
+and reports, per confidence threshold, how many turns the router answers
+locally (skipping the Groq classifier call) and how accurate those answers are.
+
+Run from the repository root::
+
+    python -m benchmarks.intent_router
+"""
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+from subagents.intent_router import INTENT_CONFIDENCE_THRESHOLD, load_local_intent_router
+
+DATA_PATH = Path(__file__).resolve().parent / "data" / "intent_utterances.jsonl"
+
+
+def load_labeled_utterances(path=DATA_PATH):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--repeat", type=int, default=2000, help="classifications per utterance for timing")
+    parser.add_argument("--show-errors", action="store_true")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    router = load_local_intent_router()
+    print(f"router build: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    samples = load_labeled_utterances(args.data)
+    predictions = [router.classify(sample["text"]) for sample in samples]
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        for sample in samples:
+            router.classify(sample["text"])
+    per_call = (time.perf_counter() - started) / (args.repeat * len(samples))
+    print(f"classify latency: {per_call * 1e6:.1f} µs/utterance over {len(samples)} utterances")
+
+    correct = sum(p.intent == s["intent"] for p, s in zip(predictions, samples))
+    print(f"top-1 accuracy (no fallback): {correct / len(samples):.1%}")
+
+    print("threshold  local-share  local-accuracy")
+    for threshold in sorted({0.3, 0.4, 0.5, 0.6, 0.7, 0.8, INTENT_CONFIDENCE_THRESHOLD}):
+        local = [(p, s) for p, s in zip(predictions, samples) if p.confidence >= threshold]
+        accuracy = sum(p.intent == s["intent"] for p, s in local) / len(local) if local else 0.0
+        marker = "  <- configured" if threshold == INTENT_CONFIDENCE_THRESHOLD else ""
+        print(f"{threshold:9.2f}  {len(local) / len(samples):11.1%}  {accuracy:14.1%}{marker}")
+
+    if args.show_errors:
+        for prediction, sample in zip(predictions, samples):
+            if prediction.intent != sample["intent"]:
+                print(f"  {sample['intent']:<8} -> {prediction.intent:<8} {prediction.confidence:.2f}  {sample['text']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Per-job setup cost: building the graph per call vs reusing the prewarmed one.
+
+Measures the work ``entrypoint`` does before the caller can hear anything,
+excluding network I/O: creating the LLM client, rendering prompts,
+compiling the graph and wrapping it for the agent.
+
+Run from the repository root::
+
+    python -m benchmarks.job_setup --jobs 50
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from livekit.agents import Agent
+from livekit.plugins import langchain
+
+import bs23_frontdesk_agent
+from subagent_prompts.registry import PromptRegistry
+
+
+def per_call_setup():
+    """Previous behaviour: everything rebuilt for each job."""
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(bs23_frontdesk_agent.create_llm())
+    return Agent(instructions=bs23_frontdesk_agent.AGENT_INSTRUCTIONS, llm=langchain.LLMAdapter(graph))
+
+
+def prewarmed_setup(userdata):
+    """Current behaviour: only the per-call agent wrapper is created."""
+    return Agent(instructions=bs23_frontdesk_agent.AGENT_INSTRUCTIONS, llm=langchain.LLMAdapter(userdata["graph"]))
+
+
+def _time(fn, jobs):
+    samples = []
+    for _ in range(jobs):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, default=50)
+    args = parser.parse_args()
+
+    userdata = {}
+    started = time.perf_counter()
+    userdata["llm"] = bs23_frontdesk_agent.create_llm()
+    userdata["prompts"] = PromptRegistry()
+    userdata["graph"] = bs23_frontdesk_agent.create_bs23_frontdesk_graph(userdata["llm"], prompts=userdata["prompts"])
+    print(f"one-time prewarm cost: {(time.perf_counter() - started) * 1000:.2f} ms")
+
+    for label, fn in (("per-call", per_call_setup), ("prewarmed", lambda: prewarmed_setup(userdata))):
+        samples = _time(fn, args.jobs)
+        print(f"{label:<10} per-job setup p50={statistics.median(samples):7.3f} ms  max={max(samples):7.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
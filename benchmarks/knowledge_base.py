@@ -0,0 +1,158 @@
+"""Knowledge base: index build, incremental refresh, query latency and prompt bytes.
+
+Generates a synthetic knowledge base (``--documents``, default 20k, spread
+over ``--files`` JSON Lines files) and measures:
+
+1. A cold build (tokenize everything, write segments) and a warm load of the
+   persisted segments by a fresh process-style index.
+2. ``refresh`` with nothing changed, after editing one file, and a full
+   rebuild for comparison.
+3. BM25 query latency for caller-style questions.
+4. Bytes per project-specialist turn with the facts inline in the system
+   prompt (the previous prompt) vs the slimmer prompt plus the retrieved
+   KNOWLEDGE message, on the bundled knowledge files.
+
+Run from the repository root::
+
+    python -m benchmarks.knowledge_base --documents 20000
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from subagent_prompts.knowledge_prompts import generate_knowledge_message
+from subagent_prompts.project_prompts import generate_project_specialist_prompt
+from tools.knowledge_base import KnowledgeIndex, get_knowledge_index
+
+SYLLABLES = ["ba", "ko", "ri", "ten", "sul", "mar", "del", "vi", "nos", "tra", "pe", "lun", "gor", "fi", "da", "zen"]
+
+# Distinct words in the synthetic corpus, drawn with Zipf frequencies like real text
+VOCABULARY_SIZE = 20000
+
+# generate_project_specialist_prompt before its facts moved to the knowledge base
+INLINE_PROJECT_PROMPT = """You are Sabnam, the Project Discussion Specialist for Brain Station 23.
+
+PROJECT SERVICES:
+- Custom software development
+- Web applications (React, Node.js, Python, Java)
+- Mobile applications (iOS, Android, React Native)
+- AI/ML solutions and data analytics
+- Digital transformation services
+- Agile methodology with 2-12 month typical timelines
+- Competitive pricing based on scope and complexity
+- Experienced teams with modern development practices
+
+Help clients discuss project requirements, costs, timelines, and technical expertise."""
+
+CALLER_QUESTIONS = [
+    "How long does a mobile app project usually take?",
+    "Do you build web applications with React?",
+    "How do you price a project?",
+    "What happens after the initial consultation?",
+]
+
+
+class Corpus:
+    """Synthetic documents over a Zipf-distributed vocabulary."""
+
+    def __init__(self, rng):
+        self.rng = rng
+        words = set()
+        while len(words) < VOCABULARY_SIZE:
+            words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+        self.words = sorted(words)
+        rng.shuffle(self.words)
+        self.cum_weights = list(itertools.accumulate(1 / rank for rank in range(1, len(self.words) + 1)))
+
+    def text(self, length):
+        return " ".join(self.rng.choices(self.words, cum_weights=self.cum_weights, k=length))
+
+    def document(self, index):
+        return {"title": f"{self.text(2).capitalize()} note {index}", "text": self.text(self.rng.randint(30, 70))}
+
+
+def write_corpus(directory, corpus, documents, files):
+    per_file = documents // files
+    texts = []
+    for file_index in range(files):
+        with open(directory / f"kb-{file_index:03d}.jsonl", "w", encoding="utf-8") as f:
+            for index in range(per_file):
+                document = corpus.document(file_index * per_file + index)
+                texts.append(document["text"])
+                f.write(json.dumps(document) + "\n")
+    return texts
+
+
+def _timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(23)
+    with tempfile.TemporaryDirectory() as root:
+        source_dir, index_dir = Path(root) / "knowledge", Path(root) / "index"
+        source_dir.mkdir()
+        corpus = Corpus(rng)
+        texts = write_corpus(source_dir, corpus, args.documents, args.files)
+
+        index = KnowledgeIndex(source_dir, index_dir)
+        elapsed, _ = _timed(index.refresh)
+        print(f"cold build: {len(index)} documents from {args.files} files in {elapsed:.0f} ms")
+        elapsed, _ = _timed(lambda: KnowledgeIndex(source_dir, index_dir).refresh())
+        print(f"warm load from persisted segments: {elapsed:.0f} ms")
+
+        elapsed, changed = _timed(index.refresh)
+        print(f"refresh, nothing changed: {elapsed:.2f} ms ({changed} files re-indexed)")
+        edited = source_dir / "kb-007.jsonl"
+        with open(edited, "a", encoding="utf-8") as f:
+            f.write(json.dumps(corpus.document(args.documents + 1)) + "\n")
+        elapsed, changed = _timed(index.refresh)
+        print(f"refresh after editing one file: {elapsed:.1f} ms ({changed} file re-indexed)")
+        for segment in index_dir.iterdir():
+            segment.unlink()
+        elapsed, _ = _timed(lambda: KnowledgeIndex(source_dir, index_dir).refresh())
+        print(f"full rebuild for comparison: {elapsed:.0f} ms")
+
+        # Callers ask about a few words of an existing document
+        queries = [f"what do you know about {' '.join(rng.sample(text.split(), 3))}" for text in rng.sample(texts, args.queries)]
+        samples = sorted(_timed(lambda: index.search(query))[0] for query in queries)
+        p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+        print(f"query top-3 over {len(index)} documents: p50={statistics.median(samples):.3f} ms  p99={p99:.3f} ms")
+
+    bundled = get_knowledge_index()
+    print(f"\nproject specialist turn, bundled knowledge ({len(bundled)} documents):")
+    print(f"{'question':<48} {'inline':>8} {'retrieved':>10}")
+    for question in CALLER_QUESTIONS:
+        user = {"role": "user", "content": question}
+        inline = len(json.dumps([{"role": "system", "content": INLINE_PROJECT_PROMPT}, user]))
+        knowledge = generate_knowledge_message(bundled.search(question))
+        retrieved = len(json.dumps([
+            {"role": "system", "content": generate_project_specialist_prompt()}, user, {"role": "system", "content": knowledge},
+        ]))
+        print(f"{question:<48} {inline:>6} B {retrieved:>8} B")
+    print(f"system prompt alone: {len(INLINE_PROJECT_PROMPT)} B inline -> {len(generate_project_specialist_prompt())} B")
+
+    # The whole knowledge base pasted into a prompt, as it would have to be without retrieval
+    everything = "\n".join(f"- {title}: {text}" for title, text, _, _ in bundled.documents.values())
+    knowledge = [generate_knowledge_message(bundled.search(question)) for question in CALLER_QUESTIONS]
+    print(f"all bundled knowledge inline: {len(everything)} B per turn; retrieved top-3: "
+          f"{statistics.mean(len(message) for message in knowledge):.0f} B per turn on average")
+
+
+if __name__ == "__main__":
+    main()
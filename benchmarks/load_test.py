@@ -0,0 +1,233 @@
+"""Load test: how many concurrent text callers one worker process sustains.
+
+Starts the fake Groq server (``benchmarks.fake_groq_server``) in a
+subprocess and points ``ChatGroq`` at it through ``GROQ_API_BASE``. Then it
+compiles the graph with ``create_bs23_frontdesk_graph`` exactly as
+``prewarm`` does: the real client, the pooled HTTP client, tool nodes and
+the response cache. Nothing leaves the machine.
+
+For each level in ``--callers``, that many simulated callers run at once.
+Starts are spread over ``--ramp`` seconds. Each caller holds a
+``--turns``-turn conversation with ``--think`` seconds between turns, sent
+through ``graph.astream`` with its own ``ConversationHistory``, as the
+voice pipeline's adapter does. Reported per level:
+
+- Throughput: turns per second.
+- Time to first reply token and full turn time, p50/p95/p99.
+- Per-node latency, p50/p95/p99, from the graph's update stream.
+- Event-loop lag: how late a 50 ms timer fires, p99 and max.
+- RSS growth per concurrent caller.
+
+A level is sustained when its p95 time to first token stays within
+``--slo-ms`` and the loop lag p99 within ``--max-lag-ms``. With
+``--fail-below N`` the exit status is 1 when fewer than N callers are
+sustained, so the run can gate a deployment.
+
+Run from the repository root::
+
+    python -m benchmarks.load_test --callers 10,50,100,200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from collections import defaultdict
+
+import psutil
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+import bs23_frontdesk_agent
+from subagents.history import ConversationHistory
+from subagents.tool_node import create_tool_nodes
+
+# Caller turns across the intents; most resolve in the local router
+UTTERANCES = [
+    "Hi, I'd like to speak with David Johnson please",
+    "Can you tell me where your office is located?",
+    "What are your working hours?",
+    "Do you have any openings for QA engineers?",
+    "I want to discuss a new mobile app project with your team",
+    "Who handles invoices and payments?",
+    "What services does Brain Station 23 offer?",
+    "I was wondering if you've built anything for banks",
+    "Could you put me through to HR?",
+    "Thanks, that's all for today",
+]
+
+
+def percentiles(values):
+    """p50, p95 and p99 in milliseconds."""
+    if len(values) < 2:
+        value = values[0] * 1000 if values else 0.0
+        return value, value, value
+    cuts = statistics.quantiles(values, n=100)
+    return statistics.median(values) * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+class LoopMonitor:
+    """Event-loop lag and peak RSS, sampled every ``interval`` seconds."""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.lags = []
+        self.peak_rss = 0
+        self._process = psutil.Process()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lags.append(max(0.0, time.perf_counter() - expected))
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+    async def stop(self):
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+
+
+class LevelStats:
+    def __init__(self):
+        self.first_token = []
+        self.turn = []
+        self.nodes = defaultdict(list)
+        self.errors = 0
+
+
+async def run_turn(graph, messages, config, stats):
+    started = last = time.perf_counter()
+    first_token = None
+    reply = None
+    async for mode, chunk in graph.astream({"messages": messages}, config, stream_mode=["messages", "updates"]):
+        now = time.perf_counter()
+        if mode == "messages":
+            if first_token is None and chunk[0].content:
+                first_token = now - started
+            continue
+        for node, update in chunk.items():
+            stats.nodes[node].append(now - last)
+            last = now
+            for message in (update or {}).get("messages", []):
+                reply = message
+    stats.turn.append(time.perf_counter() - started)
+    # Cached replies arrive whole in the node update
+    stats.first_token.append(first_token if first_token is not None else time.perf_counter() - started)
+    return reply
+
+
+async def caller(graph, llm, args, rng, stats):
+    await asyncio.sleep(rng.uniform(0, args.ramp))
+    history = ConversationHistory(llm)
+    config = {"configurable": {"history": history}}
+    messages = []
+    try:
+        for turn in range(args.turns):
+            if turn:
+                await asyncio.sleep(args.think * rng.uniform(0.5, 1.5))
+            messages.append(HumanMessage(content=rng.choice(UTTERANCES), id=str(uuid.uuid4())))
+            try:
+                reply = await run_turn(graph, messages, config, stats)
+            except Exception:
+                stats.errors += 1
+                continue
+            messages.append(AIMessage(content=reply.content if reply else "", id=str(uuid.uuid4())))
+    finally:
+        await history.aclose()
+
+
+async def run_level(graph, llm, callers, args, rng):
+    stats = LevelStats()
+    process = psutil.Process()
+    baseline = process.memory_info().rss
+    monitor = LoopMonitor().start()
+    started = time.perf_counter()
+    # The nodes' progress prints would dominate the output and the loop
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        await asyncio.gather(*(caller(graph, llm, args, random.Random(rng.random()), stats) for _ in range(callers)))
+    elapsed = time.perf_counter() - started
+    await monitor.stop()
+    return stats, elapsed, monitor, max(0, monitor.peak_rss - baseline) / callers
+
+
+async def start_server(args):
+    server = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "benchmarks.fake_groq_server", "--port", "0",
+        "--latency", str(args.llm_latency), "--tokens-per-second", str(args.tokens_per_second),
+        stdout=asyncio.subprocess.PIPE,
+    )
+    line = (await server.stdout.readline()).decode().strip()
+    if not line.startswith("GROQ_API_BASE="):
+        server.kill()
+        raise RuntimeError(f"fake Groq server did not start: {line!r}")
+    return server, line.split("=", 1)[1]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--callers", default="10,50,100,200", help="comma-separated concurrency levels")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--think", type=float, default=2.0, help="mean seconds between a caller's turns")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which callers join")
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--tokens-per-second", type=float, default=250.0)
+    parser.add_argument("--slo-ms", type=float, default=1000.0, help="p95 time to first token a level must meet")
+    parser.add_argument("--max-lag-ms", type=float, default=100.0, help="event-loop lag p99 a level must meet")
+    parser.add_argument("--fail-below", type=int, default=0, help="exit 1 if fewer callers are sustained")
+    args = parser.parse_args()
+
+    server, base_url = await start_server(args)
+    os.environ["GROQ_API_BASE"] = base_url
+    try:
+        http_client = bs23_frontdesk_agent.create_http_client()
+        llm = bs23_frontdesk_agent.create_llm(http_client)
+        graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, tool_nodes=create_tool_nodes())
+        rng = random.Random(21)
+
+        # One warm-up call loads indexes and opens connections before measuring
+        warm = argparse.Namespace(**{**vars(args), "turns": 2, "think": 0.0, "ramp": 0.0})
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            await caller(graph, llm, warm, rng, LevelStats())
+
+        sustained = 0
+        for callers in (int(level) for level in args.callers.split(",")):
+            stats, elapsed, monitor, rss_per_call = await run_level(graph, llm, callers, args, rng)
+            turns = len(stats.turn)
+            first = percentiles(stats.first_token)
+            lag = percentiles(monitor.lags)
+            ok = first[1] <= args.slo_ms and lag[2] <= args.max_lag_ms and not stats.errors
+            if ok and callers > sustained:
+                sustained = callers
+            print(
+                f"{callers:4d} callers  {turns / elapsed:6.1f} turns/s  errors {stats.errors}  "
+                f"first token p50/p95/p99 {first[0]:5.0f}/{first[1]:5.0f}/{first[2]:5.0f} ms  "
+                f"turn p95 {percentiles(stats.turn)[1]:5.0f} ms  loop lag p99 {lag[2]:5.1f} ms "
+                f"(max {max(monitor.lags, default=0) * 1000:5.1f})  RSS/caller {rss_per_call / 1024:6.0f} KiB  "
+                f"{'ok' if ok else 'OVER'}"
+            )
+            for node, values in sorted(stats.nodes.items()):
+                p50, p95, p99 = percentiles(values)
+                print(f"{'':16}{node:<22} p50/p95/p99 {p50:6.1f}/{p95:6.1f}/{p99:6.1f} ms  ({len(values)} runs)")
+        print(f"sustained: {sustained} concurrent callers (p95 first token <= {args.slo_ms:.0f} ms, loop lag p99 <= {args.max_lag_ms:.0f} ms)")
+        await http_client.aclose()
+    finally:
+        server.terminate()
+        await server.wait()
+    if sustained < args.fail_below:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+"""Event-loop watchdog: overhead, and whether stalls are caught and attributed.
+
+Drives the frontdesk graph through ``langchain.LLMAdapter`` with the latency
+fake model while a stand-in audio task ticks every 20 ms, as a VAD reading
+frames would. Its worst gap shows what a stall does to every other call's
+audio. Three phases of ``--turns`` turns:
+
+1. Well-behaved graph, watchdog off.
+2. Well-behaved graph, watchdog on and ``StallAttributionHandler`` in the
+   run config. No stalls should be reported.
+3. A graph that blocks: the employee specialist's tool sleeps
+   synchronously for ``--tool-block`` seconds, and the general
+   receptionist's model call for ``--model-block`` seconds. Every stall
+   should be reported once, attributed to ``tool:lookup_employee`` or
+   ``node:general_receptionist``.
+
+The watchdog's log records go to stdout, so the stack of each blocking
+line is shown once.
+
+Run from the repository root::
+
+    python -m benchmarks.loop_watchdog --turns 20
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import SPECIALIST_REPLY, measure_turn
+from subagents.history import ConversationHistory
+from subagents.loop_watchdog import LoopWatchdog, StallAttributionHandler
+from subagents.tool_node import ParallelToolNode
+
+# Alternates between the employee specialist and the general receptionist
+UTTERANCES = ["I would like to speak with David Johnson", "Hmm, I was wondering about something"]
+
+
+def make_reply(model_block):
+    def reply(messages):
+        first = messages[0]
+        content = first["content"] if isinstance(first, dict) else first.content
+        if "intent classifier" in content:
+            return "EMPLOYEE" if "speak with David Johnson" in content else "GENERAL"
+        if "Employee Contact Specialist" in content and not any(getattr(m, "type", None) == "tool" for m in messages):
+            return AIMessage(content="", tool_calls=[{"name": "lookup_employee", "args": {"name": "David Johnson"}, "id": "call-1"}])
+        if "general receptionist" in content and model_block:
+            # A synchronous call inside the model client, on the event loop
+            time.sleep(model_block)
+        return SPECIALIST_REPLY
+    return reply
+
+
+def make_tool(block):
+    @tool
+    async def lookup_employee(name: str) -> str:
+        """Find an employee's extension."""
+        if block:
+            # A blocking HTTP client or database driver called from a coroutine
+            time.sleep(block)
+        return f"{name}: extension 2104"
+    return lookup_employee
+
+
+async def audio_ticker(gaps, interval=0.02):
+    last = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        now = time.perf_counter()
+        gaps.append(now - last - interval)
+        last = now
+
+
+async def run_phase(args, watchdog=None, tool_block=0.0, model_block=0.0):
+    llm = LatencyFakeChatModel(reply=make_reply(model_block), first_token_latency=args.llm_latency, token_interval=0.02)
+    bs23_frontdesk_agent.RESPONSE_CACHE_ENABLED = False
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(
+        llm, routing_mode="two_hop", tool_nodes={"employee_specialist": ParallelToolNode([make_tool(tool_block)])},
+    )
+    if watchdog is not None:
+        watchdog.start()
+    gaps = []
+    ticker = asyncio.create_task(audio_ticker(gaps))
+    cpu_started = time.process_time()
+    latencies = []
+    for turn in range(args.turns):
+        config = {"configurable": {"history": ConversationHistory(llm)}}
+        if watchdog is not None:
+            config["callbacks"] = [StallAttributionHandler()]
+        latencies.append(await measure_turn(graph, utterance=UTTERANCES[turn % len(UTTERANCES)], config=config))
+    cpu = (time.process_time() - cpu_started) / args.turns
+    ticker.cancel()
+    await asyncio.gather(ticker, return_exceptions=True)
+    if watchdog is not None:
+        await watchdog.aclose()
+    return latencies, cpu, gaps
+
+
+def _report(label, latencies, cpu, gaps, watchdog=None):
+    full = [sample[2] * 1000 for sample in latencies]
+    print(
+        f"{label:<18} full reply p50={statistics.median(full):6.1f} ms  CPU per turn {cpu * 1000:5.2f} ms  "
+        f"audio tick gap p99={statistics.quantiles(gaps, n=100)[98] * 1000:6.1f} ms max={max(gaps) * 1000:6.1f} ms"
+    )
+    if watchdog is not None:
+        print(f"{'':18} watchdog: {watchdog.stats()}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--threshold-ms", type=float, default=100.0)
+    parser.add_argument("--tool-block", type=float, default=0.15)
+    parser.add_argument("--model-block", type=float, default=0.12)
+    args = parser.parse_args()
+    logging.basicConfig(stream=sys.stdout, level=logging.WARNING, format="    %(levelname)s %(message)s")
+
+    _report("watchdog off", *await run_phase(args))
+    watchdog = LoopWatchdog(threshold=args.threshold_ms / 1000)
+    _report("watchdog on", *await run_phase(args, watchdog), watchdog)
+    watchdog = LoopWatchdog(threshold=args.threshold_ms / 1000)
+    _report("blocking graph", *await run_phase(args, watchdog, args.tool_block, args.model_block), watchdog)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,158 @@
+"""Prometheus metrics: overhead per turn, and what the worker's endpoint serves.
+
+Runs in prometheus_client's multiprocess mode, as job processes do under a
+worker with ``FRONTDESK_METRICS_PORT`` set. The frontdesk graph is driven
+through ``langchain.LLMAdapter`` with the latency fake model for
+``--turns`` turns, first without and then with ``GraphMetricsHandler``.
+Turn latency and event-loop CPU time are reported for both. Then:
+
+- ``--tool-calls`` calls through a ``ParallelToolNode`` whose tools answer,
+  raise or time out, for the tool error counters.
+- A second process runs ``--child-turns`` turns with the handler, as a
+  second job process would.
+
+Finally, livekit-agents' own metrics server is started on a free port and
+scraped once; the ``frontdesk_*`` samples it aggregates across both
+processes are printed, without histogram buckets.
+
+Run from the repository root::
+
+    python -m benchmarks.metrics --turns 50
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+# Must precede the first prometheus_client import
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", tempfile.mkdtemp(prefix="metrics-benchmark-"))
+
+import aiohttp
+from langchain_core.tools import tool
+from livekit.agents.telemetry.http_server import HttpServer
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import SPECIALIST_REPLY, measure_turn
+from subagents.history import ConversationHistory
+from subagents.metrics import GraphMetricsHandler, call_ended, call_started, start_process_sampler
+from subagents.tool_node import ParallelToolNode
+
+UTTERANCES = [
+    "I would like to speak with David Johnson",
+    "Hmm, I was wondering about something",
+    "Do you have openings for QA engineers?",
+    "I'd like to talk to somebody about an idea",
+]
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    return "GENERAL" if "intent classifier" in content else SPECIALIST_REPLY
+
+
+@tool
+async def office_hours() -> str:
+    """Working hours of the office."""
+    return "Sunday to Thursday, 9 AM to 6 PM."
+
+
+@tool
+async def flaky_lookup(name: str) -> str:
+    """A directory lookup whose backend is down."""
+    raise ConnectionError("directory unavailable")
+
+
+@tool
+async def slow_lookup(name: str) -> str:
+    """A directory lookup that never answers in time."""
+    await asyncio.sleep(1.0)
+    return name
+
+
+async def run_turns(turns, llm_latency, handler):
+    llm = LatencyFakeChatModel(reply=_reply, first_token_latency=llm_latency, token_interval=0.02)
+    bs23_frontdesk_agent.RESPONSE_CACHE_ENABLED = False
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, routing_mode="two_hop", tool_nodes={})
+    latencies = []
+    call_started("default")
+    cpu_started = time.process_time()
+    for turn in range(turns):
+        config = {"configurable": {"history": ConversationHistory(llm)}}
+        if handler:
+            config["callbacks"] = [GraphMetricsHandler()]
+        latencies.append(await measure_turn(graph, utterance=UTTERANCES[turn % len(UTTERANCES)], config=config))
+    cpu = (time.process_time() - cpu_started) / turns
+    call_ended("default")
+    return latencies, cpu
+
+
+def child_process(turns, llm_latency):
+    start_process_sampler(interval=0.1)
+    asyncio.run(run_turns(turns, llm_latency, handler=True))
+    # One more sample after the turns
+    time.sleep(0.2)
+
+
+def _report(label, samples, cpu):
+    first = [sample[0] * 1000 for sample in samples]
+    full = [sample[2] * 1000 for sample in samples]
+    print(
+        f"{label:<14} first chunk p50={statistics.median(first):6.1f} ms  full reply p50={statistics.median(full):6.1f} ms  "
+        f"CPU per turn {cpu * 1000:5.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--child-turns", type=int, default=8)
+    parser.add_argument("--tool-calls", type=int, default=30)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    args = parser.parse_args()
+
+    try:
+        start_process_sampler(interval=0.1)
+        _report("metrics off", *await run_turns(args.turns, args.llm_latency, handler=False))
+        _report("metrics on", *await run_turns(args.turns, args.llm_latency, handler=True))
+
+        tools = ParallelToolNode([office_hours, flaky_lookup, slow_lookup], timeouts={"slow_lookup": 0.05})
+        calls = [
+            {"name": "office_hours", "args": {}, "id": "1"},
+            {"name": "flaky_lookup", "args": {"name": "David"}, "id": "2"},
+            {"name": "slow_lookup", "args": {"name": "David"}, "id": "3"},
+        ]
+        for index in range(args.tool_calls // len(calls)):
+            await tools(calls)
+
+        child = multiprocessing.get_context("spawn").Process(target=child_process, args=(args.child_turns, args.llm_latency))
+        child.start()
+        await asyncio.to_thread(child.join)
+        print(f"second process ({child.pid}) ran {args.child_turns} turns, exit code {child.exitcode}")
+        await asyncio.sleep(0.2)
+
+        server = HttpServer("127.0.0.1", 0)
+        await server.start()
+        async with aiohttp.ClientSession() as session:
+            started = time.perf_counter()
+            async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                body = await response.text()
+            elapsed = time.perf_counter() - started
+        await server.aclose()
+        samples = [line for line in body.splitlines() if line.startswith("frontdesk_") and "_bucket{" not in line]
+        print(f"scrape: {len(body)} bytes in {elapsed * 1000:.1f} ms, {len(samples)} frontdesk samples without buckets")
+        for line in sorted(samples):
+            print(f"  {line}")
+    finally:
+        shutil.rmtree(os.environ["PROMETHEUS_MULTIPROC_DIR"], ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,91 @@
+"""Multi-tenant worker: many personas through one process's agent graph cache.
+
+Writes ``--personas`` copies of ``frontdesk_english.json`` with distinct
+``ai_agent_id`` and persona names, then replays a Zipf-distributed stream of
+jobs through ``AgentGraphCache`` and reports hit rate, evictions, per-job
+graph selection time and the cache's memory estimate against ``tracemalloc``.
+
+Run from the repository root::
+
+    python -m benchmarks.multi_tenant --personas 300 --jobs 3000 --cache-size 64
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from subagents.graph_cache import AgentGraphCache
+from subagents.intent_router import AGENT_CONFIG_PATH
+
+
+def write_personas(directory, count):
+    """Persona configs differing in id, name and persona text; returns their ids."""
+    base = json.loads(AGENT_CONFIG_PATH.read_text(encoding="utf-8"))
+    ids = []
+    for index in range(count):
+        config = json.loads(json.dumps(base))
+        config["ai_agent_id"] = f"persona-{index:04d}"
+        prompt_info = config["llm"]["graph_data"]["prompt_info"]
+        prompt_info["Agent_Persona"] = prompt_info["Agent_Persona"].replace("Sabnam", f"Agent {index}")
+        (Path(directory) / f"persona_{index:04d}.json").write_text(json.dumps(config), encoding="utf-8")
+        ids.append(config["ai_agent_id"])
+    return ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--personas", type=int, default=300)
+    parser.add_argument("--jobs", type=int, default=3000)
+    parser.add_argument("--cache-size", type=int, default=64)
+    parser.add_argument("--cache-mb", type=float, default=64)
+    parser.add_argument("--zipf", type=float, default=1.1)
+    args = parser.parse_args()
+
+    llm = LatencyFakeChatModel(reply="ok")
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as config_dir, tempfile.TemporaryDirectory() as spec_dir:
+        ids = write_personas(config_dir, args.personas)
+        weights = [1 / (rank + 1) ** args.zipf for rank in range(len(ids))]
+        jobs = rng.choices(ids, weights=weights, k=args.jobs)
+
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        cache = AgentGraphCache(
+            lambda spec: bs23_frontdesk_agent.create_graph_from_spec(spec, llm),
+            config_dir,
+            max_entries=args.cache_size,
+            max_bytes=int(args.cache_mb * 1024 * 1024),
+            spec_cache_dir=spec_dir,
+        )
+        hit_ms, miss_ms = [], []
+        for agent_id in jobs:
+            misses = cache.misses
+            started = time.perf_counter()
+            cache.get(agent_id)
+            elapsed = (time.perf_counter() - started) * 1000
+            (miss_ms if cache.misses > misses else hit_ms).append(elapsed)
+        measured = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(before, "filename"))
+        tracemalloc.stop()
+
+    stats = cache.stats()
+    print(f"{args.jobs} jobs over {args.personas} personas, cache limit {args.cache_size} entries / {args.cache_mb:g} MB")
+    print(f"hit rate {stats['hits'] / args.jobs:.1%}  misses {stats['misses']}  evictions {stats['evictions']}")
+    if hit_ms:
+        print(f"hit   p50={statistics.median(hit_ms):7.3f} ms  max={max(hit_ms):7.3f} ms")
+    if miss_ms:
+        print(f"miss  p50={statistics.median(miss_ms):7.3f} ms  max={max(miss_ms):7.3f} ms")
+    print(f"cache estimate {stats['bytes'] / 1e6:.1f} MB for {stats['entries']} entries, tracemalloc {measured / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Per-turn prompt bytes and prefix-cache eligibility for one specialist.
+
+Replays a call through ``build_specialist_messages`` with a
+``ConversationHistory`` and prints what ``PromptPrefixTracker`` records for
+every turn, plus the cost of converting the history with and without the
+converted-message cache.
+
+Run from the repository root::
+
+    python -m benchmarks.prompt_prefix --turns 12
+"""
+
+import argparse
+import time
+import uuid
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from benchmarks.fake_llm import LatencyFakeChatModel
+from subagent_prompts.registry import MIN_CACHEABLE_PREFIX_BYTES, PromptRegistry
+from subagents.base import build_specialist_messages
+from subagents.history import ConversationHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=12)
+    parser.add_argument("--specialist", default="single_pass_router")
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    registry = PromptRegistry()
+    system_message = registry[args.specialist]
+    # Summary refreshes are not exercised here; see benchmarks.history_window
+    history = ConversationHistory(LatencyFakeChatModel(), refresh_turns=10**6)
+    messages = [SystemMessage(content="You are Sabnam, the virtual receptionist for Brain Station 23.", id=str(uuid.uuid4()))]
+
+    print(f"{args.specialist}: system prompt {len(system_message.encode())} bytes, "
+          f"fingerprint {registry.fingerprint(args.specialist)}, cacheable from {MIN_CACHEABLE_PREFIX_BYTES} bytes")
+    print(" turn  prompt bytes  shared prefix  eligible")
+    for turn in range(1, args.turns + 1):
+        messages.append(HumanMessage(content=f"Here are more project details for turn {turn}: we need a web portal.", id=str(uuid.uuid4())))
+        build_specialist_messages({"messages": messages}, system_message, history, args.specialist)
+        total, shared, eligible = history.prompt_stats.last
+        print(f"{turn:5d} {total:13d} {shared:14d}  {eligible}")
+        messages.append(AIMessage(content="Thank you, I have noted that. What timeline do you have in mind?", id=str(uuid.uuid4())))
+
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        [{"role": msg.type, "content": msg.content} for msg in messages]
+    uncached = (time.perf_counter() - started) / args.repeat * 1e6
+    started = time.perf_counter()
+    for _ in range(args.repeat):
+        history.convert(messages)
+    cached = (time.perf_counter() - started) / args.repeat * 1e6
+    print(f"history conversion ({len(messages)} messages): {uncached:.1f} µs re-converting, {cached:.1f} µs with cached dicts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Response cache: hit rate and turn latency on a mix of repeated caller questions.
+
+Replays ``--turns`` single-question calls drawn from a skewed mix: paraphrases
+of the usual company and job questions (office hours, address, open
+positions) plus one-off questions. Each call runs through
+``langchain.LLMAdapter`` as in the voice pipeline, once without and once with
+the response cache, using the latency fake model. Halfway through, the
+company data changes and the cache must drop its entries.
+
+Run from the repository root::
+
+    python -m benchmarks.response_cache --turns 120
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import measure_turn
+from subagents.response_cache import ResponseCache
+from tools.company_tools import COMPANY_DATA
+
+# (weight, paraphrases) of questions callers repeat
+FREQUENT_QUESTIONS = [
+    (30, ["What are your office hours?", "What are your office hours please?", "Um, what are your office hours?"]),
+    (20, ["Where is your office located?", "Where is your office located", "Hi, where is your office located?"]),
+    (20, ["What job openings do you have?", "What job openings do you have right now?", "Any job openings?"]),
+    (10, ["What services does your company offer?", "What services does your company offer please?"]),
+]
+
+# Share of calls asking something nobody asked before
+ONE_OFF_SHARE = 0.2
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    if "intent classifier" in content:
+        return "GENERAL"
+    return "Thanks for asking. Our office is open Sunday to Thursday, nine to six. Is there anything else I can help with?"
+
+
+def caller_questions(turns, rng):
+    weights = [weight for weight, _ in FREQUENT_QUESTIONS]
+    questions = []
+    for index in range(turns):
+        if rng.random() < ONE_OFF_SHARE:
+            questions.append(f"Does your company have experience with project number {index} in the {rng.choice(['retail', 'banking', 'health'])} sector?")
+        else:
+            paraphrases = rng.choices(FREQUENT_QUESTIONS, weights=weights)[0][1]
+            questions.append(rng.choice(paraphrases))
+    return questions
+
+
+async def replay(questions, response_cache, change_at=None):
+    llm = LatencyFakeChatModel(reply=_reply, first_token_latency=0.25, token_interval=0.02)
+    # The graph creates its own cache unless caching is switched off
+    bs23_frontdesk_agent.RESPONSE_CACHE_ENABLED = response_cache is not None
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, routing_mode="two_hop", tool_nodes={}, response_cache=response_cache)
+    samples = []
+    original = COMPANY_DATA["hours"]
+    try:
+        for index, question in enumerate(questions):
+            if index == change_at:
+                COMPANY_DATA["hours"] = "Working hours: Sunday to Thursday, 9:30 AM to 6:30 PM"
+            samples.append(await measure_turn(graph, utterance=question))
+    finally:
+        COMPANY_DATA["hours"] = original
+    return samples
+
+
+def _report(label, samples):
+    for index, name in ((0, "first chunk"), (2, "full reply")):
+        values = sorted(sample[index] * 1000 for sample in samples)
+        print(f"{label:<10} {name:<12} mean={statistics.mean(values):6.1f} ms  p50={statistics.median(values):6.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=120)
+    args = parser.parse_args()
+
+    questions = caller_questions(args.turns, random.Random(23))
+    _report("no cache", await replay(questions, None))
+    cache = ResponseCache(similarity=0.8)
+    _report("cached", await replay(questions, cache, change_at=args.turns // 2))
+    print(f"response cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,55 @@
+"""Two-hop routing vs single-pass routing.
+
+Both graphs run against the same fake model so the difference is the
+number of serial LLM round trips per caller turn.
+
+Run from the repository root::
+
+    python -m benchmarks.routing_modes --turns 20
+"""
+
+import argparse
+import asyncio
+import os
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import SPECIALIST_REPLY, _report, measure_turn
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    if "intent classifier" in content:
+        return "EMPLOYEE"
+    if "OUTPUT FORMAT" in content:
+        return "EMPLOYEE\n" + SPECIALIST_REPLY
+    return SPECIALIST_REPLY
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--first-token-latency", type=float, default=0.25)
+    parser.add_argument("--token-interval", type=float, default=0.03)
+    args = parser.parse_args()
+
+    for mode in ("two_hop", "single_pass"):
+        llm = LatencyFakeChatModel(
+            reply=_reply,
+            first_token_latency=args.first_token_latency,
+            token_interval=args.token_interval,
+        )
+        graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, routing_mode=mode)
+        samples = [
+            await measure_turn(graph, stream_mode=bs23_frontdesk_agent.STREAM_MODES[mode])
+            for _ in range(args.turns)
+        ]
+        _report(mode, samples)
+        print(f"{mode:<12} LLM calls/turn  {llm.calls / args.turns:.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+"""Speculative intent analysis: response gap after end of turn, hit rate and wasted tokens.
+
+Replays caller turns as Deepgram reports them: an interim transcript every
+``--interim-interval`` seconds while the caller speaks (one more word each
+time, the last word sometimes misheard and revised, now and then a hesitation
+mid-sentence), a final transcript when they stop, and the end of turn
+``--endpointing-delay`` seconds later. The graph then runs through
+``langchain.LLMAdapter`` as in the voice pipeline, once without and once with
+a ``TurnSpeculator`` fed by the transcripts. Some final transcripts revise a
+word, which wastes the speculations made on the interims.
+
+Questions are ones the local router is unsure about, so the classifier
+escalates to the latency fake model; turns it answers locally gain nothing.
+
+Run from the repository root::
+
+    python -m benchmarks.speculation --turns 30
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import measure_turn
+from voice.speculation import TurnSpeculator
+
+QUESTIONS = [
+    ("I would like to speak with someone about a partnership", "GENERAL"),
+    ("Can you tell me where your office is", "COMPANY"),
+    ("Do you have openings for QA engineers", "JOB"),
+    ("I was wondering if you have built any banking apps", "PROJECT"),
+    ("Who should I talk to about an unpaid invoice", "ADMIN"),
+    ("Could you put me through to the mobile team lead", "EMPLOYEE"),
+]
+
+# Share of turns whose final transcript changes a word of the last interims
+REVISED_SHARE = 0.15
+
+SPECIALIST_REPLY = "Certainly. Let me help you with that. Could you tell me a little more about what you need?"
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    if "intent classifier" not in content:
+        return SPECIALIST_REPLY
+    return next((intent for question, intent in QUESTIONS if question in content), "GENERAL")
+
+
+def caller_turns(turns, rng, interval):
+    """``([(interim transcript, seconds until the next one)], final transcript)`` per turn."""
+    result = []
+    for _ in range(turns):
+        words = rng.choice(QUESTIONS)[0].split()
+        interims = []
+        for count in range(1, len(words) + 1):
+            heard = words[:count]
+            if count < len(words) and rng.random() < 0.3:
+                # The newest word is often misheard, then corrected
+                interims.append((" ".join(heard[:-1] + ["uh" + heard[-1]]), interval))
+            # Callers hesitate mid-sentence now and then
+            pause = rng.uniform(0.3, 0.8) if count < len(words) and rng.random() < 0.1 else 0.0
+            interims.append((" ".join(heard), 2 * interval + pause))
+        final = " ".join(words)
+        if rng.random() < REVISED_SHARE:
+            final = final.replace(words[-1], words[-1] + "s")
+        result.append((interims, final))
+    return result
+
+
+async def replay(graph, turns, speculator, args):
+    samples = []
+    for interims, final in turns:
+        for text, seconds in interims:
+            if speculator is not None:
+                speculator.on_transcript(text, False)
+            await asyncio.sleep(seconds)
+        if speculator is not None:
+            speculator.on_transcript(final, True)
+        await asyncio.sleep(args.endpointing_delay)
+        config = None
+        if speculator is not None:
+            speculator.end_turn()
+            config = {"configurable": {"speculator": speculator}}
+        samples.append(await measure_turn(graph, utterance=final, config=config))
+    return samples
+
+
+def _report(label, samples):
+    for index, name in ((0, "first chunk"), (2, "full reply")):
+        values = [sample[index] * 1000 for sample in samples]
+        print(f"{label:<12} {name:<12} mean={statistics.mean(values):6.1f} ms  p50={statistics.median(values):6.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--interim-interval", type=float, default=0.1)
+    parser.add_argument("--endpointing-delay", type=float, default=0.5)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    args = parser.parse_args()
+
+    llm = LatencyFakeChatModel(reply=_reply, first_token_latency=args.llm_latency, token_interval=0.02)
+    bs23_frontdesk_agent.RESPONSE_CACHE_ENABLED = False
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, routing_mode="two_hop", tool_nodes={})
+    turns = caller_turns(args.turns, random.Random(16), args.interim_interval)
+
+    _report("no speculation", await replay(graph, turns, None, args))
+    speculator = TurnSpeculator(graph)
+    _report("speculative", await replay(graph, turns, speculator, args))
+    await speculator.aclose()
+    print(f"speculation: {speculator.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""Time-to-first-audio benchmark: blocking nodes vs async streaming nodes.
+
+Drives the frontdesk graph through ``langchain.LLMAdapter`` exactly as the
+voice pipeline does and records when the first text chunk and the first
+complete sentence reach the TTS side. The blocking baseline reproduces the
+previous node shape (synchronous ``llm.invoke`` returning a finished message).
+
+Run from the repository root::
+
+    python -m benchmarks.time_to_first_token --turns 20
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.graph import END, START, StateGraph
+from livekit.agents.llm import ChatContext
+from livekit.plugins import langchain
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from subagent_prompts.employee_prompts import generate_intent_classifier_prompt
+from subagents.base import build_specialist_messages
+
+SPECIALIST_REPLY = (
+    "Certainly, I can help you reach our engineering team. "
+    "Could you tell me your name and the purpose of your call? "
+    "Once I have that, I will pass your message along right away."
+)
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    return "EMPLOYEE" if "intent classifier" in content else SPECIALIST_REPLY
+
+
+def build_blocking_graph(llm):
+    """Previous behaviour: sync nodes, one finished message per node."""
+
+    def intent_analyzer(state):
+        # Tagged nostream so only the specialist reply is timed; the old node
+        # also leaked the category label to TTS.
+        prompt = generate_intent_classifier_prompt().format(user_message=state["messages"][-1].content)
+        response = llm.invoke([{"role": "user", "content": prompt}], config={"tags": [TAG_NOSTREAM]})
+        return {"intent": response.content.strip().upper()}
+
+    def employee_specialist(state):
+        response = llm.invoke(build_specialist_messages(state, "system"))
+        return {"messages": [AIMessage(content=response.content)]}
+
+    builder = StateGraph(bs23_frontdesk_agent.State)
+    builder.add_node("intent_analyzer", intent_analyzer)
+    builder.add_node("employee_specialist", employee_specialist)
+    builder.add_edge(START, "intent_analyzer")
+    builder.add_edge("intent_analyzer", "employee_specialist")
+    builder.add_edge("employee_specialist", END)
+    return builder.compile()
+
+
+async def measure_turn(graph, stream_mode="messages", utterance="I would like to speak with David Johnson", config=None):
+    """Return (first chunk, first sentence, full reply) latencies in seconds."""
+    adapter = langchain.LLMAdapter(graph, config=config, stream_mode=stream_mode)
+    chat_ctx = ChatContext.empty()
+    chat_ctx.add_message(role="user", content=utterance)
+
+    started = time.perf_counter()
+    first_chunk = first_sentence = None
+    text = ""
+    async with adapter.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            if not chunk.delta or not chunk.delta.content:
+                continue
+            now = time.perf_counter() - started
+            if first_chunk is None:
+                first_chunk = now
+            text += chunk.delta.content
+            if first_sentence is None and any(mark in text for mark in ".?!"):
+                first_sentence = now
+    return first_chunk, first_sentence, time.perf_counter() - started
+
+
+def _report(label, samples):
+    for index, name in enumerate(("first chunk", "first sentence", "full reply")):
+        values = [sample[index] * 1000 for sample in samples]
+        print(f"{label:<12} {name:<15} p50={statistics.median(values):7.1f} ms  max={max(values):7.1f} ms")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--first-token-latency", type=float, default=0.25)
+    parser.add_argument("--token-interval", type=float, default=0.03)
+    args = parser.parse_args()
+
+    def fake(**overrides):
+        return LatencyFakeChatModel(
+            reply=_reply,
+            first_token_latency=args.first_token_latency,
+            token_interval=args.token_interval,
+            **overrides,
+        )
+
+    blocking = build_blocking_graph(fake(disable_streaming=True))
+    streaming = bs23_frontdesk_agent.create_bs23_frontdesk_graph(fake())
+
+    for label, graph in (("blocking", blocking), ("streaming", streaming)):
+        samples = [await measure_turn(graph) for _ in range(args.turns)]
+        _report(label, samples)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
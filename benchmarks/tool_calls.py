@@ -0,0 +1,133 @@
+"""Tool-calling specialists: prompt size, parallel tool execution and turn latency.
+
+1. Bytes sent per employee turn: directory listed inline (or per-turn
+   matches for large directories), the same with the tools bound, and a
+   pure ``search_employee`` lookup (schemas, the extra round trip and the
+   result all counted).
+2. One model response requesting three slow tools: sequential execution vs
+   ``ParallelToolNode``, plus a tool exceeding its timeout.
+3. A full company turn through the graph where the model asks for the
+   location and the working hours at once, with per-tool latency stats.
+
+Run from the repository root::
+
+    python -m benchmarks.tool_calls
+"""
+
+import asyncio
+import json
+import os
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import measure_turn
+from subagent_prompts.employee_prompts import generate_directory_matches_message, generate_employee_specialist_prompt
+from subagents.tool_node import ParallelToolNode, create_tool_nodes, tool_latency_summary
+from tools.employee_directory import Employee, EmployeeDirectory, get_employee_directory
+from tools.registry import SPECIALIST_TOOLS
+
+QUERY = "Can I speak with David Johnson please?"
+
+
+def _bytes(messages):
+    return sum(len(json.dumps(message)) for message in messages)
+
+
+def prompt_sizes():
+    """Bytes per employee turn for three ways of giving the model the directory."""
+    schemas = [convert_to_openai_tool(t) for t in SPECIALIST_TOOLS["employee_specialist"]]
+    schema_bytes = len(json.dumps(schemas))
+    bundled = get_employee_directory()
+    inline_prompt = generate_employee_specialist_prompt(tools_enabled=False)
+    tool_only_prompt = inline_prompt.replace(bundled.render(), "Look employees up with the search_employee tool.")
+    call = {"role": "assistant", "content": "", "tool_calls": [{"name": "search_employee", "args": {"employee_name": "David Johnson"}}]}
+    result = str(SPECIALIST_TOOLS["employee_specialist"][0].invoke("David Johnson"))
+    user = {"role": "user", "content": QUERY}
+
+    print(f"tool schemas bound to the employee specialist: {schema_bytes} B per request")
+    print(f"{'directory':<10} {'inline':>9} {'inline+tools':>13} {'tool lookup':>12}")
+    for size in (len(bundled), 50, 500, 50000):
+        directory = bundled if size == len(bundled) else EmployeeDirectory(
+            bundled.employees + [
+                Employee(f"Person{index} Surname{index % 997}", "Engineer", "Engineering", f"p{index}@brainstation-23.com")
+                for index in range(size - len(bundled))
+            ]
+        )
+        if size <= 50:
+            # Listed in full in the system prompt
+            inline = _bytes([{"role": "system", "content": inline_prompt.replace(bundled.render(), directory.render())}, user])
+        else:
+            # Too large to list: per-turn matches after the conversation
+            matches = generate_directory_matches_message(directory.search(QUERY))
+            pointer = inline_prompt.replace(bundled.render(), "Matches are given in a DIRECTORY MATCHES message.")
+            inline = _bytes([{"role": "system", "content": pointer}, user, {"role": "system", "content": matches}])
+
+        # Prompt without the directory; one extra model round trip per lookup
+        first = [{"role": "system", "content": tool_only_prompt}, user]
+        tool_lookup = _bytes(first) + _bytes(first + [call, {"role": "tool", "content": result}]) + 2 * schema_bytes
+        print(f"{size:<10} {inline:>7} B {inline + schema_bytes:>11} B {tool_lookup:>10} B")
+
+
+@tool
+async def slow_lookup(seconds: float) -> str:
+    """Benchmark tool that takes ``seconds`` to answer."""
+    await asyncio.sleep(seconds)
+    return f"done after {seconds}s"
+
+
+async def parallel_tools():
+    calls = [{"name": "slow_lookup", "args": {"seconds": seconds}, "id": f"call-{index}"} for index, seconds in enumerate((0.15, 0.2, 0.25))]
+
+    started = time.perf_counter()
+    for call in calls:
+        await slow_lookup.ainvoke(call["args"])
+    sequential = time.perf_counter() - started
+
+    node = ParallelToolNode([slow_lookup])
+    started = time.perf_counter()
+    await node(calls)
+    parallel = time.perf_counter() - started
+    print(f"3 tools (150/200/250 ms): sequential {sequential * 1000:.0f} ms, parallel {parallel * 1000:.0f} ms")
+
+    node = ParallelToolNode([slow_lookup], timeouts={"slow_lookup": 0.1})
+    started = time.perf_counter()
+    results = await node([{"name": "slow_lookup", "args": {"seconds": 2.0}, "id": "slow"}])
+    print(f"tool over its 100 ms timeout: returned after {(time.perf_counter() - started) * 1000:.0f} ms -> {results[0].content!r}")
+
+
+def _company_reply(messages):
+    last = messages[-1]
+    if "intent classifier" in str(messages[0].content):
+        return "COMPANY"
+    if isinstance(last, ToolMessage):
+        return "We are at Plot 15, Bashundhara, Dhaka, open Sunday to Thursday, nine to six."
+    return AIMessage(content="", tool_calls=[
+        {"name": "get_company_location", "args": {"query": "address"}, "id": "call-location"},
+        {"name": "get_company_hours", "args": {"query": "hours"}, "id": "call-hours"},
+    ])
+
+
+async def company_turn():
+    llm = LatencyFakeChatModel(reply=_company_reply, first_token_latency=0.25, token_interval=0.03)
+    tool_nodes = create_tool_nodes()
+    graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, tool_nodes=tool_nodes)
+    first_chunk, first_sentence, full = await measure_turn(graph, utterance="Where is your office and when are you open?")
+    print(f"company turn with 2 parallel tool calls: first chunk {first_chunk * 1000:.0f} ms, full reply {full * 1000:.0f} ms")
+    print(f"per-tool latency: {tool_latency_summary(tool_nodes.values())}")
+
+
+def main():
+    prompt_sizes()
+    asyncio.run(parallel_tools())
+    asyncio.run(company_turn())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Tracing: overhead per turn, spans per turn and where each turn's time goes.
+
+Drives the frontdesk graph through ``langchain.LLMAdapter`` with the latency
+fake model, in three phases of ``--turns`` turns each:
+
+1. Tracing off, as shipped by default.
+2. ``GraphTracingHandler`` with spans exported to a JSON-lines file.
+3. The same, with an OTLP/HTTP exporter added. It sends to a collector
+   stand-in on localhost that answers ``--collector-delay`` seconds late.
+   Export runs in ``BatchSpanProcessor``'s thread, so a slow collector
+   should not show up in turn latency.
+
+Turn latency and event-loop CPU time are reported per phase. Finally, the
+average span durations from the file show each turn's time by stage.
+
+Run from the repository root::
+
+    python -m benchmarks.tracing --turns 50
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from collections import defaultdict
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from aiohttp import web
+from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+from opentelemetry.proto.collector.trace.v1.trace_service_pb2 import ExportTraceServiceRequest
+from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+import bs23_frontdesk_agent
+from benchmarks.fake_llm import LatencyFakeChatModel
+from benchmarks.time_to_first_token import SPECIALIST_REPLY, measure_turn
+from subagents.history import ConversationHistory
+from subagents.tracing import GraphTracingHandler, JSONLinesSpanExporter, bind_call, setup_tracing
+
+# Half the turns resolve locally, half escalate to the model classifier
+UTTERANCES = [
+    "I would like to speak with David Johnson",
+    "Hmm, I was wondering about something",
+    "Do you have openings for QA engineers?",
+    "I'd like to talk to somebody about an idea",
+]
+
+
+def _reply(messages):
+    first = messages[0]
+    content = first["content"] if isinstance(first, dict) else first.content
+    return "GENERAL" if "intent classifier" in content else SPECIALIST_REPLY
+
+
+class CollectorStandIn:
+    """Accepts OTLP/HTTP trace exports and counts their spans."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.spans = 0
+        self.requests = 0
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_post("/v1/traces", self._traces)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        return f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}/v1/traces"
+
+    async def _traces(self, request):
+        export = ExportTraceServiceRequest.FromString(await request.read())
+        self.requests += 1
+        self.spans += sum(len(scope.spans) for resource in export.resource_spans for scope in resource.scope_spans)
+        await asyncio.sleep(self.delay)
+        return web.Response(body=b"", content_type="application/x-protobuf")
+
+    async def close(self):
+        await self._runner.cleanup()
+
+
+async def run_phase(graph, llm, turns, traced):
+    latencies = []
+    cpu_started = time.process_time()
+    for turn in range(turns):
+        config = {"configurable": {"history": ConversationHistory(llm)}}
+        if traced:
+            config["callbacks"] = [GraphTracingHandler()]
+        bind_call(f"call-{turn}", "default")
+        latencies.append(await measure_turn(graph, utterance=UTTERANCES[turn % len(UTTERANCES)], config=config))
+    return latencies, (time.process_time() - cpu_started) / turns
+
+
+def _report(label, samples, cpu):
+    first = [sample[0] * 1000 for sample in samples]
+    full = [sample[2] * 1000 for sample in samples]
+    print(
+        f"{label:<18} first chunk p50={statistics.median(first):6.1f} ms  full reply p50={statistics.median(full):6.1f} ms  "
+        f"CPU per turn {cpu * 1000:5.2f} ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--collector-delay", type=float, default=0.5)
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="tracing-benchmark-")
+    trace_file = os.path.join(directory, "traces.jsonl")
+    collector = CollectorStandIn(args.collector_delay)
+    endpoint = await collector.start()
+    try:
+        llm = LatencyFakeChatModel(reply=_reply, first_token_latency=args.llm_latency, token_interval=0.02)
+        bs23_frontdesk_agent.RESPONSE_CACHE_ENABLED = False
+        graph = bs23_frontdesk_agent.create_bs23_frontdesk_graph(llm, routing_mode="two_hop", tool_nodes={})
+
+        _report("tracing off", *await run_phase(graph, llm, args.turns, traced=False))
+
+        provider = setup_tracing("file", exporter=JSONLinesSpanExporter(trace_file))
+        _report("file exporter", *await run_phase(graph, llm, args.turns, traced=True))
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter(endpoint=endpoint)))
+        _report("file + slow OTLP", *await run_phase(graph, llm, args.turns, traced=True))
+
+        await asyncio.to_thread(provider.force_flush)
+        await asyncio.to_thread(provider.shutdown)
+        print(f"collector stand-in received {collector.spans} spans in {collector.requests} requests")
+
+        with open(trace_file) as f:
+            spans = [json.loads(line) for line in f]
+        durations = defaultdict(list)
+        first_tokens = []
+        for span in spans:
+            durations[span["name"]].append(span["duration_ms"])
+            if "frontdesk.first_token_ms" in span["attributes"] and span["attributes"].get("frontdesk.node") != "intent_analyzer":
+                first_tokens.append(span["attributes"]["frontdesk.first_token_ms"])
+        turns = len(durations["graph_turn"])
+        print(f"file: {len(spans)} spans over {turns} turns ({len(spans) / turns:.1f} per turn)")
+        for name, values in sorted(durations.items(), key=lambda item: -statistics.mean(item[1])):
+            print(f"  {name:<22} {len(values):4d} spans  avg {statistics.mean(values):7.1f} ms")
+        if first_tokens:
+            print(f"  specialist first token avg {statistics.mean(first_tokens):.1f} ms")
+        print(f"  tagged: {spans[-1]['attributes'].get('frontdesk.call_id')} / {spans[-1]['attributes'].get('frontdesk.persona')}")
+    finally:
+        await collector.close()
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
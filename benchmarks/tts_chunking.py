@@ -0,0 +1,155 @@
+"""TTS chunking: first audio, TTS requests and playback stalls per flush policy.
+
+Streams a multi-sentence specialist reply from the latency fake model into
+``FrontdeskAgent``'s TTS stage, backed by a fake streaming TTS that, like
+Deepgram, synthesizes one flushed segment at a time: ``--ttfb`` before the
+first frame of each segment, then audio at ``--realtime-factor`` times real
+time. Playback is simulated from the frame arrival times: a stall is any
+moment the next frame has not arrived when the previous one finishes playing.
+
+Policies compared:
+
+- one request: the previous behaviour, where the reply is flushed once it is
+  complete.
+- every sentence: a flush after each clause or sentence.
+- batched, no lead: an early first clause, then sentences batched to
+  ``batch_chars`` regardless of how much audio is queued.
+- chunker: the default ``FlushPolicy``, which also flushes early when
+  queued audio runs low.
+
+Run from the repository root::
+
+    python -m benchmarks.tts_chunking
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import time
+
+os.environ.setdefault("GROQ_API_KEY", "offline-benchmark")
+
+from livekit import rtc
+from livekit.agents import tts as agents_tts
+
+from benchmarks.fake_llm import LatencyFakeChatModel
+from voice.agent import FrontdeskAgent
+from voice.audio_cache import FRAME_MS
+from voice.text_chunker import FlushPolicy
+
+REPLY = (
+    "Certainly, I can help you with that. Brain Station 23 is a software company based in Dhaka, "
+    "working with clients in Europe, the Nordics and the Middle East. Our teams build custom software, "
+    "mobile apps and cloud platforms, and we also run dedicated development teams for long-term partners. "
+    "If you would like, I can connect you with our business development team. "
+    "They usually reply within one working day. Is there anything else I can help you with today?"
+)
+
+POLICIES = {
+    "one request": FlushPolicy(first_flush_words=10**6, min_clause_words=10**6, batch_chars=10**6),
+    "every sentence": FlushPolicy(first_flush_words=10**6, min_clause_words=1, batch_chars=1),
+    "batched, no lead": FlushPolicy(min_lead_seconds=0.0),
+    "chunker": FlushPolicy(),
+}
+
+# Roughly how long TTS audio lasts per character of text
+SECONDS_PER_CHAR = 0.06
+
+
+class FakeSynthesizeStream:
+    """Streaming TTS session: flushed segments are synthesized in order."""
+
+    def __init__(self, tts):
+        self._tts = tts
+        self._text = ""
+        self._segments = asyncio.Queue()
+
+    def push_text(self, text):
+        self._text += text
+
+    def flush(self):
+        if self._text:
+            self._segments.put_nowait(self._text)
+            self._tts.requests += 1
+        self._text = ""
+
+    def end_input(self):
+        self.flush()
+        self._segments.put_nowait(None)
+
+    async def __aiter__(self):
+        samples = self._tts.sample_rate * FRAME_MS // 1000
+        silence = bytes(samples * 2)
+        while (text := await self._segments.get()) is not None:
+            await asyncio.sleep(self._tts.ttfb)
+            count = max(1, int(len(text) * SECONDS_PER_CHAR * 1000 / FRAME_MS))
+            for index in range(count):
+                await asyncio.sleep(FRAME_MS / 1000 / self._tts.realtime_factor)
+                frame = rtc.AudioFrame(silence, self._tts.sample_rate, 1, samples)
+                yield agents_tts.SynthesizedAudio(frame=frame, request_id="fake", is_final=index == count - 1)
+
+
+class StreamingFakeTTS:
+    """Stand-in for Deepgram's streaming TTS."""
+
+    provider = "fake"
+    model = "latency-fake"
+    sample_rate = 24000
+    num_channels = 1
+    capabilities = agents_tts.TTSCapabilities(streaming=True)
+
+    def __init__(self, ttfb, realtime_factor):
+        self.ttfb = ttfb
+        self.realtime_factor = realtime_factor
+        self.requests = 0
+
+    @contextlib.asynccontextmanager
+    async def stream(self):
+        yield FakeSynthesizeStream(self)
+
+
+async def speak(policy, args):
+    llm = LatencyFakeChatModel(reply=REPLY, first_token_latency=args.llm_latency, token_interval=args.token_interval)
+    tts = StreamingFakeTTS(args.ttfb, args.realtime_factor)
+    agent = FrontdeskAgent(instructions="", session_tts=tts, flush_policy=policy)
+
+    async def reply_text():
+        async for chunk in llm.astream(REPLY):
+            yield chunk.content
+
+    started = time.perf_counter()
+    first_audio = None
+    playhead = 0.0
+    stalls = stalled = 0.0
+    async for _ in agent._synthesize(reply_text(), None):
+        arrived = time.perf_counter() - started
+        if first_audio is None:
+            first_audio = playhead = arrived
+        elif arrived > playhead + 0.005:
+            stalls += 1
+            stalled += arrived - playhead
+            playhead = arrived
+        playhead += FRAME_MS / 1000
+    return first_audio, playhead, tts.requests, stalls, stalled, agent.tts_latency.stats()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ttfb", type=float, default=0.2)
+    parser.add_argument("--realtime-factor", type=float, default=5.0)
+    parser.add_argument("--llm-latency", type=float, default=0.25)
+    parser.add_argument("--token-interval", type=float, default=0.03)
+    args = parser.parse_args()
+
+    for label, policy in POLICIES.items():
+        first, done, requests, stalls, stalled, stats = await speak(policy, args)
+        print(
+            f"{label:<17} first audio {first * 1000:6.0f} ms  playback ends {done:5.2f} s  "
+            f"TTS requests {requests:2d}  stalls {stalls:3.0f} ({stalled * 1000:4.0f} ms)  "
+            f"segment TTFB first/later {stats['first_avg_ms']}/{stats['later_avg_ms']} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,15 +1,19 @@
+import asyncio
 import logging
+import os
+import sys
 from typing import Annotated, TypedDict
 
+import httpx
 from dotenv import load_dotenv
 from langchain_groq import ChatGroq
 from langchain_core.messages import AnyMessage
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import START, END, StateGraph
 from langgraph.graph.message import add_messages
 from langgraph.managed.is_last_step import RemainingSteps
 
 from livekit.agents import (
-    Agent,
     AgentSession,
     JobContext,
     JobProcess,
@@ -17,17 +21,46 @@ from livekit.agents import (
     WorkerOptions,
     cli,
 )
-from livekit.plugins import deepgram, silero, langchain
+from livekit.plugins import deepgram, langchain
 from livekit.plugins.groq import LLM as GroqLLM
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
 
 logger = logging.getLogger("bs23-frontdesk-agent")
 load_dotenv(".env")
 
-# Initialize LLM
-llm = ChatGroq(model="llama-3.3-70b-versatile")
+# "two_hop": intent_analyzer call, then the routed specialist call
+# "single_pass": one call that classifies the intent and answers
+ROUTING_MODE = os.getenv("FRONTDESK_ROUTING_MODE", "two_hop")
 
-# Memory components removed - not needed for LiveKit compatibility
+# single_pass streams its reply through the custom writer, not chat-model tokens
+STREAM_MODES = {"two_hop": "messages", "single_pass": "custom"}
+
+# Open Groq/Deepgram connections while the room is still connecting
+CONNECTION_WARMUP = os.getenv("FRONTDESK_CONNECTION_WARMUP", "1") == "1"
+GROQ_WARMUP_URL = "https://api.groq.com/openai/v1/models"
+
+# The Groq SDK default drops idle connections after 5 s, shorter than a
+# typical pause between caller turns, so each turn paid a new TLS handshake
+HTTP_KEEPALIVE_EXPIRY = 120.0
+
+# Optional agent config file; when set, the graph is compiled from it
+AGENT_CONFIG_FILE = os.getenv("FRONTDESK_AGENT_CONFIG")
+
+# Optional directory of agent config files; each job picks one by the
+# ai_agent_id in its job or room metadata
+AGENT_CONFIG_DIR = os.getenv("FRONTDESK_AGENT_CONFIG_DIR")
+
+# Config tool answered from the local knowledge base instead of its endpoint
+KNOWLEDGE_TOOL = "vector_search"
+
+DEFAULT_GREETING = "Greet the user with your standard Brain Station 23 greeting."
+
+# Spoken verbatim (from the audio cache) at the start of default-agent calls
+DEFAULT_WELCOME_MESSAGE = "Thank you for calling Brain Station 23. This is Sabnam, how may I help you today?"
+
+# Cross-call caller memory lives outside the graph: loaded into the call's
+# ConversationHistory at call start and updated after the call
+# (subagents.caller_memory)
 
 # Import specialist functions from sub-agents
 from subagents.employee_agent import intent_analyzer, employee_specialist
@@ -35,6 +68,53 @@ from subagents.company_agent import company_specialist, general_receptionist
 from subagents.project_agent import project_specialist
 from subagents.job_agent import job_specialist
 from subagents.admin_agent import admin_specialist
+from subagents.router_agent import single_pass_router
+from subagents.intent_router import AGENT_CONFIG_PATH, LocalIntentRouter, get_local_intent_router, route_label
+from subagents.agent_config import load_agent_spec
+from subagents.graph_cache import AgentGraphCache, agent_id_from_metadata
+from subagents.admission import ADMISSION_ENABLED, LLM_REQUESTS, start_load_reporter, worker_admission_options
+from subagents.base import run_specialist
+from subagents.caller_memory import caller_memory_message, get_memory_store, load_caller_memory, remember_call
+from subagents.history import ConversationHistory
+from subagents.loop_watchdog import LOOP_WATCHDOG_ENABLED, StallAttributionHandler, start_loop_watchdog
+from subagents.metrics import GraphMetricsHandler, call_ended, call_started, metrics_enabled, start_process_sampler, worker_metrics_options
+from subagents.response_cache import RESPONSE_CACHE_ENABLED, ResponseCache, cached_turn, node_scope
+from subagents.tool_node import ParallelToolNode, create_tool_nodes, tool_latency_summary
+from subagents.tracing import GraphTracingHandler, bind_call, setup_tracing, tracing_enabled
+from tools.caller_store import get_caller_store, phone_key
+from tools.email_outbox import start_email_sender
+from tools.knowledge_base import get_knowledge_index, start_knowledge_refresh
+from tools.registry import LOCAL_TOOLS, TOOLS_ENABLED
+from subagent_prompts.registry import PromptRegistry
+from voice.agent import FrontdeskAgent
+from voice.audio_cache import AUDIO_CACHE_ENABLED, TTSAudioCache
+from voice.session_settings import aget_vad, get_vad, turn_handling_options
+from voice.speculation import SPECULATION_MODE, TurnSpeculator, preemptive_generation_options, speculated_intent
+
+AGENT_INSTRUCTIONS = """You are Sabnam, the virtual receptionist for Brain Station 23. 
+
+GREETING BEHAVIOR: 
+- ONLY greet with "Thank you for calling Brain Station 23. This is Sabnam, how may I help you today?" at the very beginning of the conversation
+- After the initial greeting, respond naturally to the caller's requests without repeating the greeting
+- Continue the conversation flow normally based on what the caller is asking
+
+You have access to a team of specialized assistants through your supervisor system:
+- Company information and services
+- Project discussions and lead generation  
+- Employee contact and connections
+- Career opportunities and jobs
+- Administrative and compliance matters
+"""
+
+# Routing table from intent label to specialist node
+INTENT_ROUTES = {
+    "EMPLOYEE": "employee_specialist",
+    "COMPANY": "company_specialist",
+    "PROJECT": "project_specialist",
+    "JOB": "job_specialist",
+    "ADMIN": "admin_specialist",
+    "GENERAL": "general_receptionist",
+}
 
 class State(TypedDict):
     """State schema for the BS23 frontdesk workflow."""
@@ -44,48 +124,107 @@ class State(TypedDict):
 
 
 
+def create_http_client(keepalive_expiry: float = HTTP_KEEPALIVE_EXPIRY):
+    """Create the pooled keep-alive HTTP client used for Groq requests."""
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=keepalive_expiry),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+
+
+def create_llm(http_async_client=None):
+    """Create the Groq chat model shared by every graph node.
+    
+    With admission control on, its requests in flight are counted for the
+    worker's load (``subagents.admission``).
+    """
+    return ChatGroq(
+        model="llama-3.3-70b-versatile", http_async_client=http_async_client,
+        callbacks=[LLM_REQUESTS] if ADMISSION_ENABLED else None,
+    )
+
+
+def get_turn_detector(proc: JobProcess):
+    """Turn detector shared by every job in the process.
+    
+    The ONNX weights are loaded once by the worker's inference process; the
+    model object needs a job context to reach it, so the first job creates
+    it and later jobs reuse it.
+    """
+    if "turn_detection" not in proc.userdata:
+        proc.userdata["turn_detection"] = MultilingualModel()
+    return proc.userdata["turn_detection"]
+
+
+async def warm_up_connections(http_client, stt, tts):
+    """Open the STT/TTS sockets and a Groq keep-alive connection ahead of the first turn."""
+    stt.prewarm()
+    tts.prewarm()
+    try:
+        await http_client.get(GROQ_WARMUP_URL, headers={"Authorization": f"Bearer {os.getenv('GROQ_API_KEY', '')}"})
+    except httpx.HTTPError as e:
+        logger.warning("Groq connection warm-up failed: %s", e)
+
+
+def call_history(config: RunnableConfig):
+    """Per-call ConversationHistory passed in through the adapter's config."""
+    return config.get("configurable", {}).get("history")
+
+
 # LangGraph-based frontdesk agent with modular prompts
-def create_bs23_frontdesk_graph():
-    """Create LiveKit-compatible supervisor using modular LangGraph approach."""
+def create_bs23_frontdesk_graph(llm=None, routing_mode: str = ROUTING_MODE, prompts=None, tool_nodes=None, knowledge=None,
+                                response_cache=None):
+    """Create LiveKit-compatible supervisor using modular LangGraph approach.
+    
+    The compiled graph holds no per-call state, so a worker builds it once
+    in ``prewarm`` and every job in the process shares it. Specialists with
+    an entry in ``tool_nodes`` run a tool-calling loop. The company, project,
+    job and general specialists get per-turn snippets from the ``knowledge``
+    index (``tools.knowledge_base``). Company and job answers are served
+    from ``response_cache`` when the same question was answered before.
+    """
+    llm = llm or create_llm()
+    prompts = prompts or PromptRegistry()
+    tool_nodes = create_tool_nodes() if tool_nodes is None else tool_nodes
+    knowledge = get_knowledge_index() if knowledge is None else knowledge
+    if response_cache is None and RESPONSE_CACHE_ENABLED:
+        response_cache = ResponseCache()
+    company_scope = node_scope("company_specialist", prompts["company_specialist"])
+    job_scope = node_scope("job_specialist", prompts["job_specialist"])
     
-    # Wrapper functions to pass llm parameter to imported functions
-    def intent_analyzer_wrapper(state: State):
-        return intent_analyzer(state, llm)
+    if routing_mode == "single_pass":
+        return create_single_pass_graph(llm, prompts, knowledge)
     
-    def employee_specialist_wrapper(state: State):
-        return employee_specialist(state, llm)
+    # Async wrapper functions to pass llm and prompt to imported functions;
+    # async nodes let the LLM tokens stream out of the graph as they arrive
+    async def intent_analyzer_wrapper(state: State, config: RunnableConfig):
+        return await speculated_intent(config, state, lambda: intent_analyzer(state, llm, intent_prompt=prompts["intent_analyzer"]))
     
-    def company_specialist_wrapper(state: State):
-        return company_specialist(state, llm)
+    async def employee_specialist_wrapper(state: State, config: RunnableConfig):
+        return await employee_specialist(state, llm, prompts["employee_specialist"], call_history(config), tool_nodes.get("employee_specialist"))
     
-    def project_specialist_wrapper(state: State):
-        return project_specialist(state, llm)
+    async def company_specialist_wrapper(state: State, config: RunnableConfig):
+        return await cached_turn(response_cache, company_scope, "COMPANY", state, lambda: company_specialist(
+            state, llm, prompts["company_specialist"], call_history(config), tool_nodes.get("company_specialist"), knowledge
+        ), call_history(config))
     
-    def job_specialist_wrapper(state: State):
-        return job_specialist(state, llm)
+    async def project_specialist_wrapper(state: State, config: RunnableConfig):
+        return await project_specialist(state, llm, prompts["project_specialist"], call_history(config), tool_nodes.get("project_specialist"), knowledge)
     
-    def admin_specialist_wrapper(state: State):
-        return admin_specialist(state, llm)
+    async def job_specialist_wrapper(state: State, config: RunnableConfig):
+        return await cached_turn(response_cache, job_scope, "JOB", state, lambda: job_specialist(
+            state, llm, prompts["job_specialist"], call_history(config), tool_nodes.get("job_specialist"), knowledge
+        ), call_history(config))
     
-    def general_receptionist_wrapper(state: State):
-        return general_receptionist(state, llm)
+    async def admin_specialist_wrapper(state: State, config: RunnableConfig):
+        return await admin_specialist(state, llm, prompts["admin_specialist"], call_history(config), tool_nodes.get("admin_specialist"))
+    
+    async def general_receptionist_wrapper(state: State, config: RunnableConfig):
+        return await general_receptionist(state, llm, prompts["general_receptionist"], call_history(config), tool_nodes.get("general_receptionist"), knowledge)
     
     def route_intent(state: State):
         """Route based on detected intent."""
-        intent = state.get("intent", "GENERAL")
-        
-        if intent == "EMPLOYEE":
-            return "employee_specialist"
-        elif intent == "COMPANY":
-            return "company_specialist"
-        elif intent == "PROJECT":
-            return "project_specialist"
-        elif intent == "JOB":
-            return "job_specialist"
-        elif intent == "ADMIN":
-            return "admin_specialist"
-        else:
-            return "general_receptionist"
+        return INTENT_ROUTES.get(state.get("intent", "GENERAL"), INTENT_ROUTES["GENERAL"])
     
     # Create LangGraph with intelligent routing
     from langgraph.graph import StateGraph, START, END
@@ -107,14 +246,7 @@ def create_bs23_frontdesk_graph():
     builder.add_conditional_edges(
         "intent_analyzer",
         route_intent,
-        {
-            "employee_specialist": "employee_specialist",
-            "company_specialist": "company_specialist", 
-            "project_specialist": "project_specialist",
-            "job_specialist": "job_specialist",
-            "admin_specialist": "admin_specialist",
-            "general_receptionist": "general_receptionist"
-        }
+        list(INTENT_ROUTES.values()),
     )
     
     # All specialists end the conversation
@@ -128,59 +260,405 @@ def create_bs23_frontdesk_graph():
     return builder.compile()  # Simple compile like working example - NO NAME, NO CHECKPOINTER
 
 
+def create_single_pass_graph(llm, prompts, knowledge=None):
+    """Create a graph that classifies and answers in one LLM round trip.
+
+    The node still records one of the six intents in ``state["intent"]``;
+    only the second network call of the two-hop path is removed. A turn
+    the model only labels is answered with that intent's specialist prompt.
+    """
+    specialist_prompts = {intent: prompts[node] for intent, node in INTENT_ROUTES.items()}
+    
+    async def single_pass_router_wrapper(state: State, config: RunnableConfig):
+        return await single_pass_router(
+            state, llm, prompts["single_pass_router"], call_history(config), knowledge, specialist_prompts
+        )
+    
+    builder = StateGraph(State)
+    builder.add_node("single_pass_router", single_pass_router_wrapper)
+    builder.add_edge(START, "single_pass_router")
+    builder.add_edge("single_pass_router", END)
+    
+    return builder.compile()
+
+
+def spec_tool_node(node, tool_nodes):
+    """Tool node for a config node's locally available tools.
+
+    ``tool_nodes`` maps tool-name tuples to nodes so config nodes with the
+    same tools share one node (and its latency stats); ``None`` disables tools.
+    """
+    names = tuple(sorted(tool["name"] for tool in node["tools"] if tool["name"] in LOCAL_TOOLS))
+    if not names or tool_nodes is None:
+        return None
+    if names not in tool_nodes:
+        tool_nodes[names] = ParallelToolNode([LOCAL_TOOLS[name] for name in names])
+    return tool_nodes[names]
+
+
+def create_graph_from_spec(spec, llm=None, tool_nodes=None, response_cache=None):
+    """Create the two-hop graph described by a compiled agent config spec.
+
+    One node per config node, an intent analyzer using the spec's local
+    router and classifier prompt, and a dictionary routing table; see
+    ``subagents.agent_config``. Config tools are bound when a local tool of
+    the same name exists (``tools.registry.LOCAL_TOOLS``). Nodes declaring
+    the remote ``vector_search`` tool get per-turn snippets from the local
+    index of the spec's ``knowledge_base_id`` instead of a tool round trip.
+    Nodes routed as COMPANY or JOB answer repeated questions from
+    ``response_cache``.
+    """
+    llm = llm or create_llm()
+    if tool_nodes is None and TOOLS_ENABLED:
+        tool_nodes = {}
+    router = LocalIntentRouter(spec["keywords"])
+    routes = spec["routes"]
+    knowledge = get_knowledge_index(spec["session"].get("knowledge_base_id"))
+    if response_cache is None and RESPONSE_CACHE_ENABLED:
+        response_cache = ResponseCache()
+    
+    async def intent_analyzer_wrapper(state: State, config: RunnableConfig):
+        return await speculated_intent(config, state, lambda: intent_analyzer(state, llm, intent_prompt=spec["classifier_prompt"], router=router))
+    
+    def make_node(name, prompt, tool_node, knowledge):
+        intent, scope = route_label(name), node_scope(f"{spec['config_hash']}:{name}", prompt)
+        async def node(state: State, config: RunnableConfig):
+            return await cached_turn(response_cache, scope, intent, state, lambda: run_specialist(
+                state, llm, prompt, call_history(config), name, tool_node=tool_node, knowledge=knowledge
+            ), call_history(config))
+        return node
+    
+    def route_intent(state: State):
+        return routes.get(state.get("intent", "GENERAL"), routes["GENERAL"])
+    
+    builder = StateGraph(State)
+    builder.add_node("intent_analyzer", intent_analyzer_wrapper)
+    for name, node in spec["nodes"].items():
+        retrieves = any(tool["name"] == KNOWLEDGE_TOOL for tool in node["tools"])
+        builder.add_node(name, make_node(name, sys.intern(node["prompt"]), spec_tool_node(node, tool_nodes), knowledge if retrieves else None))
+        builder.add_edge(name, END)
+    builder.add_edge(START, "intent_analyzer")
+    builder.add_conditional_edges("intent_analyzer", route_intent, list(spec["nodes"]))
+    
+    return builder.compile()
+
+async def select_agent(ctx: JobContext):
+    """Pick the graph, instructions, welcome message, stream mode, session settings and persona for a job.
+
+    Jobs naming a known ``ai_agent_id`` get that persona's cached graph,
+    built off the event loop on a miss; everything else gets the process's
+    default graph, with the session settings of the bundled agent config.
+    """
+    userdata = ctx.proc.userdata
+    spec = userdata.get("agent_spec")
+    graph = userdata["graph"]
+    cache = userdata.get("agent_cache")
+    agent_id = agent_id_from_metadata(ctx.job.metadata, ctx.job.room.metadata, known=cache) if cache is not None else None
+    if agent_id:
+        cached = await cache.aget(agent_id)
+        if cached:
+            spec, graph = cached.spec, cached.graph
+        elif agent_id not in cache:
+            logger.warning("unknown ai_agent_id %s, using the default agent", agent_id)
+    
+    if spec is None:
+        return (
+            graph, AGENT_INSTRUCTIONS, DEFAULT_WELCOME_MESSAGE, STREAM_MODES[ROUTING_MODE],
+            userdata.get("default_session"), "default",
+        )
+    # Config-compiled graphs always use the two-hop layout
+    persona = spec["agent_id"] or spec["agent_name"] or "config"
+    return graph, spec["instructions"], spec["welcome_message"], "messages", spec["session"], persona
+
+
+def load_default_session():
+    """Session settings of the bundled agent config, or ``None`` when it cannot be read."""
+    try:
+        return load_agent_spec(AGENT_CONFIG_PATH)["session"]
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning("no session settings for the default agent from %s: %s", AGENT_CONFIG_PATH, e)
+        return None
+
 
 def prewarm(proc: JobProcess):
-    """Preload components for faster startup."""
-    proc.userdata["vad"] = silero.VAD.load()
+    """Preload components for faster startup.
+    
+    Everything here is shared by all jobs in the process; entrypoint only
+    creates per-call objects.
+    """
+    setup_tracing()
+    if metrics_enabled():
+        start_process_sampler()
+    proc.userdata["http_client"] = create_http_client()
+    proc.userdata["llm"] = create_llm(proc.userdata["http_client"])
+    proc.userdata["prompts"] = PromptRegistry()
+    # Tool nodes are shared by every graph in the process, so their latency
+    # stats cover all calls
+    proc.userdata["tool_nodes"] = create_tool_nodes()
+    spec_tool_nodes = proc.userdata["spec_tool_nodes"] = {} if TOOLS_ENABLED else None
+    # One response cache for every graph; entries are scoped per node prompt
+    response_cache = proc.userdata["response_cache"] = ResponseCache() if RESPONSE_CACHE_ENABLED else None
+    if AGENT_CONFIG_FILE:
+        proc.userdata["agent_spec"] = load_agent_spec(AGENT_CONFIG_FILE)
+        get_vad(proc, proc.userdata["agent_spec"]["session"])
+        proc.userdata["graph"] = create_graph_from_spec(
+            proc.userdata["agent_spec"], proc.userdata["llm"], spec_tool_nodes, response_cache
+        )
+    else:
+        proc.userdata["graph"] = create_bs23_frontdesk_graph(
+            proc.userdata["llm"], prompts=proc.userdata["prompts"], tool_nodes=proc.userdata["tool_nodes"],
+            response_cache=response_cache,
+        )
+        # The built-in agent is the bundled config's persona; it takes that
+        # config's endpointing and interruption settings
+        proc.userdata["default_session"] = load_default_session()
+        get_vad(proc, proc.userdata["default_session"])
+    if AGENT_CONFIG_DIR:
+        llm = proc.userdata["llm"]
+        proc.userdata["agent_cache"] = AgentGraphCache(
+            lambda spec: create_graph_from_spec(spec, llm, spec_tool_nodes, response_cache), AGENT_CONFIG_DIR
+        )
+    get_local_intent_router()
+    get_knowledge_index()
+    if TOOLS_ENABLED:
+        get_caller_store()
+    get_memory_store()
+    proc.userdata["audio_cache"] = TTSAudioCache() if AUDIO_CACHE_ENABLED else None
 
 
 
 
+async def recognize_caller(ctx: JobContext, caller_store, memory_store, history):
+    """Look up the caller by their SIP phone number once they join.
+
+    Logs returning callers found in ``caller_store`` and loads their memory
+    from ``memory_store`` into ``history``. Returns ``(caller_id, profile)``
+    for updating the memory after the call. A store that fails (e.g. a
+    locked database) is logged and only costs the call its recognition.
+    """
+    participant = await ctx.wait_for_participant()
+    phone = participant.attributes.get("sip.phoneNumber")
+    caller_id = phone_key(phone)
+    if caller_store is not None:
+        try:
+            # The lookup reads the log and may catch up on other processes' records
+            caller = await asyncio.to_thread(caller_store.lookup, phone=phone)
+        except Exception as e:
+            logger.warning("caller lookup failed: %s", e)
+            caller = None
+        if caller:
+            logger.info("returning caller: %d previous calls", caller["calls"])
+    if memory_store is None or not caller_id:
+        return caller_id, {}
+    try:
+        profile = await load_caller_memory(memory_store, caller_id)
+    except Exception as e:
+        logger.warning("caller memory load failed: %s", e)
+        # No caller id: a profile rebuilt from this call alone must not replace the stored one
+        return None, {}
+    history.caller_memory = caller_memory_message(profile)
+    return caller_id, profile
+
+
 async def entrypoint(ctx: JobContext):
     """Main entrypoint for the BS23 frontdesk agent."""
     
-    # Use your original complex supervisor workflow (without memory for LiveKit compatibility)
-    bs23_graph = create_bs23_frontdesk_graph()
+    # Supervisor workflow compiled once per process in prewarm, or the
+    # job's persona from the process's agent cache
+    bs23_graph, instructions, welcome_message, stream_mode, session_settings, persona = await select_agent(ctx)
+    # Spans from this call's tasks carry its id and persona
+    bind_call(ctx.job.id, persona)
+    call_started(persona)
+    
+    async def end_call_metrics():
+        call_ended(persona)
+    
+    ctx.add_shutdown_callback(end_call_metrics)
+    
+    # The worker's load function reads this process's loop lag and model requests
+    if ADMISSION_ENABLED:
+        start_load_reporter()
+    
+    # Edited knowledge files are re-indexed in a worker thread, off the call's path
+    start_knowledge_refresh()
+    
+    stt = deepgram.STT(model="nova-2-general")
+    tts = deepgram.TTS(model="aura-asteria-en")
+    warmup = asyncio.create_task(warm_up_connections(ctx.proc.userdata["http_client"], stt, tts)) if CONNECTION_WARMUP else None
+    
+    # Per-call state travels to the shared graph through the run config
+    history = ConversationHistory(ctx.proc.userdata["llm"])
+    ctx.add_shutdown_callback(history.aclose)
+    
+    async def log_prompt_stats():
+        stats = history.prompt_stats
+        logger.info(
+            "prompt stats: %d specialist turns, %d bytes sent, %d bytes in reused prefixes, %d cache-eligible turns",
+            stats.turns, stats.prompt_bytes, stats.cached_prefix_bytes, stats.eligible_turns,
+        )
+    
+    ctx.add_shutdown_callback(log_prompt_stats)
+    
+    async def log_tool_stats():
+        tool_nodes = [*ctx.proc.userdata["tool_nodes"].values(), *(ctx.proc.userdata["spec_tool_nodes"] or {}).values()]
+        stats = tool_latency_summary(tool_nodes)
+        if stats:
+            logger.info("tool latency (process totals): %s", stats)
+    
+    ctx.add_shutdown_callback(log_tool_stats)
+    
+    if TOOLS_ENABLED:
+        # One sender per process delivers the outbox across calls
+        email_sender = start_email_sender()
+    
+        async def log_email_stats():
+            logger.info("email outbox (process totals): %s", email_sender.stats())
+    
+        ctx.add_shutdown_callback(log_email_stats)
+    
+    caller_store = get_caller_store() if TOOLS_ENABLED else None
+    if caller_store is not None:
+        async def flush_caller_store():
+            # Records queued during the call reach the log before the job ends
+            await asyncio.to_thread(caller_store.flush, 5.0)
+            logger.info("caller store (process totals): %s", caller_store.stats())
+    
+        ctx.add_shutdown_callback(flush_caller_store)
+    
+    if "agent_cache" in ctx.proc.userdata:
+        async def log_agent_cache_stats():
+            logger.info("agent graph cache: %s", ctx.proc.userdata["agent_cache"].stats())
+        
+        ctx.add_shutdown_callback(log_agent_cache_stats)
+    
+    if ctx.proc.userdata.get("response_cache") is not None:
+        async def log_response_cache_stats():
+            logger.info("response cache (process totals): %s", ctx.proc.userdata["response_cache"].stats())
+        
+        ctx.add_shutdown_callback(log_response_cache_stats)
+    
+    audio_cache = ctx.proc.userdata.get("audio_cache")
+    if audio_cache is not None:
+        async def log_audio_cache_stats():
+            logger.info("TTS audio cache (process totals): %s", audio_cache.stats())
+        
+        ctx.add_shutdown_callback(log_audio_cache_stats)
+    
+    # Intent analysis starts on stable interim transcripts
+    speculator = TurnSpeculator(bs23_graph) if SPECULATION_MODE != "off" else None
+    if speculator is not None:
+        async def log_speculation_stats():
+            await speculator.aclose()
+            logger.info("speculation (%s): %s", SPECULATION_MODE, speculator.stats())
+        
+        ctx.add_shutdown_callback(log_speculation_stats)
+    
+    # Spans, Prometheus metrics and stall attribution all come from run callbacks
+    callbacks = [GraphTracingHandler()] if tracing_enabled() else []
+    if metrics_enabled():
+        callbacks.append(GraphMetricsHandler())
+    if LOOP_WATCHDOG_ENABLED:
+        # One watchdog per process reports stalls from every call on its loop
+        loop_watchdog = start_loop_watchdog()
+        callbacks.append(StallAttributionHandler())
+        
+        async def log_loop_stalls():
+            logger.info("event loop stalls (process totals): %s", loop_watchdog.stats())
+        
+        ctx.add_shutdown_callback(log_loop_stalls)
     
     # Create agent with your original LangGraph supervisor
-    agent = Agent(
-        instructions="""You are Sabnam, the virtual receptionist for Brain Station 23. 
-
-GREETING BEHAVIOR: 
-- ONLY greet with "Thank you for calling Brain Station 23. This is Sabnam, how may I help you today?" at the very beginning of the conversation
-- After the initial greeting, respond naturally to the caller's requests without repeating the greeting
-- Continue the conversation flow normally based on what the caller is asking
-
-You have access to a team of specialized assistants through your supervisor system:
-- Company information and services
-- Project discussions and lead generation  
-- Employee contact and connections
-- Career opportunities and jobs
-- Administrative and compliance matters
-""",
-        llm=langchain.LLMAdapter(bs23_graph),
+    agent = FrontdeskAgent(
+        instructions=instructions,
+        llm=langchain.LLMAdapter(
+            bs23_graph,
+            config={
+                "configurable": {"history": history, "speculator": speculator},
+                "callbacks": callbacks or None,
+            },
+            stream_mode=stream_mode,
+        ),
+        audio_cache=audio_cache,
+        session_tts=tts,
     )
     
-    # Create session with voice components and adjusted turn detection
+    async def log_tts_latency():
+        logger.info("TTS segments: %s", agent.tts_latency.stats())
+    
+    ctx.add_shutdown_callback(log_tts_latency)
+    
+    # Create session with voice components; the persona's endpointing and
+    # interruption settings tune the VAD and turn handling
+    turn_handling = turn_handling_options(session_settings, get_turn_detector(ctx.proc))
+    turn_handling["preemptive_generation"] = preemptive_generation_options()
     session = AgentSession(
-        vad=ctx.proc.userdata["vad"],
-        stt=deepgram.STT(model="nova-2-general"),
-        tts=deepgram.TTS(model="aura-asteria-en"),
-        turn_detection=MultilingualModel(),
+        vad=await aget_vad(ctx.proc, session_settings),
+        stt=stt,
+        tts=tts,
+        turn_handling=turn_handling,
     )
     
+    if speculator is not None:
+        @session.on("user_input_transcribed")
+        def _on_transcript(ev):
+            speculator.on_transcript(ev.transcript, ev.is_final)
+        
+        @session.on("conversation_item_added")
+        def _on_item(ev):
+            if getattr(ev.item, "role", None) == "user":
+                speculator.end_turn()
+    
+    # Returning callers are recognized, and their memory loaded, while the
+    # session starts and greets
+    memory_store = get_memory_store()
+    caller_lookup = None
+    if caller_store is not None or memory_store is not None:
+        caller_lookup = asyncio.create_task(recognize_caller(ctx, caller_store, memory_store, history))
+    
+    if memory_store is not None:
+        async def save_caller_memory():
+            # After the call, off the turn loop: one LLM call updates the profile
+            if not caller_lookup.done() or caller_lookup.cancelled() or caller_lookup.exception():
+                return
+            caller_id, profile = caller_lookup.result()
+            if not caller_id:
+                return
+            transcript = [
+                (item.role, item.text_content) for item in session.history.items
+                if item.type == "message" and item.role in ("user", "assistant") and item.text_content
+            ]
+            try:
+                await remember_call(memory_store, ctx.proc.userdata["llm"], caller_id, transcript, profile)
+            except Exception:
+                logger.exception("caller memory update failed")
+        
+        ctx.add_shutdown_callback(save_caller_memory)
+    
     await session.start(
         agent=agent,
         room=ctx.room,
         room_input_options=RoomInputOptions(),
     )
     
-    # Generate initial greeting to activate TTS
-    await session.generate_reply(
-        instructions="Greet the user with your standard Brain Station 23 greeting."
-    )
+    # The welcome message is fixed text: speak it without an LLM round trip,
+    # from cached audio after the first call
+    if welcome_message and audio_cache is not None:
+        await session.say(welcome_message, audio=audio_cache.synthesize(welcome_message, tts))
+    elif welcome_message:
+        await session.say(welcome_message)
+    else:
+        await session.generate_reply(instructions=DEFAULT_GREETING)
+    
+    if warmup:
+        await warmup
+    if caller_lookup:
+        await caller_lookup
     
     logger.info("BS23 Frontdesk Agent started successfully with original multi-agent supervisor")
 
 if __name__ == "__main__":
-    cli.run_app(WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
+    # /metrics on FRONTDESK_METRICS_PORT, aggregated across job processes;
+    # new calls are turned away once a call's real cost would saturate the worker
+    cli.run_app(WorkerOptions(
+        entrypoint_fnc=entrypoint, prewarm_fnc=prewarm, **worker_metrics_options(), **worker_admission_options(),
+    ))
@@ -1,17 +1,29 @@
 """Employee contact prompts for Brain Station 23 frontdesk agent."""
 
+from tools.employee_directory import DIRECTORY_PROMPT_LIMIT, get_employee_directory
+from tools.registry import TOOLS_ENABLED
+
+
+def _directory_section(tools_enabled=TOOLS_ENABLED):
+    """Full directory listing for small directories, a pointer to per-turn
+    matches otherwise, plus the search tool as a fallback when bound."""
+    directory = get_employee_directory()
+    if len(directory) <= DIRECTORY_PROMPT_LIMIT:
+        section = directory.render()
+    else:
+        section = "The directory is too large to list here; employees matching the caller's request are given in a DIRECTORY MATCHES message."
+    if tools_enabled:
+        section += "\nIf the caller asks for someone not listed, look them up with the search_employee tool before saying they do not work here."
+    return section
+
+
 def generate_employee_assistant_prompt():
     """Generate system prompt for employee contact assistant."""
-    return """You are the Employee Contact Specialist for Brain Station 23.
+    return f"""You are the Employee Contact Specialist for Brain Station 23.
 You help callers connect with employees and provide employee information.
 
 EMPLOYEE DIRECTORY:
-- John Doe: Senior Developer, Engineering Department, john.doe@brainstation-23.com
-- Jane Smith: Project Manager, Operations Department, jane.smith@brainstation-23.com  
-- Ahmed Hassan: HR Manager, Human Resources Department, ahmed.hassan@brainstation-23.com
-- David Johnson: Senior Developer, Engineering Department, david.johnson@brainstation-23.com
-- Sarah Johnson: Senior Developer, Engineering Department, sarah.johnson@brainstation-23.com
-- Alen Johnson: Senior Developer, Engineering Department, alen.johnson@brainstation-23.com
+{_directory_section()}
 
 SECURITY PROTOCOL:
 - Always collect caller information before connecting to employees
@@ -26,17 +38,12 @@ RESPONSES:
 
 Handle employee-related requests professionally and securely."""
 
-def generate_employee_specialist_prompt():
+def generate_employee_specialist_prompt(tools_enabled=TOOLS_ENABLED):
     """Generate system prompt for employee specialist node."""
-    return """You are Sabnam, the Employee Contact Specialist for Brain Station 23.
+    return f"""You are Sabnam, the Employee Contact Specialist for Brain Station 23.
 
 EMPLOYEE DIRECTORY:
-- John Doe: Senior Developer, Engineering Department, john.doe@brainstation-23.com
-- Jane Smith: Project Manager, Operations Department, jane.smith@brainstation-23.com  
-- Ahmed Hassan: HR Manager, Human Resources Department, ahmed.hassan@brainstation-23.com
-- David Johnson: Senior Developer, Engineering Department, david.johnson@brainstation-23.com
-- Sarah Johnson: Senior Developer, Engineering Department, sarah.johnson@brainstation-23.com
-- Alen Johnson: Senior Developer, Engineering Department, alen.johnson@brainstation-23.com
+{_directory_section(tools_enabled)}
 
 SECURITY PROTOCOL:
 - Always collect caller information before connecting to employees
@@ -45,6 +52,17 @@ SECURITY PROTOCOL:
 
 Handle employee-related requests professionally and securely."""
 
+def generate_directory_matches_message(matches):
+    """Per-turn directory lookup result for large directories."""
+    if not matches:
+        return "DIRECTORY MATCHES: no employee in the directory matches the caller's request."
+    lines = "\n".join(
+        f"- {match.employee.name}: {match.employee.title}, {match.employee.department} Department, {match.employee.email}"
+        for match in matches
+    )
+    return f"""DIRECTORY MATCHES (best first; if several fit equally, ask the caller which one they mean):
+{lines}"""
+
 def generate_intent_classifier_prompt():
     """Generate prompt for intent classification."""
     return """You are an intent classifier for Brain Station 23 receptionist.
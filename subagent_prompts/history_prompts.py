@@ -0,0 +1,35 @@
+"""Conversation history prompts for Brain Station 23 frontdesk agent."""
+
+def generate_history_summary_prompt() -> str:
+    """
+    Generate the prompt that folds older call turns into a rolling summary.
+
+    Returns:
+        str: Prompt template with {summary} and {transcript} placeholders
+    """
+    return """You maintain a running summary of a phone call to the Brain Station 23 front desk.
+
+Update the existing summary with the new conversation turns. Keep every fact the
+receptionist may still need: the caller's name, company, contact details, who or
+what they asked about, details already collected, and promises made to the caller.
+Drop greetings and small talk. Write at most 120 words of plain text.
+
+Existing summary:
+{summary}
+
+New conversation turns:
+{transcript}
+
+Updated summary:"""
+
+def generate_history_context_message(summary: str) -> str:
+    """
+    Generate the system message that carries the rolling summary into a specialist turn.
+
+    Args:
+        summary (str): Current rolling summary of the older turns
+
+    Returns:
+        str: System message content
+    """
+    return f"Summary of the earlier part of this call:\n{summary}"
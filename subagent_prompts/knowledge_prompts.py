@@ -0,0 +1,20 @@
+"""Knowledge base prompts for Brain Station 23 frontdesk agent."""
+
+def generate_knowledge_message(snippets) -> str:
+    """
+    Generate the per-turn system message carrying retrieved knowledge snippets.
+
+    Args:
+        snippets (list[Snippet]): Retrieved snippets, best first
+
+    Returns:
+        str: System message content, or an empty string without snippets
+    """
+    if not snippets:
+        return ""
+    lines = "\n".join(
+        f"- {snippet.title}: {snippet.text}" if snippet.title else f"- {snippet.text}"
+        for snippet in snippets
+    )
+    return f"""KNOWLEDGE (answer from these facts; say so if they do not cover the question):
+{lines}"""
@@ -0,0 +1,52 @@
+"""Caller memory prompts for Brain Station 23 frontdesk agent."""
+
+def generate_memory_extraction_prompt() -> str:
+    """
+    Generate the prompt that updates a caller's memory profile after a call.
+
+    Returns:
+        str: Prompt template with {profile} and {transcript} placeholders
+    """
+    return """You keep notes about callers to the Brain Station 23 front desk, so the
+receptionist can pick up where the last call left off.
+
+Update the caller's profile from the call transcript below. Fields:
+- previous_purpose: why the caller called this time, in one short sentence
+- preferred_contact: how they want to be contacted (phone, email, a specific
+  address or time), only if they said so
+- requested_employee: the employee or team they asked for, if any
+
+Keep a field's existing value when the call says nothing new about it. Use an
+empty string for anything never mentioned. Do not guess.
+
+Existing profile:
+{profile}
+
+Call transcript:
+{transcript}
+
+Reply with only a JSON object with the keys previous_purpose, preferred_contact
+and requested_employee."""
+
+def generate_caller_memory_message(profile: dict) -> str:
+    """
+    Generate the system message that carries a returning caller's profile into a specialist turn.
+
+    Args:
+        profile (dict): Stored profile with previous_purpose, preferred_contact and requested_employee
+
+    Returns:
+        str: System message content, empty when nothing is known
+    """
+    lines = [
+        f"- {label}: {profile[field]}"
+        for field, label in (
+            ("previous_purpose", "Last call was about"),
+            ("preferred_contact", "Preferred contact"),
+            ("requested_employee", "Asked for"),
+        )
+        if profile.get(field)
+    ]
+    if not lines:
+        return ""
+    return "This caller has called before. From earlier calls:\n" + "\n".join(lines)
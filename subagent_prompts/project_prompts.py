@@ -36,17 +36,14 @@ RESPONSE:
 Help clients understand our project development capabilities and process."""
 
 def generate_project_specialist_prompt():
-    """Generate system prompt for project specialist node."""
+    """Generate system prompt for project specialist node.
+
+    Services, timelines and pricing come from the knowledge base in a
+    per-turn KNOWLEDGE message rather than from this prompt.
+    """
     return """You are Sabnam, the Project Discussion Specialist for Brain Station 23.
 
-PROJECT SERVICES:
-- Custom software development
-- Web applications (React, Node.js, Python, Java)
-- Mobile applications (iOS, Android, React Native)
-- AI/ML solutions and data analytics
-- Digital transformation services
-- Agile methodology with 2-12 month typical timelines
-- Competitive pricing based on scope and complexity
-- Experienced teams with modern development practices
+Our services, typical timelines, pricing approach and project process are given
+in a KNOWLEDGE message when relevant to the caller's request.
 
 Help clients discuss project requirements, costs, timelines, and technical expertise."""
@@ -0,0 +1,104 @@
+"""Pre-rendered system prompts for the frontdesk graph nodes.
+
+Provider-side prompt caching only hits when a request starts with exactly the
+same bytes as an earlier one. Rendering every prompt once per process and
+always sending the same string object keeps each specialist's prefix
+byte-identical from turn to turn.
+"""
+
+import hashlib
+import logging
+import sys
+
+from subagent_prompts.admin_prompts import generate_admin_specialist_prompt
+from subagent_prompts.company_prompts import generate_company_specialist_prompt, generate_general_receptionist_prompt
+from subagent_prompts.employee_prompts import generate_employee_specialist_prompt, generate_intent_classifier_prompt
+from subagent_prompts.job_prompts import generate_job_specialist_prompt
+from subagent_prompts.project_prompts import generate_project_specialist_prompt
+from subagent_prompts.router_prompts import generate_single_pass_router_prompt
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+# Graph node name -> prompt generator
+PROMPT_GENERATORS = {
+    "intent_analyzer": generate_intent_classifier_prompt,
+    "employee_specialist": generate_employee_specialist_prompt,
+    "company_specialist": generate_company_specialist_prompt,
+    "project_specialist": generate_project_specialist_prompt,
+    "job_specialist": generate_job_specialist_prompt,
+    "admin_specialist": generate_admin_specialist_prompt,
+    "general_receptionist": generate_general_receptionist_prompt,
+    "single_pass_router": generate_single_pass_router_prompt,
+}
+
+# Providers only cache prefixes of about 1024 tokens or more
+MIN_CACHEABLE_PREFIX_BYTES = 4096
+
+
+class PromptRegistry:
+    """Renders each node's prompt once and serves the same interned string.
+
+    Supports ``registry[name]`` so it can be passed wherever a plain dict of
+    rendered prompts was used.
+    """
+
+    def __init__(self, generators=None):
+        generators = generators or PROMPT_GENERATORS
+        self._prompts = {name: sys.intern(generate()) for name, generate in generators.items()}
+        self._fingerprints = {
+            name: hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16] for name, prompt in self._prompts.items()
+        }
+
+    def __getitem__(self, name):
+        return self._prompts[name]
+
+    def __contains__(self, name):
+        return name in self._prompts
+
+    def names(self):
+        return list(self._prompts)
+
+    def fingerprint(self, name):
+        """Short content hash of a prompt, for cache keys and change detection."""
+        return self._fingerprints[name]
+
+
+class PromptPrefixTracker:
+    """Per-call prompt size and prefix-cache eligibility instrumentation.
+
+    Compares each request with the previous request of the same specialist
+    message by message; cached message dicts compare by identity, so the
+    check costs one pass over the (windowed) request.
+    """
+
+    def __init__(self):
+        self._previous = {}
+        self.turns = 0
+        self.prompt_bytes = 0
+        self.cached_prefix_bytes = 0
+        self.eligible_turns = 0
+        self.last = None
+
+    def record(self, specialist, request):
+        """Record one request; return ``(prompt_bytes, shared_prefix_bytes, eligible)``."""
+        sizes = [len(message["content"].encode("utf-8")) for message in request]
+        previous = self._previous.get(specialist, ())
+        shared = 0
+        for index, message in enumerate(request):
+            if index >= len(previous) or not (message is previous[index] or message == previous[index]):
+                break
+            shared += sizes[index]
+        self._previous[specialist] = request
+
+        total = sum(sizes)
+        eligible = shared >= MIN_CACHEABLE_PREFIX_BYTES
+        self.turns += 1
+        self.prompt_bytes += total
+        self.cached_prefix_bytes += shared
+        self.eligible_turns += eligible
+        logger.debug(
+            "prompt %s: %d bytes, %d-byte prefix shared with previous turn, cache-eligible=%s",
+            specialist, total, shared, eligible,
+        )
+        self.last = (total, shared, eligible)
+        return self.last
@@ -0,0 +1,89 @@
+"""Single-pass router prompts for Brain Station 23 frontdesk agent."""
+
+from subagent_prompts.admin_prompts import generate_admin_specialist_prompt
+from subagent_prompts.company_prompts import generate_company_specialist_prompt, generate_general_receptionist_prompt
+from subagent_prompts.employee_prompts import generate_employee_specialist_prompt
+from subagent_prompts.job_prompts import generate_job_specialist_prompt
+from subagent_prompts.project_prompts import generate_project_specialist_prompt
+
+def generate_single_pass_router_prompt() -> str:
+    """
+    Generate a system prompt that classifies the caller's intent and answers in one call.
+
+    Returns:
+        str: Formatted system prompt for the single-pass router
+    """
+    specialists = {
+        # No tools in single-pass mode, so the directory itself goes in
+        "EMPLOYEE": generate_employee_specialist_prompt(tools_enabled=False),
+        "COMPANY": generate_company_specialist_prompt(),
+        "PROJECT": generate_project_specialist_prompt(),
+        "JOB": generate_job_specialist_prompt(),
+        "ADMIN": generate_admin_specialist_prompt(),
+        "GENERAL": generate_general_receptionist_prompt(),
+    }
+    sections = "\n\n".join(f"### {category}\n{prompt.strip()}" for category, prompt in specialists.items())
+    return f"""You are Sabnam, the virtual receptionist for Brain Station 23.
+
+For every caller message, first classify it into ONE of these categories:
+- EMPLOYEE: Finding/contacting employees, staff directory
+- COMPANY: Company information, services, about us, location
+- PROJECT: Project discussions, development, quotes, timelines
+- JOB: Career opportunities, hiring, applications, positions
+- ADMIN: Administrative matters, billing, contracts, compliance
+- GENERAL: Greetings, general inquiries, unclear intent
+
+Then answer the caller as the specialist for that category, following its guidelines below.
+
+OUTPUT FORMAT:
+- The first line contains ONLY the category name (e.g., "EMPLOYEE")
+- Starting on the second line, write the spoken reply to the caller
+
+SPECIALIST GUIDELINES:
+
+{sections}"""
+
+
+def generate_config_intent_classifier_prompt(company, categories) -> str:
+    """
+    Generate an intent classifier prompt from an agent config's routing edges.
+
+    Args:
+        company: Company name the receptionist answers for
+        categories: Mapping of category label -> description (edge condition)
+
+    Returns:
+        str: Classifier prompt with a ``{user_message}`` placeholder
+    """
+    lines = "\n".join(f"- {label}: {description}" for label, description in categories.items())
+    return f"""You are an intent classifier for {company} receptionist.
+
+Analyze the user's message and classify it into ONE of these categories:
+{lines}
+- GENERAL: Greetings, general inquiries, unclear intent
+
+Respond with ONLY the category name (e.g., "GENERAL").
+
+User message: {{user_message}}
+
+Category:"""
+
+
+def generate_agent_instructions(persona, welcome_message) -> str:
+    """
+    Generate the voice agent instructions for a config-defined persona.
+
+    Args:
+        persona: The config's Agent_Persona text
+        welcome_message: Greeting spoken once at the start of the call
+
+    Returns:
+        str: Agent instructions in the shape of the built-in receptionist's
+    """
+    return f"""{persona.strip()}
+
+GREETING BEHAVIOR: 
+- ONLY greet with "{welcome_message}" at the very beginning of the conversation
+- After the initial greeting, respond naturally to the caller's requests without repeating the greeting
+- Continue the conversation flow normally based on what the caller is asking
+"""
@@ -1,16 +1,10 @@
 """Administrative and compliance subagent."""
 
 from subagent_prompts.admin_prompts import generate_admin_specialist_prompt
+from subagents.base import run_specialist
 
 # Only specialist functions needed for modular LangGraph approach
 
-def admin_specialist(state, llm):
+async def admin_specialist(state, llm, system_message=None, history=None, tool_node=None):
     """Handle administrative queries with modular prompt."""
-    messages = state["messages"]
-    system_message = generate_admin_specialist_prompt()
-    
-    enhanced_messages = [{"role": "system", "content": system_message}] + [{"role": msg.type, "content": msg.content} for msg in messages if hasattr(msg, 'type')]
-    response = llm.invoke(enhanced_messages)
-    
-    from langchain_core.messages import AIMessage
-    return {"messages": [AIMessage(content=response.content)]}
+    return await run_specialist(state, llm, system_message or generate_admin_specialist_prompt(), history, "admin_specialist", tool_node=tool_node)
@@ -0,0 +1,273 @@
+"""Load-aware admission: the worker's load from what its calls really cost.
+
+livekit-agents' default ``load_fnc`` is the host's CPU percentage, averaged
+over 2.5 s. It cannot see what makes a frontdesk call expensive: every call
+holds a VAD and a turn detector, its turns wait on model requests, and all
+calls in a process share one event loop. With ``FRONTDESK_ADMISSION=1``
+(the default) the worker uses ``FrontdeskLoad`` instead. It runs in the
+worker's main process and reports the busiest of three loads, each 1.0 at
+saturation:
+
+- CPU: the cores used by the worker and its job and inference processes,
+  or the active calls times the measured CPU per call, whichever is
+  higher, over the cores available. The per-call figure starts at
+  ``FRONTDESK_CPU_PER_CALL`` cores and follows the measurement.
+- LLM: model requests in flight across the job processes, over
+  ``FRONTDESK_MAX_PENDING_LLM``.
+- Loop lag: the worst job process's recent event-loop lag, over
+  ``FRONTDESK_MAX_LOOP_LAG_MS``. A lag spike rises at once and decays
+  over about a second.
+
+At ``FRONTDESK_LOAD_THRESHOLD`` livekit-agents marks the worker full and
+answers job requests as unavailable, so LiveKit hands new calls to another
+worker before the calls already here slow down. As with livekit-agents'
+default threshold, this applies in production only; a worker in dev mode
+never turns jobs away.
+
+Job processes publish their lag and in-flight requests through
+``LoadReporter``, started by their first call. It rewrites a small record
+in ``FRONTDESK_LOAD_DIR`` every ``REPORT_INTERVAL`` seconds. The worker
+sets that directory for its job processes. ``LLM_REQUESTS``, a callback
+handler on the shared model, counts the requests.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import struct
+import tempfile
+import threading
+import time
+
+import psutil
+from langchain_core.callbacks import BaseCallbackHandler
+from livekit.agents.worker import ServerEnvOption
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+ADMISSION_ENABLED = os.getenv("FRONTDESK_ADMISSION", "1") == "1"
+LOAD_THRESHOLD = float(os.getenv("FRONTDESK_LOAD_THRESHOLD", "0.75"))
+CPU_PER_CALL = float(os.getenv("FRONTDESK_CPU_PER_CALL", "0.05"))
+MAX_PENDING_LLM = int(os.getenv("FRONTDESK_MAX_PENDING_LLM", "64"))
+MAX_LOOP_LAG_MS = float(os.getenv("FRONTDESK_MAX_LOOP_LAG_MS", "100"))
+# Set by the worker for its job processes
+LOAD_DIR = os.getenv("FRONTDESK_LOAD_DIR")
+
+# Job processes sample their loop lag every LAG_SAMPLE_INTERVAL seconds and
+# publish every REPORT_INTERVAL; the lag decays by LAG_DECAY per sample
+LAG_SAMPLE_INTERVAL = 0.1
+REPORT_INTERVAL = 0.5
+LAG_DECAY = 0.8
+# Reports older than this are from processes that have ended
+REPORT_MAX_AGE = 5.0
+# Measured CPU is averaged over at least this many seconds
+CPU_WINDOW = 0.5
+# Weight of each new CPU-per-call measurement
+CPU_PER_CALL_WEIGHT = 0.2
+# A model request still open after this long is counted as lost
+LLM_REQUEST_STALE_SECONDS = 120.0
+
+# Report record: updated (wall time), LLM requests in flight, loop lag seconds
+REPORT = struct.Struct("<dId")
+
+
+class LLMRequestTracker(BaseCallbackHandler):
+    """Counts this process's model requests in flight."""
+
+    # Counted in the calling task; an executor thread would lag behind
+    run_inline = True
+
+    def __init__(self):
+        self._started = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.monotonic()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._started.pop(run_id, None)
+
+    def pending(self):
+        cutoff = time.monotonic() - LLM_REQUEST_STALE_SECONDS
+        for run_id in [run_id for run_id, started in self._started.items() if started < cutoff]:
+            del self._started[run_id]
+        return len(self._started)
+
+
+LLM_REQUESTS = LLMRequestTracker()
+
+
+class LoadReporter:
+    """Publishes this job process's loop lag and LLM requests in flight for ``FrontdeskLoad``."""
+
+    def __init__(self, directory, tracker=LLM_REQUESTS, sample_interval=LAG_SAMPLE_INTERVAL, report_interval=REPORT_INTERVAL):
+        self.path = os.path.join(directory, f"{os.getpid()}.load")
+        self.tracker = tracker
+        self.sample_interval = sample_interval
+        self.report_interval = report_interval
+        self.lag = 0.0
+        self.loop = None
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._task = None
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._task = self.loop.create_task(self._run(), name="frontdesk-load-reporter")
+        return self
+
+    async def _run(self):
+        reported = 0.0
+        while True:
+            expected = time.perf_counter() + self.sample_interval
+            await asyncio.sleep(self.sample_interval)
+            now = time.perf_counter()
+            self.lag = max(now - expected, self.lag * LAG_DECAY, 0.0)
+            if now - reported >= self.report_interval:
+                reported = now
+                self.write()
+
+    def write(self):
+        # One small positioned write; readers never see a torn record
+        os.pwrite(self._fd, REPORT.pack(time.time(), self.tracker.pending(), self.lag), 0)
+
+    async def aclose(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        os.close(self._fd)
+        os.unlink(self.path)
+
+
+_REPORTER = None
+
+
+def start_load_reporter():
+    """The process's reporter, started by its first call; ``None`` outside a worker."""
+    global _REPORTER
+    # Read now: with the thread executor, jobs share the worker's own process
+    directory = os.getenv("FRONTDESK_LOAD_DIR")
+    if directory is None:
+        return None
+    if _REPORTER is None or _REPORTER.loop.is_closed():
+        _REPORTER = LoadReporter(directory).start()
+    return _REPORTER
+
+
+def read_reports(directory, max_age=REPORT_MAX_AGE):
+    """``(llm requests in flight, loop lag)`` per live job process; files of ended processes are removed."""
+    reports = []
+    now = time.time()
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        try:
+            with open(path, "rb") as f:
+                data = f.read(REPORT.size)
+        except FileNotFoundError:
+            continue
+        if len(data) < REPORT.size:
+            continue
+        updated, pending, lag = REPORT.unpack(data)
+        if now - updated <= max_age:
+            reports.append((pending, lag))
+        elif not psutil.pid_exists(int(name.split(".")[0])):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    return reports
+
+
+def available_cores():
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class FrontdeskLoad:
+    """``WorkerOptions.load_fnc``: the busiest of CPU, LLM requests and loop lag, 1.0 at saturation.
+
+    Called by the worker every half second and before each job request is
+    answered, from an executor thread.
+    """
+
+    def __init__(self, directory=LOAD_DIR, threshold=LOAD_THRESHOLD, cpu_per_call=CPU_PER_CALL,
+                 max_pending_llm=MAX_PENDING_LLM, max_loop_lag=MAX_LOOP_LAG_MS / 1000, cores=None, children=True):
+        self.directory = directory
+        self.threshold = threshold
+        self.cpu_per_call = cpu_per_call
+        self.max_pending_llm = max_pending_llm
+        self.max_loop_lag = max_loop_lag
+        self.cores = cores or available_cores()
+        self.children = children
+        self.components = {"cpu": 0.0, "llm": 0.0, "loop_lag": 0.0}
+        self._process = psutil.Process()
+        self._cpu_times = {}
+        self._sampled = None
+        self._cpu_used = 0.0
+        self._full = False
+        self._lock = threading.Lock()
+
+    def _measure_cpu(self, calls):
+        """Cores used since the last sample, at most once per ``CPU_WINDOW``."""
+        now = time.monotonic()
+        if self._sampled is not None and now - self._sampled < CPU_WINDOW:
+            return self._cpu_used
+        processes = [self._process, *self._process.children(recursive=True)] if self.children else [self._process]
+        times = {}
+        used = 0.0
+        for process in processes:
+            try:
+                cpu = process.cpu_times()
+            except psutil.Error:
+                continue
+            times[process.pid] = cpu.user + cpu.system
+            # Processes seen for the first time count from the next sample
+            used += times[process.pid] - self._cpu_times.get(process.pid, times[process.pid])
+        if self._sampled is not None:
+            self._cpu_used = used / (now - self._sampled)
+            if calls:
+                self.cpu_per_call += CPU_PER_CALL_WEIGHT * (self._cpu_used / calls - self.cpu_per_call)
+        self._cpu_times, self._sampled = times, now
+        return self._cpu_used
+
+    def __call__(self, worker):
+        with self._lock:
+            calls = len(worker.active_jobs)
+            cpu = max(self._measure_cpu(calls), calls * self.cpu_per_call) / self.cores
+            reports = read_reports(self.directory) if self.directory else []
+            self.components = {
+                "cpu": round(cpu, 3),
+                "llm": round(sum(pending for pending, _ in reports) / self.max_pending_llm, 3),
+                "loop_lag": round(max((lag for _, lag in reports), default=0.0) / self.max_loop_lag, 3),
+            }
+            load = max(self.components.values())
+            if (load >= self.threshold) != self._full:
+                # livekit-agents logs the status change itself; this adds which load caused it
+                self._full = not self._full
+                logger.debug(
+                    "admission %s at load %.2f with %d calls: %s (CPU per call %.3f cores)",
+                    "closed" if self._full else "reopened", load, calls, self.components, self.cpu_per_call,
+                )
+            return load
+
+
+def worker_admission_options():
+    """``WorkerOptions`` arguments for load-aware admission; empty when disabled.
+
+    Creates the report directory and exports it to the job processes the
+    worker starts from here on.
+    """
+    if not ADMISSION_ENABLED:
+        return {}
+    directory = LOAD_DIR or os.path.join(tempfile.gettempdir(), f"bs23-frontdesk-load-{os.getpid()}")
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    os.environ["FRONTDESK_LOAD_DIR"] = directory
+    return {
+        "load_fnc": FrontdeskLoad(directory),
+        # Unlimited in dev mode, like livekit-agents' own default
+        "load_threshold": ServerEnvOption(dev_default=math.inf, prod_default=LOAD_THRESHOLD),
+    }
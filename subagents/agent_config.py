@@ -0,0 +1,175 @@
+"""Agent config compiler.
+
+Turns an agent file such as ``frontdesk_english.json`` into a plain,
+JSON-serializable spec: one rendered prompt and tool schema list per graph
+node, the routing table from intent label to node, the classifier prompt and
+local-router keywords for the routing edges, and the session settings.
+
+Compiled specs are memoized on disk under the hash of the config bytes and
+of the generator code (this module, the prompt templates in
+``subagent_prompts`` and the keyword tables in ``subagents.intent_router``),
+so a worker hosting many agent configurations only compiles each one once
+and an edited template never serves a stale spec. The
+LangGraph object itself holds Python callables and cannot be stored; building
+it from a spec is a dictionary walk (see ``create_graph_from_spec``).
+
+Tool credentials (``additional_tool_info``) are never copied into a spec.
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+from subagent_prompts.router_prompts import generate_agent_instructions, generate_config_intent_classifier_prompt
+import subagent_prompts
+from subagents import intent_router
+from subagents.intent_router import GENERAL_KEYWORDS, keywords_from_agent_config, route_label
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+# Bump when the spec layout changes so stale disk entries are ignored; edits
+# to the generator sources below change the key without a bump
+COMPILER_VERSION = "2"
+
+# Sources a spec is generated from: router prompts, prompt templates, keyword tables
+GENERATOR_SOURCES = (
+    Path(__file__),
+    Path(intent_router.__file__),
+    *sorted(Path(subagent_prompts.__file__).parent.glob("*.py")),
+)
+
+SPEC_CACHE_DIR = Path(os.getenv("FRONTDESK_SPEC_CACHE_DIR", Path.home() / ".cache" / "bs23-frontdesk" / "agent-specs"))
+
+# prompt_info sections shared by every node, in prompt order
+SHARED_PROMPT_SECTIONS = ("Agent_Persona", "Agent_Company_Background", "Background_of_the_Call", "Prior_Knowledge")
+
+# Node prompt sections, in prompt order
+NODE_PROMPT_SECTIONS = ("Agent_Capabilities", "Task_List")
+
+# Top-level config keys copied into the spec's session settings
+SESSION_KEYS = (
+    "language_code",
+    "stt",
+    "tts",
+    "enable_user_interruptions",
+    "minimum_speech_duration_for_interruptions",
+    "minimum_words_before_interruption",
+    "wait_time_before_detecting_end_of_speech",
+    "end_call_after_silence_seconds",
+    "max_call_duration_seconds",
+    "knowledge_base_id",
+)
+
+
+def _generator_digest():
+    digest = hashlib.sha256(COMPILER_VERSION.encode("utf-8"))
+    for path in GENERATOR_SOURCES:
+        digest.update(b"\0" + path.read_bytes())
+    return digest.digest()
+
+
+GENERATOR_DIGEST = _generator_digest()
+
+
+def config_hash(config_bytes):
+    """Cache key of a config file: its bytes plus the compiler version and generator sources."""
+    return hashlib.sha256(GENERATOR_DIGEST + b"\0" + config_bytes).hexdigest()
+
+
+def _tool_schema(tool):
+    """Name, description and parameters of a config tool, without its credentials."""
+    schema = tool.get("openai_tool") or {}
+    if isinstance(schema, str):
+        try:
+            schema = json.loads(schema)
+        except ValueError:
+            schema = ast.literal_eval(schema)
+    return {
+        "name": schema.get("name") or tool.get("name"),
+        "description": schema.get("description") or tool.get("description", ""),
+        "parameters": schema.get("parameters", {"type": "object", "properties": {}}),
+    }
+
+
+def _render_prompt(prompt_info, node_prompt):
+    sections = [prompt_info.get(key, "") for key in SHARED_PROMPT_SECTIONS]
+    sections += [node_prompt.get(key, "") for key in NODE_PROMPT_SECTIONS]
+    language = prompt_info.get("Language")
+    if language:
+        sections.append(f"Always respond in {language}.")
+    return "\n\n".join(section.strip() for section in sections if section and section.strip())
+
+
+def compile_agent_config(config, digest=""):
+    """Compile an agent config dict into a graph spec."""
+    graph_data = config["llm"]["graph_data"]
+    prompt_info = graph_data.get("prompt_info", {})
+    nodes = graph_data["nodes"]
+    primary = next((node for node in nodes if node.get("type") == "primary"), nodes[0])
+
+    spec_nodes = {}
+    for node in nodes:
+        spec_nodes[node["name"]] = {
+            "prompt": _render_prompt(prompt_info, node.get("prompt", {})),
+            "tools": [_tool_schema(tool) for tool in node.get("tools") or []],
+        }
+
+    # Caller intents route along the primary node's edges; anything else
+    # stays with the primary node
+    routes = {"GENERAL": primary["name"]}
+    categories = {}
+    for edge in primary.get("edges", []):
+        label = route_label(edge["target"])
+        routes[label] = edge["target"]
+        categories[label] = edge["condition"].strip().rstrip(",").strip()
+
+    keywords = keywords_from_agent_config(config)
+    keywords["GENERAL"].extend(GENERAL_KEYWORDS)
+
+    welcome_message = config.get("welcome_message") or prompt_info.get("Welcome_Message", "")
+    return {
+        "config_hash": digest,
+        "compiler_version": COMPILER_VERSION,
+        "agent_id": config.get("ai_agent_id"),
+        "agent_name": config.get("agent_name", "").strip(),
+        "welcome_message": welcome_message,
+        "instructions": generate_agent_instructions(prompt_info.get("Agent_Persona", ""), welcome_message),
+        "primary": primary["name"],
+        "routes": routes,
+        "nodes": spec_nodes,
+        "classifier_prompt": generate_config_intent_classifier_prompt(
+            prompt_info.get("Agent_Company") or "the company", categories
+        ),
+        "keywords": {intent: list(phrases) for intent, phrases in keywords.items()},
+        "session": {key: config.get(key) for key in SESSION_KEYS},
+    }
+
+
+def load_agent_spec(path, cache_dir=SPEC_CACHE_DIR):
+    """Load the compiled spec of an agent file, compiling it on a cache miss.
+
+    Entries are written to a temporary file and renamed into place, so
+    concurrent workers never read a half-written spec.
+    """
+    config_bytes = Path(path).read_bytes()
+    digest = config_hash(config_bytes)
+    cache_path = Path(cache_dir) / f"{digest}.json"
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    spec = compile_agent_config(json.loads(config_bytes), digest)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(spec), encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # A read-only cache only costs a recompile next time
+        logger.warning("could not cache agent spec %s: %s", cache_path, e)
+    return spec
@@ -0,0 +1,66 @@
+"""Shared helpers for the specialist nodes."""
+
+from langchain_core.messages import AIMessage
+
+from subagent_prompts.history_prompts import generate_history_context_message
+from subagent_prompts.knowledge_prompts import generate_knowledge_message
+from subagents.tool_node import run_tool_loop
+
+
+def recent_caller_text(state, messages=3):
+    """The caller's words among the last ``messages`` messages, for per-turn lookups."""
+    return " ".join(msg.content for msg in state["messages"][-messages:] if msg.type == "human")
+
+
+def build_specialist_messages(state, system_message, history=None, specialist=None, context=None):
+    """Prefix the conversation history with the specialist's system prompt.
+
+    ``context`` is per-turn reference text (e.g. directory matches); it goes
+    after the conversation so it never breaks the cacheable prefix.
+
+    With a ``ConversationHistory`` only the specialist's recent turns are sent
+    verbatim; older turns arrive as a summary in a second system message, so
+    the first system message stays identical from turn to turn. A returning
+    caller's memory goes right after the first system message; it is loaded
+    once per call, so it changes the prefix at most once.
+    """
+    messages = state["messages"]
+    suffix = [{"role": "system", "content": context}] if context else []
+    if history is None:
+        return [{"role": "system", "content": system_message}] + [{"role": msg.type, "content": msg.content} for msg in messages if hasattr(msg, 'type')] + suffix
+
+    summary, messages = history.window(messages, specialist)
+    prefix = [history.system_message(system_message)]
+    if history.caller_memory:
+        prefix.append(history.system_message(history.caller_memory))
+    if summary:
+        prefix.append({"role": "system", "content": generate_history_context_message(summary)})
+    request = prefix + history.convert(messages) + suffix
+    history.prompt_stats.record(specialist, request)
+    return request
+
+
+async def run_specialist(state, llm, system_message, history=None, specialist=None, context=None, tool_node=None, knowledge=None):
+    """Run one specialist turn without blocking the event loop.
+
+    ``ainvoke`` inside a graph node streams tokens through LangGraph's
+    ``messages`` stream mode, so ``langchain.LLMAdapter`` can forward the
+    first sentence to TTS while the rest is still being generated. The
+    returned message keeps the streamed id so the adapter does not speak the
+    finished reply a second time.
+
+    With a ``tool_node`` the specialist runs a tool-calling loop; only the
+    final text reply is returned into the graph state.
+
+    With a ``knowledge`` index the snippets matching the caller's recent
+    words are added to the per-turn context.
+    """
+    if knowledge is not None:
+        snippets = generate_knowledge_message(knowledge.search(recent_caller_text(state)))
+        context = "\n\n".join(part for part in (context, snippets) if part) or None
+    request = build_specialist_messages(state, system_message, history, specialist, context)
+    if tool_node is not None:
+        response = await run_tool_loop(llm, tool_node, request)
+    else:
+        response = await llm.ainvoke(request)
+    return {"messages": [AIMessage(content=response.content, id=response.id)]}
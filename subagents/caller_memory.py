@@ -0,0 +1,224 @@
+"""Long-term memory of returning callers, across calls.
+
+Each caller reached by phone has a small profile: why they called last time,
+how they prefer to be contacted, and the employee or team they asked for.
+It is stored under ``("caller_memory", <caller id>)`` in a LangGraph
+``BaseStore``, as the tutorial's ``load_memory``/``create_memory`` nodes
+do, so any store can back it. ``CALLER_MEMORY_STORE`` picks one:
+
+- ``sqlite`` (default): ``SQLiteMemoryStore``, a local file at
+  ``CALLER_MEMORY_PATH`` shared by the worker's processes.
+- ``memory``: LangGraph's ``InMemoryStore``, per process, lost on restart.
+- ``off``: no caller memory.
+
+Neither end of it runs in the turn loop:
+
+- ``load_caller_memory`` runs when the caller joins, concurrently with
+  session start and the greeting. The formatted profile goes to
+  ``ConversationHistory.caller_memory`` and reaches the specialists as a
+  system message after their prompt.
+- ``remember_call`` runs after the call. One LLM call updates the profile
+  from the transcript, and the result is written back to the store.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+
+from langgraph.constants import TAG_NOSTREAM
+from langgraph.store.base import BaseStore, GetOp, Item, ListNamespacesOp, PutOp, SearchItem, SearchOp
+from langgraph.store.memory import InMemoryStore
+
+from subagent_prompts.memory_prompts import generate_caller_memory_message, generate_memory_extraction_prompt
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+CALLER_MEMORY_STORE = os.getenv("CALLER_MEMORY_STORE", "sqlite")
+CALLER_MEMORY_PATH = Path(os.getenv("CALLER_MEMORY_PATH", Path.home() / ".cache" / "bs23-frontdesk" / "memory.sqlite3"))
+
+MEMORY_NAMESPACE = "caller_memory"
+MEMORY_KEY = "profile"
+PROFILE_FIELDS = ("previous_purpose", "preferred_contact", "requested_employee")
+
+# Calls with fewer caller turns carry nothing worth remembering
+MIN_CALLER_TURNS = 1
+
+# Joins namespace parts in one column; it never appears in caller ids
+NAMESPACE_SEPARATOR = "\x1f"
+
+
+def _namespace_text(namespace):
+    return NAMESPACE_SEPARATOR.join(namespace)
+
+
+def _timestamp(seconds):
+    return datetime.fromtimestamp(seconds, tz=timezone.utc)
+
+
+class SQLiteMemoryStore(BaseStore):
+    """Key-value ``BaseStore`` in a local SQLite file.
+
+    Gets, puts, deletes, namespace-prefix searches with equality filters, and
+    namespace listing. There is no semantic search: a search with a
+    ``query`` raises ``NotImplementedError``.
+    """
+
+    def __init__(self, path=CALLER_MEMORY_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS items (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                created REAL NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+
+    def batch(self, ops):
+        with self._lock:
+            return [self._run(op) for op in ops]
+
+    async def abatch(self, ops):
+        # The file is local and the statements are point lookups; a thread keeps the loop free
+        return await asyncio.to_thread(self.batch, list(ops))
+
+    def _run(self, op):
+        if isinstance(op, GetOp):
+            row = self._db.execute(
+                "SELECT value, created, updated FROM items WHERE namespace = ? AND key = ?",
+                (_namespace_text(op.namespace), op.key),
+            ).fetchone()
+            if row is None:
+                return None
+            return Item(value=json.loads(row[0]), key=op.key, namespace=op.namespace,
+                        created_at=_timestamp(row[1]), updated_at=_timestamp(row[2]))
+        if isinstance(op, PutOp):
+            namespace = _namespace_text(op.namespace)
+            if op.value is None:
+                self._db.execute("DELETE FROM items WHERE namespace = ? AND key = ?", (namespace, op.key))
+            else:
+                now = datetime.now(timezone.utc).timestamp()
+                self._db.execute(
+                    """
+                    INSERT INTO items (namespace, key, value, created, updated) VALUES (?, ?, ?, ?, ?)
+                    ON CONFLICT (namespace, key) DO UPDATE SET value = excluded.value, updated = excluded.updated
+                    """,
+                    (namespace, op.key, json.dumps(op.value), now, now),
+                )
+            return None
+        if isinstance(op, SearchOp):
+            if op.query:
+                raise NotImplementedError("SQLiteMemoryStore has no semantic search")
+            return self._search(op)
+        if isinstance(op, ListNamespacesOp):
+            return self._list_namespaces(op)
+        raise ValueError(f"unsupported store operation: {op!r}")
+
+    def _search(self, op):
+        prefix = _namespace_text(op.namespace_prefix)
+        rows = self._db.execute(
+            """
+            SELECT namespace, key, value, created, updated FROM items
+            WHERE namespace = ? OR substr(namespace, 1, ?) = ?
+            ORDER BY updated DESC
+            """,
+            (prefix, len(prefix) + 1, prefix + NAMESPACE_SEPARATOR),
+        )
+        results = []
+        for namespace, key, value, created, updated in rows:
+            value = json.loads(value)
+            if op.filter and any(value.get(field) != expected for field, expected in op.filter.items()):
+                continue
+            results.append(SearchItem(tuple(namespace.split(NAMESPACE_SEPARATOR)), key, value,
+                                      _timestamp(created), _timestamp(updated)))
+        return results[op.offset:op.offset + op.limit]
+
+    def _list_namespaces(self, op):
+        namespaces = [tuple(row[0].split(NAMESPACE_SEPARATOR)) for row in
+                      self._db.execute("SELECT DISTINCT namespace FROM items ORDER BY namespace")]
+        for condition in op.match_conditions or ():
+            size = len(condition.path)
+            def matches(namespace, path=condition.path, size=size, suffix=condition.match_type == "suffix"):
+                part = namespace[-size:] if suffix else namespace[:size]
+                return len(part) == size and all(want in ("*", have) for want, have in zip(path, part))
+            namespaces = [namespace for namespace in namespaces if matches(namespace)]
+        if op.max_depth is not None:
+            namespaces = sorted({namespace[:op.max_depth] for namespace in namespaces})
+        return namespaces[op.offset:op.offset + op.limit]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+_STORE = None
+
+
+def get_memory_store():
+    """The process's caller memory store per ``CALLER_MEMORY_STORE``, or ``None`` when off."""
+    global _STORE
+    if _STORE is None and CALLER_MEMORY_STORE != "off":
+        _STORE = InMemoryStore() if CALLER_MEMORY_STORE == "memory" else SQLiteMemoryStore()
+    return _STORE
+
+
+async def load_caller_memory(store, caller_id):
+    """The caller's stored profile, or an empty one."""
+    item = await store.aget((MEMORY_NAMESPACE, caller_id), MEMORY_KEY)
+    return dict(item.value) if item else {}
+
+
+def _parse_profile(text, previous):
+    """Profile fields from the model's JSON reply, falling back to ``previous``."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    try:
+        reply = json.loads(match.group(0)) if match else {}
+    except ValueError:
+        reply = {}
+    if not isinstance(reply, dict):
+        reply = {}
+    return {field: str(reply.get(field) or previous.get(field) or "").strip() for field in PROFILE_FIELDS}
+
+
+async def remember_call(store, llm, caller_id, transcript, previous=None):
+    """Update the caller's profile from a finished call's ``[(role, text)]`` transcript.
+
+    Returns the stored profile, or ``None`` when the call was too short to
+    learn from.
+    """
+    if sum(role == "user" for role, _ in transcript) < MIN_CALLER_TURNS:
+        return None
+    previous = previous or {}
+    lines = "\n".join(f"{'caller' if role == 'user' else 'receptionist'}: {text}" for role, text in transcript)
+    prompt = generate_memory_extraction_prompt().format(
+        profile=json.dumps({field: previous.get(field, "") for field in PROFILE_FIELDS}),
+        transcript=lines,
+    )
+    response = await llm.ainvoke(
+        [{"role": "user", "content": prompt}],
+        config={"callbacks": [], "tags": [TAG_NOSTREAM]},
+    )
+    profile = _parse_profile(response.content, previous)
+    profile["calls"] = previous.get("calls", 0) + 1
+    await store.aput((MEMORY_NAMESPACE, caller_id), MEMORY_KEY, profile)
+    return profile
+
+
+def caller_memory_message(profile):
+    """System message text for a loaded profile; empty when there is nothing to say."""
+    return generate_caller_memory_message(profile) if profile else ""
@@ -1,27 +1,14 @@
 """Company information subagent."""
 
 from subagent_prompts.company_prompts import generate_company_specialist_prompt, generate_general_receptionist_prompt
+from subagents.base import run_specialist
 
 # Only specialist functions needed for modular LangGraph approach
 
-def company_specialist(state, llm):
+async def company_specialist(state, llm, system_message=None, history=None, tool_node=None, knowledge=None):
     """Handle company information queries with modular prompt."""
-    messages = state["messages"]
-    system_message = generate_company_specialist_prompt()
-    
-    enhanced_messages = [{"role": "system", "content": system_message}] + [{"role": msg.type, "content": msg.content} for msg in messages if hasattr(msg, 'type')]
-    response = llm.invoke(enhanced_messages)
-    
-    from langchain_core.messages import AIMessage
-    return {"messages": [AIMessage(content=response.content)]}
+    return await run_specialist(state, llm, system_message or generate_company_specialist_prompt(), history, "company_specialist", tool_node=tool_node, knowledge=knowledge)
 
-def general_receptionist(state, llm):
+async def general_receptionist(state, llm, system_message=None, history=None, tool_node=None, knowledge=None):
     """Handle general inquiries and greetings with modular prompt."""
-    messages = state["messages"]
-    system_message = generate_general_receptionist_prompt()
-    
-    enhanced_messages = [{"role": "system", "content": system_message}] + [{"role": msg.type, "content": msg.content} for msg in messages if hasattr(msg, 'type')]
-    response = llm.invoke(enhanced_messages)
-    
-    from langchain_core.messages import AIMessage
-    return {"messages": [AIMessage(content=response.content)]}
+    return await run_specialist(state, llm, system_message or generate_general_receptionist_prompt(), history, "general_receptionist", tool_node=tool_node, knowledge=knowledge)
@@ -1,33 +1,60 @@
 """Employee contact subagent."""
 
-from subagent_prompts.employee_prompts import generate_employee_specialist_prompt, generate_intent_classifier_prompt
+import logging
+
+from langgraph.constants import TAG_NOSTREAM
+
+from subagent_prompts.employee_prompts import (
+    generate_directory_matches_message,
+    generate_employee_specialist_prompt,
+    generate_intent_classifier_prompt,
+)
+from subagents.base import recent_caller_text, run_specialist
+from subagents.intent_router import INTENT_CONFIDENCE_THRESHOLD, get_local_intent_router
+from tools.employee_directory import DIRECTORY_PROMPT_LIMIT, get_employee_directory
+
+logger = logging.getLogger("bs23-frontdesk-agent")
 
 # Only specialist functions needed for modular LangGraph approach
 
-def employee_specialist(state, llm):
-    """Handle employee-related queries with modular prompt."""
-    messages = state["messages"]
-    system_message = generate_employee_specialist_prompt()
-    
-    enhanced_messages = [{"role": "system", "content": system_message}] + [{"role": msg.type, "content": msg.content} for msg in messages if hasattr(msg, 'type')]
-    response = llm.invoke(enhanced_messages)
-    
-    from langchain_core.messages import AIMessage
-    return {"messages": [AIMessage(content=response.content)]}
+async def employee_specialist(state, llm, system_message=None, history=None, tool_node=None):
+    """Handle employee-related queries with modular prompt.
 
-def intent_analyzer(state, llm):
-    """Analyze user intent using LLM and route accordingly."""
+    Small directories are listed in the prompt; for larger ones the caller's
+    latest message is looked up and only the ranked matches are sent. That
+    answers most turns without a tool round trip; ``search_employee`` stays
+    bound for names the matches miss.
+    """
+    directory = get_employee_directory()
+    context = None
+    if len(directory) > DIRECTORY_PROMPT_LIMIT:
+        context = generate_directory_matches_message(directory.search(recent_caller_text(state)))
+    return await run_specialist(state, llm, system_message or generate_employee_specialist_prompt(), history, "employee_specialist", context, tool_node=tool_node)
+
+async def intent_analyzer(state, llm, threshold=INTENT_CONFIDENCE_THRESHOLD, intent_prompt=None, router=None):
+    """Analyze user intent, escalating to the LLM only when the local router is unsure."""
     messages = state["messages"]
     last_user_message = messages[-1].content if messages else ""
     
-    # Get intent analysis prompt from modular file
-    intent_prompt = generate_intent_classifier_prompt()
+    # Local keyword router answers most turns in microseconds
+    prediction = (router or get_local_intent_router()).classify(last_user_message)
+    if prediction.confidence >= threshold:
+        logger.debug("intent %s (local, %.2f)", prediction.intent, prediction.confidence)
+        return {"messages": messages, "intent": prediction.intent}
+    
+    # Get intent analysis prompt from modular file unless pre-rendered
+    intent_prompt = intent_prompt or generate_intent_classifier_prompt()
     
-    # Single LLM call for intent analysis
-    intent_response = llm.invoke([{"role": "user", "content": intent_prompt.format(user_message=last_user_message)}])
+    # Single LLM call for intent analysis; tagged so the category label is
+    # never streamed to TTS alongside the specialist's reply
+    intent_response = await llm.ainvoke(
+        [{"role": "user", "content": intent_prompt.format(user_message=last_user_message)}],
+        config={"tags": [TAG_NOSTREAM]},
+    )
     intent = intent_response.content.strip().upper()
     
-    print(f"🎯 Intent detected: {intent}")
+    # The chosen intent is also recorded on the node's tracing span (subagents.tracing)
+    logger.debug("intent %s (llm)", intent)
     
     # Store intent for routing
     return {"messages": messages, "intent": intent}
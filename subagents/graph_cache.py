@@ -0,0 +1,198 @@
+"""In-process LRU cache of compiled agent graphs for multi-tenant workers.
+
+A worker process serves jobs for many agent configurations. Each job names
+its agent by ``ai_agent_id``; the cache resolves the id to an agent file in
+a config directory, loads the compiled spec (memoized on disk, see
+``subagents.agent_config``) and builds the graph once. Entries are evicted
+least-recently-used when either the entry limit or the memory budget is
+exceeded. Jobs use ``aget``, which builds a missing graph in a worker thread
+so a cold persona (hundreds of milliseconds) never stalls the other calls
+on the process's event loop.
+
+Entry sizes are estimates: twice the spec's JSON size for the rendered
+prompts and router weights plus a fixed cost for the compiled graph. They
+come out 20-40% below ``tracemalloc`` totals, which also count interpreter
+caches (``benchmarks/multi_tenant.py``), so leave headroom in the budget.
+"""
+
+import asyncio
+import functools
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+
+from subagents.agent_config import SPEC_CACHE_DIR, load_agent_spec
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+AGENT_CACHE_SIZE = int(os.getenv("FRONTDESK_AGENT_CACHE_SIZE", "64"))
+AGENT_CACHE_MB = float(os.getenv("FRONTDESK_AGENT_CACHE_MB", "64"))
+
+# Fixed per-entry cost of the StateGraph, its nodes and compiled channels
+ENTRY_BASE_BYTES = 64 * 1024
+
+
+class CachedAgent:
+    """One compiled agent configuration."""
+
+    def __init__(self, spec, graph):
+        self.spec = spec
+        self.graph = graph
+        self.size = ENTRY_BASE_BYTES + 2 * len(json.dumps(spec))
+
+
+def _metadata_agent_id(raw):
+    """The ``ai_agent_id`` one metadata string names, as a string, or ``None``."""
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return raw.strip() or None
+    if isinstance(data, dict):
+        data = data.get("ai_agent_id")
+    if isinstance(data, bool) or not isinstance(data, (str, int)):
+        return None
+    return str(data).strip() or None
+
+
+def agent_id_from_metadata(*metadata, known=()):
+    """The ``ai_agent_id`` named by job or room metadata.
+
+    Metadata may be a JSON object carrying ``ai_agent_id`` (a string or a
+    number) or the bare id. Every source is checked: the first id in
+    ``known`` wins, so free-form job metadata does not hide the id in the
+    room metadata; otherwise the first id found is returned.
+    """
+    candidates = [agent_id for agent_id in map(_metadata_agent_id, metadata) if agent_id]
+    return next((agent_id for agent_id in candidates if agent_id in known), candidates[0] if candidates else None)
+
+
+class AgentGraphCache:
+    """LRU of compiled graphs keyed by ``ai_agent_id``.
+
+    ``build_graph(spec)`` turns a compiled spec into a graph; the worker
+    passes ``create_graph_from_spec`` bound to its shared LLM client.
+    """
+
+    def __init__(
+        self,
+        build_graph,
+        config_dir,
+        max_entries=AGENT_CACHE_SIZE,
+        max_bytes=int(AGENT_CACHE_MB * 1024 * 1024),
+        spec_cache_dir=SPEC_CACHE_DIR,
+    ):
+        self.build_graph = build_graph
+        self.spec_cache_dir = spec_cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._paths = {}
+        # agent id -> build in flight, shared by jobs that miss together
+        self._building = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.scan(config_dir)
+
+    def scan(self, config_dir):
+        """Index the agent files in ``config_dir`` by ``ai_agent_id``."""
+        for path in sorted(Path(config_dir).glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    agent_id = json.load(f).get("ai_agent_id")
+            except (OSError, ValueError, AttributeError) as e:
+                logger.warning("skipping agent config %s: %s", path, e)
+                continue
+            if agent_id:
+                self._paths[str(agent_id)] = path
+        logger.info("indexed %d agent configs in %s", len(self._paths), config_dir)
+
+    def __contains__(self, agent_id):
+        return agent_id in self._paths
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _hit(self, agent_id):
+        entry = self._entries.get(agent_id)
+        if entry is not None:
+            self._entries.move_to_end(agent_id)
+            self.hits += 1
+        return entry
+
+    def _build(self, path):
+        spec = load_agent_spec(path, self.spec_cache_dir)
+        return CachedAgent(spec, self.build_graph(spec))
+
+    def _add(self, agent_id, entry):
+        self._entries[agent_id] = entry
+        self.bytes += entry.size
+        self._evict()
+        return entry
+
+    def get(self, agent_id):
+        """Compiled agent for ``agent_id``, building it on a miss; ``None`` if unknown."""
+        entry = self._hit(agent_id)
+        if entry is not None:
+            return entry
+        path = self._paths.get(agent_id)
+        if path is None:
+            return None
+        self.misses += 1
+        return self._add(agent_id, self._build(path))
+
+    def _built(self, agent_id, building):
+        # Runs on the loop, which is the only place the LRU is touched
+        del self._building[agent_id]
+        if not building.cancelled() and building.exception() is None:
+            self._add(agent_id, building.result())
+
+    async def aget(self, agent_id):
+        """``get`` for the event loop: a miss is loaded and compiled in a worker thread.
+
+        The build is shared by every job that misses on the same agent and
+        outlives any of them being cancelled. A failed build returns ``None``
+        with a warning so the job falls back to the default agent.
+        """
+        entry = self._hit(agent_id)
+        if entry is not None:
+            return entry
+        path = self._paths.get(agent_id)
+        if path is None:
+            return None
+        building = self._building.get(agent_id)
+        if building is None:
+            self.misses += 1
+            building = self._building[agent_id] = asyncio.ensure_future(asyncio.to_thread(self._build, path))
+            building.add_done_callback(functools.partial(self._built, agent_id))
+        else:
+            # Another job is building the same agent; share its result
+            self.hits += 1
+        try:
+            return await asyncio.shield(building)
+        except Exception as e:
+            logger.warning("could not build agent graph %s from %s: %s", agent_id, path, e)
+            return None
+
+    def _evict(self):
+        # The newest entry always stays, even if it alone exceeds the budget
+        while len(self._entries) > 1 and (len(self._entries) > self.max_entries or self.bytes > self.max_bytes):
+            agent_id, entry = self._entries.popitem(last=False)
+            self.bytes -= entry.size
+            self.evictions += 1
+            logger.debug("evicted agent graph %s (%d bytes)", agent_id, entry.size)
+
+    def stats(self):
+        """Counters for logging and metrics export."""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,148 @@
+"""Bounded conversation history for specialist prompts.
+
+A call can last up to ``max_call_duration_seconds`` (30 minutes in
+``frontdesk_english.json``). Sending every message on every turn makes prompt
+size and LLM latency grow with call length, so each specialist sees only its
+last N caller turns verbatim plus a rolling summary of everything older.
+
+The summary is refreshed by a background task after enough turns have fallen
+out of the window; the turn that triggers it uses the previous summary plus
+the not-yet-summarized messages verbatim, so no LLM call is ever added to the
+critical path.
+"""
+
+import asyncio
+import contextvars
+import logging
+import os
+
+from langgraph.constants import TAG_NOSTREAM
+
+from subagent_prompts.history_prompts import generate_history_summary_prompt
+from subagent_prompts.registry import PromptPrefixTracker
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+# Verbatim caller turns per specialist; info-gathering specialists keep more
+HISTORY_TURNS = {
+    "employee_specialist": 6,
+    "company_specialist": 4,
+    "project_specialist": 10,
+    "job_specialist": 6,
+    "admin_specialist": 10,
+    "general_receptionist": 4,
+    "single_pass_router": 6,
+}
+DEFAULT_HISTORY_TURNS = int(os.getenv("FRONTDESK_HISTORY_TURNS", "6"))
+
+# Turns allowed to pile up outside the window before the summary is refreshed
+SUMMARY_REFRESH_TURNS = int(os.getenv("FRONTDESK_SUMMARY_REFRESH_TURNS", "4"))
+
+
+class _RollingSummary:
+    """Summary of ``messages[:covered]`` for one window size."""
+
+    def __init__(self):
+        self.text = ""
+        self.covered = 0
+        self.task = None
+
+
+def _window_start(messages, max_turns):
+    """Index of the first message of the last ``max_turns`` caller turns."""
+    seen = 0
+    for index in range(len(messages) - 1, -1, -1):
+        if messages[index].type == "human":
+            seen += 1
+            if seen == max_turns:
+                return index
+    return 0
+
+
+class ConversationHistory:
+    """Per-call history manager shared by all specialists of one call."""
+
+    def __init__(self, llm, turns_by_specialist=None, refresh_turns=SUMMARY_REFRESH_TURNS):
+        self.llm = llm
+        self.turns_by_specialist = {**HISTORY_TURNS, **(turns_by_specialist or {})}
+        self.refresh_turns = refresh_turns
+        self.prompt_stats = PromptPrefixTracker()
+        # What earlier calls taught about this caller (subagents.caller_memory), set once loaded
+        self.caller_memory = ""
+        self._summaries = {}
+        self._converted = {}
+        self._system_messages = {}
+
+    def window(self, messages, specialist):
+        """Return ``(summary, recent_messages)`` for a specialist's turn."""
+        max_turns = self.turns_by_specialist.get(specialist, DEFAULT_HISTORY_TURNS)
+        summary = self._summaries.setdefault(max_turns, _RollingSummary())
+        if summary.covered > len(messages):
+            # The chat context was replaced; the old summary no longer applies
+            self._summaries[max_turns] = summary = _RollingSummary()
+
+        start = _window_start(messages, max_turns)
+        pending = messages[summary.covered:start]
+        if summary.task is None and sum(msg.type == "human" for msg in pending) >= self.refresh_turns:
+            summary.task = asyncio.create_task(
+                self._refresh(summary, pending, start),
+                context=contextvars.Context(),
+            )
+
+        cut = min(summary.covered, start)
+        # Leading system messages (the agent instructions) are never summarized away
+        head = []
+        for msg in messages[:cut]:
+            if msg.type != "system":
+                break
+            head.append(msg)
+        return summary.text, head + messages[cut:]
+
+    def system_message(self, prompt):
+        """Request dict for a pre-rendered system prompt, reused across turns."""
+        entry = self._system_messages.get(prompt)
+        if entry is None:
+            entry = self._system_messages[prompt] = {"role": "system", "content": prompt}
+        return entry
+
+    def convert(self, messages):
+        """Convert messages to request dicts, reusing the dicts of earlier turns.
+
+        The adapter rebuilds the message list from the chat context every
+        turn with stable ids, so only the new turn is converted and earlier
+        turns keep the exact dict objects sent before.
+        """
+        converted = []
+        for msg in messages:
+            if not hasattr(msg, 'type'):
+                continue
+            entry = self._converted.get(msg.id) if msg.id else None
+            if entry is None or entry["content"] != msg.content:
+                entry = {"role": msg.type, "content": msg.content}
+                if msg.id:
+                    self._converted[msg.id] = entry
+            converted.append(entry)
+        return converted
+
+    async def _refresh(self, summary, pending, covered):
+        """Fold ``pending`` into the summary off the critical path."""
+        transcript = "\n".join(f"{msg.type}: {msg.content}" for msg in pending if msg.type in ("human", "ai"))
+        try:
+            response = await self.llm.ainvoke(
+                [{"role": "user", "content": generate_history_summary_prompt().format(summary=summary.text or "None", transcript=transcript)}],
+                config={"callbacks": [], "tags": [TAG_NOSTREAM]},
+            )
+            summary.text = response.content.strip()
+            summary.covered = covered
+        except Exception as e:
+            # Keep the old summary; the messages stay verbatim until the next refresh
+            logger.warning("history summary refresh failed: %s", e)
+        finally:
+            summary.task = None
+
+    async def aclose(self):
+        """Cancel in-flight summary refreshes when the call ends."""
+        tasks = [summary.task for summary in self._summaries.values() if summary.task]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
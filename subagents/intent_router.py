@@ -0,0 +1,164 @@
+"""Local keyword intent router.
+
+Scores caller utterances against the routing vocabulary the agent config
+already carries: the ``primary_assistant`` edge conditions and ``Task_List``
+keyword lists in ``frontdesk_english.json`` plus the category descriptions in
+``generate_intent_classifier_prompt``. Scoring is weighted unigram/bigram
+matching with IDF-style weights, so a classification is a few dict lookups
+and needs no network, model or embeddings.
+"""
+
+import functools
+import json
+import math
+import os
+import re
+from collections import defaultdict
+from pathlib import Path
+from typing import NamedTuple
+
+from subagent_prompts.employee_prompts import generate_intent_classifier_prompt
+
+AGENT_CONFIG_PATH = Path(__file__).resolve().parent.parent / "frontdesk_english.json"
+
+# Below this confidence intent_analyzer escalates to the LLM classifier
+INTENT_CONFIDENCE_THRESHOLD = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6"))
+
+# Graph node names in the agent config and the intents they serve
+NODE_INTENTS = {
+    "company_info": "COMPANY",
+    "project_discussion": "PROJECT",
+    "employee_information": "EMPLOYEE",
+    "admin_compliance_finance_info": "ADMIN",
+    "job_opportunity": "JOB",
+}
+
+def route_label(node_name):
+    """Routing label for a config node: one of the six intents, or the upper-cased node name."""
+    return NODE_INTENTS.get(node_name, node_name.upper())
+
+
+# Task_List intent headings ("- Job/Career Intent → ...") and their intents
+TASK_LIST_INTENTS = {
+    "company": "COMPANY",
+    "person": "EMPLOYEE",
+    "job": "JOB",
+    "project": "PROJECT",
+    "admin": "ADMIN",
+}
+
+# The config has no routing edge for small talk
+GENERAL_KEYWORDS = [
+    "hello", "hi", "hey", "good morning", "good afternoon", "good evening",
+    "thank you", "thanks", "bye", "goodbye", "how are you",
+]
+
+STOPWORDS = {
+    "a", "about", "an", "and", "are", "at", "can", "could", "do", "for", "get", "have",
+    "i", "in", "info", "is", "it", "like", "me", "my", "of", "on", "or", "our", "please",
+    "some", "the", "there", "to", "us", "we", "with", "would", "you", "your", "name",
+    "related", "e", "g",
+}
+
+# Smoothing so a single weak keyword never looks certain
+CONFIDENCE_PRIOR = 1.0
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class IntentPrediction(NamedTuple):
+    """Result of a local classification."""
+    intent: str
+    confidence: float
+
+
+def _stem(token):
+    """Fold plurals so "positions" and "position" share a feature."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def _features(text):
+    """Unigram and bigram features of a phrase or utterance."""
+    tokens = [_stem(token) for token in _TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+    return tokens + [f"{left} {right}" for left, right in zip(tokens, tokens[1:])]
+
+
+def _split_phrases(text):
+    return [phrase.strip() for phrase in re.split(r"[,/]", text) if phrase.strip()]
+
+
+def keywords_from_agent_config(config):
+    """Collect routing phrases per intent from an agent config dict."""
+    keywords = defaultdict(list)
+    for node in config["llm"]["graph_data"]["nodes"]:
+        if node.get("type") != "primary":
+            continue
+        for edge in node.get("edges", []):
+            keywords[route_label(edge["target"])].extend(_split_phrases(edge["condition"]))
+
+        current = None
+        for line in node["prompt"].get("Task_List", "").splitlines():
+            heading = line.strip().lstrip("-").strip().lower()
+            if "intent" in heading and "→" in heading:
+                current = next((intent for key, intent in TASK_LIST_INTENTS.items() if heading.startswith(key)), None)
+            elif heading.startswith("keywords:") and current:
+                keywords[current].extend(re.findall(r'"([^"]+)"', line))
+    return keywords
+
+
+def keywords_from_classifier_prompt():
+    """Collect the category descriptions from the LLM classifier prompt."""
+    keywords = defaultdict(list)
+    for line in generate_intent_classifier_prompt().splitlines():
+        match = re.match(r"- ([A-Z]+): (.+)", line.strip())
+        if match:
+            keywords[match.group(1)].extend(_split_phrases(match.group(2)))
+    return keywords
+
+
+class LocalIntentRouter:
+    """Weighted keyword classifier over the six frontdesk intents."""
+
+    def __init__(self, keywords):
+        counts = defaultdict(lambda: defaultdict(int))
+        for intent, phrases in keywords.items():
+            for phrase in phrases:
+                for feature in _features(phrase.replace("[name]", "")):
+                    counts[feature][intent] += 1
+
+        intent_count = len(keywords)
+        self.weights = {}
+        for feature, per_intent in counts.items():
+            idf = math.log(1 + intent_count / len(per_intent))
+            scale = 2.0 if " " in feature else 1.0
+            self.weights[feature] = {intent: count * idf * scale for intent, count in per_intent.items()}
+
+    def classify(self, utterance):
+        """Return the best intent and a confidence in [0, 1)."""
+        scores = defaultdict(float)
+        for feature in _features(utterance):
+            for intent, weight in self.weights.get(feature, {}).items():
+                scores[intent] += weight
+        if not scores:
+            return IntentPrediction("GENERAL", 0.0)
+        intent = max(scores, key=scores.get)
+        return IntentPrediction(intent, scores[intent] / (sum(scores.values()) + CONFIDENCE_PRIOR))
+
+
+def load_local_intent_router(path=AGENT_CONFIG_PATH):
+    """Build a router from an agent config file plus the classifier prompt."""
+    with open(path, encoding="utf-8") as f:
+        config = json.load(f)
+    keywords = keywords_from_agent_config(config)
+    for intent, phrases in keywords_from_classifier_prompt().items():
+        keywords[intent].extend(phrases)
+    keywords["GENERAL"].extend(GENERAL_KEYWORDS)
+    return LocalIntentRouter(keywords)
+
+
+@functools.lru_cache(maxsize=None)
+def get_local_intent_router():
+    """Process-wide router for the bundled frontdesk config."""
+    return load_local_intent_router()
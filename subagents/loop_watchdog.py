@@ -0,0 +1,257 @@
+"""Event-loop watchdog: finds what stalls the job process's loop.
+
+Every call in a job process shares one event loop with the audio pipeline
+(VAD, turn detection, TTS playback) of every other call. A synchronous call
+that holds the loop for 100 ms delays all of their audio by as much.
+
+With ``FRONTDESK_LOOP_WATCHDOG=1`` the first call in a process starts a
+``LoopWatchdog``:
+
+- A heartbeat task sleeps ``FRONTDESK_LOOP_WATCHDOG_INTERVAL_MS`` at a
+  time. How late it wakes is the loop's lag, observed into
+  ``frontdesk_event_loop_lag_seconds``.
+- A monitor thread notices when the heartbeat is half of
+  ``FRONTDESK_LOOP_WATCHDOG_THRESHOLD_MS`` overdue. While the loop is still
+  stuck, it captures the loop thread's stack and the task being run.
+- When the loop comes back at least the threshold late, the stall is
+  counted in
+  ``frontdesk_event_loop_stalls_total`` and
+  ``frontdesk_event_loop_stall_seconds`` by source, and logged as a
+  warning. The stack is logged the first time each blocking line is seen.
+
+The source is the graph node (``node:<name>``) or tool (``tool:<name>``)
+the stalled task was running for, else the task's coroutine
+(``task:<qualname>``), else ``callback`` for plain loop callbacks.
+``StallAttributionHandler``, a callback handler passed in the adapter's run
+config, labels node and tool runs. A task factory hands the label on to the
+tasks LangChain and LangGraph start for them.
+
+Several short callbacks in a row that add up past the threshold are one
+stall, attributed to whichever one was running at the halfway capture.
+"""
+
+import asyncio
+import collections
+import contextvars
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+import weakref
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from subagents.metrics import LOOP_LAG, LOOP_STALL_DURATION, LOOP_STALLS
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+LOOP_WATCHDOG_ENABLED = os.getenv("FRONTDESK_LOOP_WATCHDOG", "0") == "1"
+LOOP_WATCHDOG_THRESHOLD_MS = float(os.getenv("FRONTDESK_LOOP_WATCHDOG_THRESHOLD_MS", "100"))
+LOOP_WATCHDOG_INTERVAL_MS = float(os.getenv("FRONTDESK_LOOP_WATCHDOG_INTERVAL_MS", "20"))
+
+# Innermost frames kept from a stalled stack
+STACK_DEPTH = 20
+
+# The node or tool the current context runs for, and the same per task
+# for the monitor thread, which cannot read other contexts
+_activity = contextvars.ContextVar("frontdesk_activity", default=None)
+_task_activity = weakref.WeakKeyDictionary()
+
+
+def _labelling_task_factory(previous):
+    def factory(loop, coro, **kwargs):
+        task = previous(loop, coro, **kwargs) if previous else asyncio.Task(coro, loop=loop, **kwargs)
+        context = kwargs.get("context")
+        label = context.get(_activity) if context is not None else _activity.get()
+        if label:
+            _task_activity[task] = label
+        return task
+
+    factory.labels_tasks = True
+    return factory
+
+
+def stall_source(task):
+    """Metric label for a stall in ``task``: its node or tool, else its coroutine."""
+    if task is None:
+        return "callback"
+    label = _task_activity.get(task)
+    if label:
+        return label
+    coro = task.get_coro()
+    return f"task:{getattr(coro, '__qualname__', type(coro).__name__)}"
+
+
+class StallCapture:
+    """What the loop thread was doing halfway into a stall."""
+
+    def __init__(self, beat, source, task_name, stack):
+        self.beat = beat
+        self.source = source
+        self.task_name = task_name
+        self.stack = stack
+
+
+class LoopWatchdog:
+    """Measures the running loop's lag and reports stalls over ``threshold`` seconds."""
+
+    def __init__(self, threshold=LOOP_WATCHDOG_THRESHOLD_MS / 1000, interval=LOOP_WATCHDOG_INTERVAL_MS / 1000):
+        self.threshold = threshold
+        self.interval = interval
+        self.loop = None
+        self.stalls = 0
+        self.max_stall = 0.0
+        self.by_source = collections.Counter()
+        self._lock = threading.Lock()
+        self._beat = 0
+        self._expected = None
+        self._capture = None
+        self._sites = set()
+        self._stopped = threading.Event()
+        self._task = None
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._thread_id = threading.get_ident()
+        previous = self.loop.get_task_factory()
+        if not getattr(previous, "labels_tasks", False):
+            self.loop.set_task_factory(_labelling_task_factory(previous))
+        self._task = self.loop.create_task(self._heartbeat(), name="frontdesk-loop-watchdog")
+        threading.Thread(target=self._watch, name="frontdesk-loop-watchdog", daemon=True).start()
+        return self
+
+    async def _heartbeat(self):
+        while True:
+            with self._lock:
+                self._beat += 1
+                self._expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - self._expected)
+            LOOP_LAG.observe(lag)
+            if lag >= self.threshold:
+                with self._lock:
+                    capture = self._capture if self._capture is not None and self._capture.beat == self._beat else None
+                    self._capture = None
+                self._report(lag, capture)
+
+    def _watch(self):
+        while True:
+            with self._lock:
+                beat, expected = self._beat, self._expected
+                captured = self._capture is not None and self._capture.beat == beat
+            # Sleeps until the current heartbeat is half the threshold overdue,
+            # rather than polling; a stall just over the threshold still gets caught
+            if expected is None or captured:
+                delay = self.interval
+            else:
+                delay = expected + self.threshold / 2 - time.perf_counter()
+            if delay > 0:
+                if self._stopped.wait(delay):
+                    return
+                continue
+            capture = self._capture_stall(beat)
+            with self._lock:
+                if beat == self._beat:
+                    self._capture = capture
+
+    def _capture_stall(self, beat):
+        frame = sys._current_frames().get(self._thread_id)
+        stack = traceback.extract_stack(frame, limit=STACK_DEPTH) if frame is not None else traceback.StackSummary()
+        task = asyncio.current_task(self.loop)
+        return StallCapture(beat, stall_source(task), task.get_name() if task else None, stack)
+
+    def _report(self, lag, capture):
+        source = capture.source if capture else "unknown"
+        LOOP_STALLS.labels(source).inc()
+        LOOP_STALL_DURATION.labels(source).observe(lag)
+        self.stalls += 1
+        self.max_stall = max(self.max_stall, lag)
+        self.by_source[source] += 1
+        site = (capture.stack[-1].filename, capture.stack[-1].lineno) if capture and capture.stack else None
+        if site is not None and site not in self._sites:
+            self._sites.add(site)
+            logger.warning(
+                "event loop blocked for %.0f ms in %s (task %s), first stall at this line:\n%s",
+                lag * 1000, source, capture.task_name, "".join(traceback.format_list(capture.stack)).rstrip(),
+            )
+        else:
+            logger.warning("event loop blocked for %.0f ms in %s", lag * 1000, source)
+
+    def stats(self):
+        return {"stalls": self.stalls, "max_ms": round(self.max_stall * 1000, 1), "by_source": dict(self.by_source)}
+
+    async def aclose(self):
+        self._stopped.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+_WATCHDOG = None
+
+
+def start_loop_watchdog():
+    """The process's watchdog, started on the running loop by the first call."""
+    global _WATCHDOG
+    if _WATCHDOG is None or _WATCHDOG.loop.is_closed():
+        _WATCHDOG = LoopWatchdog().start()
+    return _WATCHDOG
+
+
+class StallAttributionHandler(BaseCallbackHandler):
+    """Labels the tasks of graph node and tool runs for ``stall_source``."""
+
+    # The label must be set in the run's own task
+    run_inline = True
+
+    def __init__(self):
+        self._runs = {}
+
+    def _enter(self, run_id, label):
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        previous = _task_activity.get(task) if task is not None else None
+        if task is not None:
+            _task_activity[task] = label
+        self._runs[run_id] = (task, previous, _activity.set(label))
+
+    def _exit(self, run_id):
+        entry = self._runs.pop(run_id, None)
+        if entry is None:
+            return
+        task, previous, token = entry
+        try:
+            _activity.reset(token)
+        except ValueError:
+            # Ended in a different context than it started in
+            pass
+        if task is None:
+            return
+        if previous is None:
+            _task_activity.pop(task, None)
+        else:
+            _task_activity[task] = previous
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and parent_run_id is not None and kwargs.get("name") == node:
+            self._enter(run_id, f"node:{node}")
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._exit(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._exit(run_id)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, **kwargs):
+        self._enter(run_id, f"tool:{(serialized or {}).get('name', '')}")
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._exit(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._exit(run_id)
@@ -0,0 +1,177 @@
+"""Prometheus metrics for autoscaling and alerting.
+
+With ``FRONTDESK_METRICS_PORT`` set, the worker serves ``/metrics`` on that
+port through livekit-agents' own Prometheus server (``WorkerOptions
+(prometheus_port=...)``). Calls run in child job processes, so their
+metrics are written to ``FRONTDESK_METRICS_DIR`` in prometheus_client's
+multiprocess mode, and the worker aggregates them on each scrape.
+
+- ``frontdesk_active_calls`` and ``frontdesk_calls_total`` per persona.
+- ``frontdesk_intents_total`` per routed intent.
+- ``frontdesk_node_duration_seconds``, a histogram per graph node.
+- ``frontdesk_llm_tokens_total`` per node (specialist) and direction.
+- ``frontdesk_tool_calls_total`` and ``frontdesk_tool_errors_total`` per
+  tool; failures include timeouts and unknown tools.
+- ``frontdesk_event_loop_lag_seconds``, ``frontdesk_event_loop_stalls_total``
+  and ``frontdesk_event_loop_stall_seconds`` per stall source, from the
+  loop watchdog (``subagents.loop_watchdog``).
+- ``frontdesk_process_cpu_seconds_total`` and
+  ``frontdesk_process_resident_memory_bytes`` per job process, sampled
+  every ``FRONTDESK_METRICS_INTERVAL`` seconds in a background thread.
+
+Node, intent and token metrics come from ``GraphMetricsHandler``, a
+LangChain callback handler passed in the adapter's run config next to
+``GraphTracingHandler``. Updates are in-memory or memory-mapped writes;
+nothing on the event loop waits on a scrape.
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+
+import psutil
+from langchain_core.callbacks import BaseCallbackHandler
+from prometheus_client import Counter, Gauge, Histogram
+
+FRONTDESK_METRICS_PORT = int(os.getenv("FRONTDESK_METRICS_PORT", "0"))
+FRONTDESK_METRICS_DIR = os.getenv("FRONTDESK_METRICS_DIR", str(Path.home() / ".cache" / "bs23-frontdesk" / "prometheus"))
+# Seconds between process CPU and RSS samples
+FRONTDESK_METRICS_INTERVAL = float(os.getenv("FRONTDESK_METRICS_INTERVAL", "5"))
+
+# Voice turns: tens of milliseconds for local routing, seconds for model calls
+NODE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+# Event-loop lag: a 20 ms audio frame is late from the first bucket on
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+ACTIVE_CALLS = Gauge("frontdesk_active_calls", "Calls in progress", ["persona"], multiprocess_mode="livesum")
+CALLS = Counter("frontdesk_calls", "Calls started", ["persona"])
+INTENTS = Counter("frontdesk_intents", "Turns routed per intent", ["intent"])
+NODE_DURATION = Histogram("frontdesk_node_duration_seconds", "Graph node latency", ["node"], buckets=NODE_BUCKETS)
+LLM_TOKENS = Counter("frontdesk_llm_tokens", "LLM tokens per node; direction is in (prompt) or out", ["node", "direction"])
+TOOL_CALLS = Counter("frontdesk_tool_calls", "Tool calls", ["tool"])
+TOOL_ERRORS = Counter("frontdesk_tool_errors", "Tool calls that failed or timed out", ["tool"])
+LOOP_LAG = Histogram("frontdesk_event_loop_lag_seconds", "How late the watchdog's heartbeat fired", buckets=LAG_BUCKETS)
+LOOP_STALLS = Counter("frontdesk_event_loop_stalls", "Event-loop stalls over the watchdog threshold", ["source"])
+LOOP_STALL_DURATION = Histogram("frontdesk_event_loop_stall_seconds", "Event-loop stall duration", ["source"], buckets=LAG_BUCKETS)
+PROCESS_CPU = Counter("frontdesk_process_cpu_seconds", "CPU time of the job processes")
+PROCESS_RSS = Gauge("frontdesk_process_resident_memory_bytes", "Resident memory per job process", multiprocess_mode="liveall")
+
+
+def metrics_enabled():
+    return FRONTDESK_METRICS_PORT > 0
+
+
+def worker_metrics_options():
+    """``WorkerOptions`` arguments that serve the metrics; empty when disabled."""
+    if not metrics_enabled():
+        return {}
+    return {"prometheus_port": FRONTDESK_METRICS_PORT, "prometheus_multiproc_dir": FRONTDESK_METRICS_DIR}
+
+
+def call_started(persona):
+    ACTIVE_CALLS.labels(persona).inc()
+    CALLS.labels(persona).inc()
+
+
+def call_ended(persona):
+    ACTIVE_CALLS.labels(persona).dec()
+
+
+def record_tool(name, failed):
+    TOOL_CALLS.labels(name).inc()
+    if failed:
+        TOOL_ERRORS.labels(name).inc()
+
+
+_SAMPLER = None
+
+
+def _sample_process(process, interval):
+    cpu = 0.0
+    while True:
+        times = process.cpu_times()
+        total = times.user + times.system
+        PROCESS_CPU.inc(total - cpu)
+        cpu = total
+        PROCESS_RSS.set(process.memory_info().rss)
+        time.sleep(interval)
+
+
+def start_process_sampler(interval=FRONTDESK_METRICS_INTERVAL):
+    """Sample this process's CPU and RSS in a daemon thread, once per process."""
+    global _SAMPLER
+    if _SAMPLER is None:
+        _SAMPLER = threading.Thread(
+            target=_sample_process, args=(psutil.Process(), interval), name="frontdesk-metrics", daemon=True,
+        )
+        _SAMPLER.start()
+        if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+            from prometheus_client import multiprocess
+
+            # Drops this process's live gauges (active calls, RSS) from the worker's scrape
+            atexit.register(multiprocess.mark_process_dead, os.getpid())
+    return _SAMPLER
+
+
+def token_usage(response):
+    """``(input, output)`` tokens of an ``LLMResult``, streamed or not.
+
+    Streamed generations carry usage on the message only; ``llm_output`` is
+    the fallback for providers that report it there.
+    """
+    input_tokens = output_tokens = 0
+    for generations in response.generations:
+        for generation in generations:
+            usage = getattr(getattr(generation, "message", None), "usage_metadata", None) or {}
+            input_tokens += usage.get("input_tokens", 0)
+            output_tokens += usage.get("output_tokens", 0)
+    if not input_tokens and not output_tokens:
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        input_tokens, output_tokens = usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+    return input_tokens, output_tokens
+
+
+class GraphMetricsHandler(BaseCallbackHandler):
+    """Feeds node latency, routed intents and token usage from one graph run."""
+
+    # Callbacks run in the graph's task, not an executor thread
+    run_inline = True
+
+    def __init__(self):
+        # run id -> (node, start time) for node runs, node name for model calls
+        self._nodes = {}
+        self._models = {}
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node and parent_run_id is not None and kwargs.get("name") == node:
+            self._nodes[run_id] = (node, time.perf_counter())
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        started = self._nodes.pop(run_id, None)
+        if started is None:
+            return
+        NODE_DURATION.labels(started[0]).observe(time.perf_counter() - started[1])
+        if isinstance(outputs, dict) and outputs.get("intent"):
+            INTENTS.labels(outputs["intent"]).inc()
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        started = self._nodes.pop(run_id, None)
+        if started is not None:
+            NODE_DURATION.labels(started[0]).observe(time.perf_counter() - started[1])
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._models[run_id] = (metadata or {}).get("langgraph_node", "")
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        node = self._models.pop(run_id, "")
+        input_tokens, output_tokens = token_usage(response)
+        if input_tokens:
+            LLM_TOKENS.labels(node, "in").inc(input_tokens)
+        if output_tokens:
+            LLM_TOKENS.labels(node, "out").inc(output_tokens)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._models.pop(run_id, None)
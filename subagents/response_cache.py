@@ -0,0 +1,257 @@
+"""Cache of spoken answers to repeated factual questions.
+
+Most company and job questions ("what are your office hours?", "where are
+you located?", "any open developer positions?") have one right answer that
+depends only on the company data, not on the caller. The first such turn
+runs the specialist as usual; later turns with the same intent and the same
+normalized utterance get the stored reply immediately, without a specialist
+LLM call. With ``FRONTDESK_RESPONSE_CACHE_SIMILARITY`` below 1, an utterance
+also hits when it has exactly the same content words as a stored one and
+differs only in stopwords ("what are the office hours" / "what are your
+office hours"); a different name, place or technology never matches.
+
+Entries are keyed on ``(scope, intent, normalized utterance)`` where the
+scope names the node and a hash of its system prompt, so a changed prompt
+never serves old replies. Every lookup also compares a fingerprint of
+``COMPANY_DATA``, ``JOB_DATA`` and the loaded knowledge indexes; any change
+clears the cache. Entries expire after ``RESPONSE_CACHE_TTL`` seconds.
+
+Replies are only stored when the caller's message stands on its own (no
+"it"/"that" referring back) and the reply repeats nothing personal the
+caller said in this turn or earlier in the call (names, numbers, email
+addresses not found in the company and job data). Nothing is stored while
+a returning caller's memory (``ConversationHistory.caller_memory``) is in
+the prompt: the reply may draw on it in ways no pattern can spot. Such
+calls still get cached answers to their questions.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import uuid
+from collections import OrderedDict
+
+from langchain_core.messages import AIMessage
+
+from tools.company_tools import COMPANY_DATA
+from tools.job_tools import JOB_DATA
+from tools.knowledge_base import knowledge_generations
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+RESPONSE_CACHE_ENABLED = os.getenv("FRONTDESK_RESPONSE_CACHE", "1") == "1"
+RESPONSE_CACHE_TTL = float(os.getenv("FRONTDESK_RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("FRONTDESK_RESPONSE_CACHE_SIZE", "1024"))
+
+# Token-set Jaccard similarity for an utterance with the same content words
+# to hit; 1 = exact only
+RESPONSE_CACHE_SIMILARITY = float(os.getenv("FRONTDESK_RESPONSE_CACHE_SIMILARITY", "1.0"))
+
+# Intents whose answers depend only on company data
+CACHEABLE_INTENTS = ("COMPANY", "JOB")
+
+# Words dropped before keying: fillers and politeness that do not change the question
+FILLER_WORDS = {
+    "a", "an", "the", "um", "uh", "hmm", "please", "hi", "hello", "hey", "okay", "ok", "so", "well",
+    "yeah", "yes", "just", "like", "could", "would", "can", "you", "me", "tell", "i", "id", "im",
+    "want", "wanted", "to", "know", "kindly", "thanks", "thank", "actually", "maybe", "let",
+}
+
+# Words that may differ between two near-matching utterances; every other
+# word (question words, names, places, technologies) must be the same
+STOP_WORDS = {
+    "is", "are", "am", "was", "were", "be", "been", "do", "does", "did", "have", "has", "had",
+    "your", "our", "my", "their", "of", "in", "on", "at", "for", "with", "about", "from",
+    "and", "or", "any", "some", "there", "we", "us", "now", "currently", "right", "really",
+}
+
+# Words that refer back to earlier turns; such questions are not cached
+ANAPHORA_WORDS = {"it", "its", "that", "this", "those", "these", "they", "them", "he", "she", "him", "her", "same", "else", "again"}
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Mid-sentence capitalized words (names, companies), long numbers, emails
+_PERSONAL_PATTERN = re.compile(r"(?<=[a-z,] )[A-Z][a-z]{2,}\b|\d{3,}|[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+
+
+def normalize_utterance(text):
+    """Lower-cased content words of an utterance, in order."""
+    return tuple(word for word in _WORD_PATTERN.findall(text.lower().replace("'", "")) if word not in FILLER_WORDS)
+
+
+def content_words(words):
+    """The words of a normalized utterance that two near-matches must share."""
+    return frozenset(word for word in words if word not in STOP_WORDS)
+
+
+def node_scope(name, prompt):
+    """Cache scope of a graph node: its name and a hash of its system prompt."""
+    return f"{name}:{hashlib.sha256(prompt.encode('utf-8')).hexdigest()[:16]}"
+
+
+def data_version():
+    """Fingerprint of the data cached answers are derived from."""
+    payload = json.dumps([COMPANY_DATA, JOB_DATA], sort_keys=True) + repr(knowledge_generations())
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedResponse:
+    """One stored reply and what producing it cost."""
+
+    def __init__(self, text, words, cost, expires):
+        self.text = text
+        self.words = frozenset(words)
+        self.content = content_words(words)
+        self.cost = cost
+        self.expires = expires
+
+
+class ResponseCache:
+    """LRU of spoken replies per ``(scope, intent, normalized utterance)``."""
+
+    def __init__(self, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE,
+                 similarity=RESPONSE_CACHE_SIMILARITY, version=data_version):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self._version_fn = version
+        self._version = version()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.skipped = 0
+        self.expired = 0
+        self.invalidations = 0
+        self.saved_seconds = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _check_version(self):
+        version = self._version_fn()
+        if version != self._version:
+            logger.info("response cache: company data changed, dropping %d entries", len(self._entries))
+            self._entries.clear()
+            self._version = version
+            self.invalidations += 1
+
+    def _similar(self, scope, intent, words, now):
+        """Best live entry of the same scope, intent and content words above the similarity threshold."""
+        best, best_score = None, self.similarity
+        query = frozenset(words)
+        content = content_words(words)
+        for (entry_scope, entry_intent, _), entry in self._entries.items():
+            if entry_scope != scope or entry_intent != intent or entry.expires <= now or entry.content != content:
+                continue
+            score = len(query & entry.words) / len(query | entry.words)
+            if score >= best_score:
+                best, best_score = entry, score
+        return best
+
+    def lookup(self, scope, intent, utterance):
+        """Stored reply for the utterance, or ``None``."""
+        self._check_version()
+        words = normalize_utterance(utterance)
+        if not words:
+            self.misses += 1
+            return None
+        now = time.monotonic()
+        key = (scope, intent, words)
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires <= now:
+            del self._entries[key]
+            self.expired += 1
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self.similarity < 1.0:
+            entry = self._similar(scope, intent, words, now)
+            self.similar_hits += entry is not None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_seconds += entry.cost
+        return entry
+
+    def store(self, scope, intent, utterance, text, cost):
+        """Remember ``text`` as the reply to ``utterance``; ``cost`` is the seconds it took."""
+        words = normalize_utterance(utterance)
+        if not words or not text.strip():
+            return
+        self._check_version()
+        key = (scope, intent, words)
+        self._entries[key] = CachedResponse(text, words, cost, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self.stores += 1
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        """Hit rate and latency saved, for logging."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "saved_ms": round(self.saved_seconds * 1000),
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+        }
+
+
+def _standalone(utterance):
+    return not ANAPHORA_WORDS.intersection(_WORD_PATTERN.findall(utterance.lower()))
+
+
+def _personal(reply, state):
+    """Whether the reply repeats names, numbers or emails the caller gave in this call.
+
+    The current utterance counts too: "Sure John, ..." must not be served to
+    the next caller. Details that appear in the company or job data (the
+    city, the company name) are public.
+    """
+    details = set()
+    for msg in state["messages"]:
+        if msg.type == "human":
+            details.update(_PERSONAL_PATTERN.findall(msg.content))
+    if not details:
+        return False
+    public = json.dumps([COMPANY_DATA, JOB_DATA], ensure_ascii=False)
+    return any(detail in reply and detail not in public for detail in details)
+
+
+async def cached_turn(cache, scope, intent, state, run, history=None):
+    """Answer from ``cache`` or await ``run()`` and cache its reply when it is safe to.
+
+    ``run`` is the specialist call; it is skipped on a hit, and the stored
+    reply is returned as a fresh ``AIMessage`` so it is spoken at once.
+    ``history`` is the call's ``ConversationHistory``; a loaded caller
+    memory keeps the reply out of the cache.
+    """
+    if cache is None or intent not in CACHEABLE_INTENTS:
+        return await run()
+    utterance = state["messages"][-1].content if state["messages"] else ""
+    entry = cache.lookup(scope, intent, utterance)
+    if entry is not None:
+        logger.debug("response cache hit for %s (saved %.0f ms)", intent, entry.cost * 1000)
+        return {"messages": [AIMessage(content=entry.text, id=f"cached-{uuid.uuid4()}")]}
+
+    started = time.perf_counter()
+    result = await run()
+    reply = result["messages"][-1].content
+    remembered = history is not None and bool(history.caller_memory)
+    if not remembered and _standalone(utterance) and not _personal(reply, state):
+        cache.store(scope, intent, utterance, reply, time.perf_counter() - started)
+    else:
+        cache.skipped += 1
+    return result
@@ -0,0 +1,99 @@
+"""Single-pass routing subagent."""
+
+import logging
+
+from langgraph.config import get_stream_writer
+from langgraph.constants import TAG_NOSTREAM
+from langchain_core.messages import AIMessage
+
+from subagent_prompts.router_prompts import generate_single_pass_router_prompt
+from subagent_prompts.knowledge_prompts import generate_knowledge_message
+from subagents.base import build_specialist_messages, recent_caller_text
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+INTENTS = ("EMPLOYEE", "COMPANY", "PROJECT", "JOB", "ADMIN", "GENERAL")
+
+
+# Spoken when the model sends a bare label and no specialist prompt is available
+FALLBACK_REPLY = "Sure, how can I help you with that?"
+
+
+def _parse_label(line):
+    """The intent named by a label line, or ``None`` when the line is reply text."""
+    label = line.strip().strip('"*.:').upper()
+    return label if label in INTENTS else None
+
+
+async def single_pass_router(state, llm, system_message=None, history=None, knowledge=None, specialist_prompts=None):
+    """Classify the caller's intent and answer in a single LLM round trip.
+
+    The model writes the category on its first line and the spoken reply
+    after it. The label is held back and only the reply is forwarded through
+    the graph's ``custom`` stream, so TTS starts on the first sentence while
+    the intent is still recorded for the six routing outcomes. A first line
+    that is not one of the intents is part of the reply and is spoken.
+
+    When the model sends only a label, the intent's prompt from
+    ``specialist_prompts`` answers in a second call, streamed the same way;
+    without one, ``FALLBACK_REPLY`` is spoken so the turn is never silent.
+
+    With a ``knowledge`` index the matching snippets are sent as per-turn
+    context, as for the specialists.
+    """
+    writer = get_stream_writer()
+    context = generate_knowledge_message(knowledge.search(recent_caller_text(state))) if knowledge is not None else None
+    header, reply, intent = "", "", None
+
+    async for chunk in llm.astream(
+        build_specialist_messages(state, system_message or generate_single_pass_router_prompt(), history, "single_pass_router", context),
+        config={"tags": [TAG_NOSTREAM]},
+    ):
+        text = chunk.content
+        if intent is None:
+            header = (header + text).lstrip()
+            if "\n" not in header:
+                continue
+            label, rest = header.split("\n", 1)
+            intent = _parse_label(label)
+            if intent is None:
+                # No category line: the model went straight to the answer
+                intent, text = "GENERAL", header
+            else:
+                text = rest.lstrip("\n")
+            logger.debug("intent %s (single pass)", intent)
+        if text:
+            reply += text
+            writer(text)
+
+    if intent is None:
+        # The model sent a bare label, or a one-line answer without a category line
+        intent = _parse_label(header)
+        if intent is None:
+            intent, reply = "GENERAL", header
+            writer(reply)
+    if not reply.strip():
+        reply = await _label_only_reply(state, llm, intent, writer, history, context, specialist_prompts)
+
+    return {"messages": [AIMessage(content=reply)], "intent": intent}
+
+
+async def _label_only_reply(state, llm, intent, writer, history, context, specialist_prompts):
+    """Answer a turn the model labelled without replying to."""
+    prompt = (specialist_prompts or {}).get(intent)
+    if prompt is None:
+        writer(FALLBACK_REPLY)
+        return FALLBACK_REPLY
+    logger.debug("single pass sent only the label %s; asking the specialist", intent)
+    reply = ""
+    async for chunk in llm.astream(
+        build_specialist_messages(state, prompt, history, "single_pass_router", context),
+        config={"tags": [TAG_NOSTREAM]},
+    ):
+        if chunk.content:
+            reply += chunk.content
+            writer(chunk.content)
+    if not reply.strip():
+        writer(FALLBACK_REPLY)
+        reply = FALLBACK_REPLY
+    return reply
@@ -0,0 +1,141 @@
+"""Async tool execution for the specialists' tool-calling loops.
+
+A model response may request several tools at once (e.g. the company's
+location and its working hours). ``ParallelToolNode`` runs all calls of one
+response concurrently, each under its own timeout, so a turn waits for the
+slowest tool instead of the sum of all of them. A failed or timed-out tool
+becomes an error ``ToolMessage`` the model can apologise for, never an
+exception that kills the turn.
+
+The loop runs inside the specialist's graph node rather than as separate
+graph nodes, so tool-call messages and tool results never enter the graph
+state. Every model call of the loop still streams through the ``messages``
+stream mode, because a round is only known to be final once it has been
+generated. Chunks that carry nothing but tool-call deltas have no text and
+are skipped by ``langchain.LLMAdapter``. Any text the model writes next to
+its tool calls (a "let me check that" preamble) is spoken before the final
+reply.
+"""
+
+import asyncio
+import logging
+import time
+
+from langchain_core.messages import ToolMessage
+
+from subagents.metrics import record_tool
+from tools.registry import SPECIALIST_TOOLS, TOOLS_ENABLED
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+# Seconds before a tool call is abandoned; slow side effects get longer.
+# send_email only queues its message (tools.email_outbox), so it needs none.
+DEFAULT_TOOL_TIMEOUT = 3.0
+TOOL_TIMEOUTS = {}
+
+# Model round trips per turn before the loop gives up on tools
+MAX_TOOL_ROUNDS = 3
+
+
+class ToolLatency:
+    """Call count, failures and latency of one tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.failures = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed, failed):
+        self.calls += 1
+        self.failures += failed
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+
+class ParallelToolNode:
+    """Runs the tool calls of one model response concurrently."""
+
+    def __init__(self, tools, timeouts=None, default_timeout=DEFAULT_TOOL_TIMEOUT):
+        self.tools = {tool.name: tool for tool in tools}
+        self.timeouts = {**TOOL_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self.latency = {}
+
+    async def _run(self, call):
+        name = call["name"]
+        tool = self.tools.get(name)
+        started = time.perf_counter()
+        failed = True
+        try:
+            if tool is None:
+                content = f"Error: unknown tool {name}."
+            else:
+                result = await asyncio.wait_for(tool.ainvoke(call["args"]), self.timeouts.get(name, self.default_timeout))
+                content = str(result)
+                failed = False
+        except asyncio.TimeoutError:
+            content = f"Error: {name} timed out."
+        except Exception as e:
+            content = f"Error: {name} failed: {e}"
+        elapsed = time.perf_counter() - started
+        self.latency.setdefault(name, ToolLatency()).record(elapsed, failed)
+        record_tool(name, failed)
+        logger.debug("tool %s took %.1f ms (failed=%s)", name, elapsed * 1000, failed)
+        return ToolMessage(content=content, tool_call_id=call["id"], name=name, status="error" if failed else "success")
+
+    async def __call__(self, tool_calls):
+        """Execute ``tool_calls`` concurrently; results keep the call order."""
+        return list(await asyncio.gather(*(self._run(call) for call in tool_calls)))
+
+    def stats(self):
+        """Per-tool ``{calls, failures, avg_ms, max_ms}`` for logging."""
+        return tool_latency_summary([self])
+
+
+def tool_latency_summary(tool_nodes):
+    """Per-tool ``{calls, failures, avg_ms, max_ms}`` across several tool nodes."""
+    combined = {}
+    for node in tool_nodes:
+        for name, latency in node.latency.items():
+            total = combined.setdefault(name, ToolLatency())
+            total.calls += latency.calls
+            total.failures += latency.failures
+            total.total += latency.total
+            total.max = max(total.max, latency.max)
+    return {
+        name: {
+            "calls": latency.calls,
+            "failures": latency.failures,
+            "avg_ms": round(latency.total / latency.calls * 1000, 2),
+            "max_ms": round(latency.max * 1000, 2),
+        }
+        for name, latency in combined.items()
+    }
+
+
+async def run_tool_loop(llm, tool_node, request, max_rounds=MAX_TOOL_ROUNDS):
+    """Call the model, run its tool calls, repeat until it answers in text.
+
+    Returns the final ``AIMessage``; after ``max_rounds`` tool rounds the
+    model is called once more with tool calls disabled so the caller always
+    gets a reply. Every call streams; see the module docstring for what the
+    caller hears of a tool round.
+    """
+    tools = list(tool_node.tools.values())
+    bound = llm.bind_tools(tools)
+    request = list(request)
+    for _ in range(max_rounds):
+        response = await bound.ainvoke(request)
+        if not response.tool_calls:
+            return response
+        request.append(response)
+        request.extend(await tool_node(response.tool_calls))
+    return await llm.bind_tools(tools, tool_choice="none").ainvoke(request)
+
+
+def create_tool_nodes(specialist_tools=None):
+    """One ``ParallelToolNode`` per specialist with tools; empty when tools are disabled."""
+    if not TOOLS_ENABLED:
+        return {}
+    return {name: ParallelToolNode(tools) for name, tools in (specialist_tools or SPECIALIST_TOOLS).items() if tools}
@@ -0,0 +1,238 @@
+"""Per-turn tracing spans, exported off the event loop.
+
+With ``FRONTDESK_TRACING`` set to ``file`` or ``otlp``, ``setup_tracing``
+installs one OpenTelemetry tracer provider for the process and hands it to
+livekit-agents as well. Every caller turn then yields one trace covering:
+
+- livekit's own spans: ``user_speaking``, ``eou_detection`` and
+  ``user_turn`` for end of speech, the end-of-turn decision and the STT
+  final (``transcription_delay``), plus ``llm_node`` and ``tts_node``.
+- ``graph_turn`` with one span per graph node (``intent_analyzer`` carries
+  the chosen ``frontdesk.intent``), from ``GraphTracingHandler``, a
+  LangChain callback handler passed in the adapter's run config.
+- ``llm`` per model call, with ``frontdesk.first_token_ms`` and token
+  usage, and ``tool`` per tool call.
+- ``tts_segment`` per flushed TTS segment, from flush to first audio
+  (``voice.agent``).
+
+Every span is stamped with the call's ``frontdesk.call_id`` and
+``frontdesk.persona`` (see ``bind_call``). Spans go to a bounded queue that
+``BatchSpanProcessor`` drains in its own thread, so nothing on the event
+loop waits on I/O. When the queue is full, spans are dropped rather than
+blocking the loop. The ``file`` exporter appends JSON lines to
+``FRONTDESK_TRACE_FILE``. The ``otlp`` exporter sends OTLP/HTTP to
+``OTEL_EXPORTER_OTLP_ENDPOINT``.
+
+Transcripts and tool arguments are personal data, so livekit's spans are
+stripped of them unless ``FRONTDESK_TRACE_PII=1``. The spans added here
+never carry them.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from langchain_core.callbacks import BaseCallbackHandler
+from opentelemetry import context as otel_context
+from opentelemetry import trace
+from opentelemetry.sdk.trace import SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+
+from subagents.metrics import token_usage
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+FRONTDESK_TRACING = os.getenv("FRONTDESK_TRACING", "off")
+FRONTDESK_TRACE_FILE = Path(os.getenv("FRONTDESK_TRACE_FILE", Path.home() / ".cache" / "bs23-frontdesk" / "traces.jsonl"))
+FRONTDESK_TRACE_PII = os.getenv("FRONTDESK_TRACE_PII", "0") == "1"
+
+# Spans buffered before new ones are dropped, and the export batch size
+TRACE_QUEUE_SIZE = int(os.getenv("FRONTDESK_TRACE_QUEUE_SIZE", "4096"))
+TRACE_EXPORT_BATCH = 512
+
+tracer = trace.get_tracer("bs23-frontdesk")
+
+_call_attributes = contextvars.ContextVar("frontdesk_call_attributes", default=None)
+
+
+def bind_call(call_id, persona):
+    """Tag every span started from this context (the job's tasks) with the call and persona."""
+    _call_attributes.set({"frontdesk.call_id": call_id, "frontdesk.persona": persona or "default"})
+
+
+class CallAttributesProcessor(SpanProcessor):
+    """Stamps spans with the attributes ``bind_call`` set for the current call."""
+
+    def on_start(self, span, parent_context=None):
+        attributes = _call_attributes.get()
+        if attributes:
+            span.set_attributes(attributes)
+
+
+class JSONLinesSpanExporter(SpanExporter):
+    """Appends finished spans to a file, one JSON object per line."""
+
+    def __init__(self, path=FRONTDESK_TRACE_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, spans):
+        lines = []
+        for span in spans:
+            context = span.get_span_context()
+            lines.append(json.dumps({
+                "name": span.name,
+                "trace_id": f"{context.trace_id:032x}",
+                "span_id": f"{context.span_id:016x}",
+                "parent_id": f"{span.parent.span_id:016x}" if span.parent else None,
+                "start": span.start_time / 1e9,
+                "duration_ms": round((span.end_time - span.start_time) / 1e6, 3),
+                "attributes": dict(span.attributes or {}),
+            }, default=str))
+        with self._lock:
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self):
+        with self._lock:
+            self._file.close()
+
+
+def create_exporter(mode):
+    if mode == "file":
+        return JSONLinesSpanExporter()
+    if mode == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    raise ValueError(f"unknown FRONTDESK_TRACING mode: {mode!r}")
+
+
+_PROVIDER = None
+
+
+def setup_tracing(mode=FRONTDESK_TRACING, exporter=None):
+    """Install the process's tracer provider once; returns it, or ``None`` when tracing is off."""
+    global _PROVIDER
+    if _PROVIDER is not None or (mode == "off" and exporter is None):
+        return _PROVIDER
+    from livekit.agents.telemetry import set_tracer_provider
+
+    provider = TracerProvider()
+    provider.add_span_processor(CallAttributesProcessor())
+    provider.add_span_processor(BatchSpanProcessor(
+        exporter or create_exporter(mode), max_queue_size=TRACE_QUEUE_SIZE, max_export_batch_size=TRACE_EXPORT_BATCH,
+    ))
+    trace.set_tracer_provider(provider)
+    set_tracer_provider(provider, allow_pii=FRONTDESK_TRACE_PII)
+    _PROVIDER = provider
+    return provider
+
+
+def tracing_enabled():
+    return _PROVIDER is not None
+
+
+def record_span(name, started_ns, attributes=None, ended_ns=None):
+    """A span for an interval that has already happened."""
+    span = tracer.start_span(name, start_time=started_ns, attributes=attributes)
+    span.end(end_time=ended_ns or time.time_ns())
+
+
+class GraphTracingHandler(BaseCallbackHandler):
+    """Turns LangChain callbacks from one graph run into spans.
+
+    The graph run becomes ``graph_turn``, parented on the current span
+    (livekit's ``llm_node``). Each node becomes a child span, and model and
+    tool calls become children of their node. Runs in between, such as
+    sequences and bindings, are not traced; their children attach to the
+    nearest traced ancestor.
+    """
+
+    # Callbacks run in the graph's task, not an executor thread
+    run_inline = True
+
+    def __init__(self):
+        self._spans = {}
+        # run id -> nearest traced ancestor span, for untraced runs
+        self._parents = {}
+        self._first_token = set()
+
+    def _parent_context(self, parent_run_id):
+        parent = self._spans.get(parent_run_id) or self._parents.get(parent_run_id)
+        return trace.set_span_in_context(parent) if parent is not None else otel_context.get_current()
+
+    def _start(self, run_id, parent_run_id, name, attributes=None):
+        span = tracer.start_span(name, context=self._parent_context(parent_run_id), attributes=attributes)
+        self._spans[run_id] = span
+        return span
+
+    def _end(self, run_id, attributes=None, error=None):
+        self._parents.pop(run_id, None)
+        span = self._spans.pop(run_id, None)
+        if span is None:
+            return
+        if attributes:
+            span.set_attributes(attributes)
+        if error is not None:
+            span.set_status(trace.StatusCode.ERROR, type(error).__name__)
+        span.end()
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if parent_run_id is None:
+            self._start(run_id, None, "graph_turn")
+        elif node and kwargs.get("name") == node:
+            self._start(run_id, parent_run_id, node, {"frontdesk.node": node})
+        else:
+            parent = self._spans.get(parent_run_id) or self._parents.get(parent_run_id)
+            if parent is not None:
+                self._parents[run_id] = parent
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        span = self._spans.get(run_id)
+        if span is not None and isinstance(outputs, dict) and outputs.get("intent"):
+            span.set_attribute("frontdesk.intent", outputs["intent"])
+        self._end(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node", "")
+        self._start(run_id, parent_run_id, "llm", {"frontdesk.node": node})
+
+    def on_llm_new_token(self, token, *, run_id, **kwargs):
+        if token and run_id not in self._first_token and (span := self._spans.get(run_id)) is not None:
+            self._first_token.add(run_id)
+            span.set_attribute("frontdesk.first_token_ms", round((time.time_ns() - span.start_time) / 1e6, 1))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._first_token.discard(run_id)
+        attributes = {}
+        input_tokens, output_tokens = token_usage(response)
+        if input_tokens or output_tokens:
+            attributes = {
+                "gen_ai.usage.input_tokens": input_tokens,
+                "gen_ai.usage.output_tokens": output_tokens,
+            }
+        self._end(run_id, attributes)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._first_token.discard(run_id)
+        self._end(run_id, error=error)
+
+    def on_tool_start(self, serialized, input_str, *, run_id, parent_run_id=None, **kwargs):
+        self._start(run_id, parent_run_id, "tool", {"frontdesk.tool": (serialized or {}).get("name", "")})
+
+    def on_tool_end(self, output, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_tool_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
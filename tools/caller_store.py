@@ -0,0 +1,312 @@
+"""Caller records behind ``collect_caller_info``: an append-only log with a compact index.
+
+Each call that collects caller details appends one JSON line to
+``callers.log`` under ``CALLER_STORE_DIR``: the caller's latest details merged
+with what was known before, with first/last seen times and a call count. The
+log is never rewritten, so a record, once written, survives a crash. A torn
+last line is skipped when the log is read back.
+
+Writes never block a call. ``CallerStore.record`` queues the details and
+returns; one writer thread per process drains the queue, merges each caller
+with their previous record, and appends the whole batch with one write. With
+``CALLER_STORE_FSYNC`` on, each batch is also synced once (group commit), so
+thousands of concurrent calls cost one fsync per batch instead of one each.
+
+Lookups by phone number or email serve returning callers at call start. An
+in-memory index maps a 64-bit hash of the normalized phone number or email to
+the latest record's offset in the log. One ``pread`` fetches the record,
+which is checked against the key. The index is checkpointed to
+``callers.idx`` every ``CALLER_STORE_CHECKPOINT_RECORDS`` records and on
+close, at 20 bytes per key. Opening the store loads the checkpoint and
+replays only the log written after it.
+
+Worker processes may share the directory, since appends are atomic. A
+lookup that misses first reads the log other processes appended since the
+last read.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import queue
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+CALLER_STORE_DIR = Path(os.getenv("CALLER_STORE_DIR", Path.home() / ".cache" / "bs23-frontdesk" / "callers"))
+CALLER_STORE_FSYNC = os.getenv("CALLER_STORE_FSYNC", "1") == "1"
+CALLER_STORE_CHECKPOINT_RECORDS = int(os.getenv("CALLER_STORE_CHECKPOINT_RECORDS", "5000"))
+
+# Records appended per write at most
+MAX_BATCH_RECORDS = 1024
+
+INDEX_MAGIC = b"BS23CRM1"
+# Magic, log bytes covered, entry count
+INDEX_HEADER = struct.Struct("<8sQI")
+# Key hash, record offset, record length
+INDEX_ENTRY = struct.Struct("<QQI")
+
+# Shorter digit strings are extensions or typos, not phone numbers
+MIN_PHONE_DIGITS = 7
+
+CALLER_FIELDS = ("name", "email", "phone", "purpose")
+
+
+def phone_key(phone):
+    """Index key of a phone number: its last ten digits, so +880 and 0 prefixes match."""
+    digits = re.sub(r"\D", "", phone or "")
+    return f"phone:{digits[-10:]}" if len(digits) >= MIN_PHONE_DIGITS else None
+
+
+def email_key(email):
+    email = (email or "").strip().lower()
+    return f"email:{email}" if "@" in email else None
+
+
+def record_keys(record):
+    return [key for key in (phone_key(record.get("phone")), email_key(record.get("email"))) if key]
+
+
+def key_hash(key):
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class CallerStore:
+    """Append-only caller log with a hash index by phone and email."""
+
+    def __init__(self, directory=CALLER_STORE_DIR, fsync=CALLER_STORE_FSYNC,
+                 checkpoint_records=CALLER_STORE_CHECKPOINT_RECORDS):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.log_path = self.directory / "callers.log"
+        self.index_path = self.directory / "callers.idx"
+        self.fsync = fsync
+        self.checkpoint_records = checkpoint_records
+        # Caller details are personal data: owner access only
+        self._fd = os.open(self.log_path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()
+        self._index = {}
+        self._indexed = 0
+        self._queue = queue.SimpleQueue()
+        self._written = threading.Condition()
+        self._submitted = 0
+        self._completed = 0
+        self._since_checkpoint = 0
+        self.records = 0
+        self.batches = 0
+        self.lookups = 0
+        self.hits = 0
+
+        self._repair_tail()
+        self._load_index()
+        with self._lock:
+            self._catch_up()
+        self._writer = threading.Thread(target=self._write_loop, name="caller-store", daemon=True)
+        self._writer.start()
+
+    def record(self, name="", email="", phone="", purpose=""):
+        """Queue a caller's details for writing; returns at once."""
+        details = {"name": name, "email": email, "phone": phone, "purpose": purpose, "seen": time.time()}
+        with self._written:
+            self._submitted += 1
+        self._queue.put(details)
+
+    def lookup(self, phone=None, email=None):
+        """Latest record of the caller with this phone number or email, or ``None``."""
+        self.lookups += 1
+        keys = [key for key in (phone_key(phone), email_key(email)) if key]
+        for refreshed in (False, True):
+            for key in keys:
+                record = self._read(key)
+                if record is not None:
+                    self.hits += 1
+                    return record
+            if refreshed or os.fstat(self._fd).st_size <= self._indexed:
+                return None
+            # Another process may have appended the caller since we last read
+            with self._lock:
+                self._catch_up()
+        return None
+
+    def flush(self, timeout=None):
+        """Wait until every queued record is in the log; returns whether they are."""
+        with self._written:
+            target = self._submitted
+            return self._written.wait_for(lambda: self._completed >= target, timeout)
+
+    def close(self):
+        """Write what is queued, checkpoint the index and close the log."""
+        self._queue.put(None)
+        self._writer.join()
+        with self._lock:
+            self._checkpoint()
+        os.close(self._fd)
+
+    def stats(self):
+        """Records written, batching and lookup hits, for logging."""
+        return {
+            "callers": len({offset for offset, _ in self._index.values()}),
+            "records": self.records,
+            "batches": self.batches,
+            "records_per_batch": round(self.records / self.batches, 1) if self.batches else 0.0,
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "log_bytes": self._indexed,
+        }
+
+    def _read(self, key):
+        with self._lock:
+            location = self._index.get(key_hash(key))
+        if location is None:
+            return None
+        offset, length = location
+        try:
+            record = json.loads(os.pread(self._fd, length, offset))
+        except ValueError:
+            return None
+        # A 64-bit hash collision is unlikely, but a wrong caller would be worse
+        return record if key in record_keys(record) else None
+
+    def _write_loop(self):
+        while True:
+            first = self._queue.get()
+            batch = [first]
+            while len(batch) < MAX_BATCH_RECORDS:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            closing = None in batch
+            details = [item for item in batch if item is not None]
+            if details:
+                try:
+                    self._append(details)
+                except OSError:
+                    logger.exception("caller store: %d records not written", len(details))
+                with self._written:
+                    self._completed += len(details)
+                    self._written.notify_all()
+            if closing:
+                return
+
+    def _append(self, details):
+        with self._lock:
+            self._catch_up()
+        merged = {}
+        for item in details:
+            keys = record_keys(item)
+            if not keys:
+                continue
+            previous = next((merged[key] for key in keys if key in merged), None)
+            if previous is None:
+                previous = next((record for key in keys if (record := self._read(key)) is not None), None)
+            record = self._merge(previous, item)
+            for key in keys + record_keys(record):
+                merged[key] = record
+        # One line per caller, however many times they appear in the batch
+        records = list({id(record): record for record in merged.values()}.values())
+        if not records:
+            return
+        lines = [json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n" for record in records]
+        data = b"".join(lines)
+        os.write(self._fd, data)
+        # O_APPEND leaves the file position at the end of this write
+        end = os.lseek(self._fd, 0, os.SEEK_CUR)
+        if self.fsync:
+            os.fsync(self._fd)
+        self.records += len(records)
+        self.batches += 1
+        self._since_checkpoint += len(records)
+        with self._lock:
+            if end - len(data) == self._indexed:
+                # Nothing from other processes in between: index the batch without reading it back
+                offset = self._indexed
+                for record, line in zip(records, lines):
+                    for key in record_keys(record):
+                        self._index[key_hash(key)] = (offset, len(line) - 1)
+                    offset += len(line)
+                self._indexed = end
+            else:
+                self._catch_up()
+            if self._since_checkpoint >= self.checkpoint_records:
+                self._checkpoint()
+
+    @staticmethod
+    def _merge(previous, details):
+        """``previous`` updated with the non-empty fields of ``details``."""
+        seen = details["seen"]
+        record = dict(previous or {"first_seen": seen, "calls": 0})
+        for field in CALLER_FIELDS:
+            if details[field]:
+                record[field] = details[field]
+            else:
+                record.setdefault(field, "")
+        record["last_seen"] = seen
+        record["calls"] += 1
+        return record
+
+    def _catch_up(self):
+        """Index log lines appended since the last read; caller holds ``_lock``."""
+        size = os.fstat(self._fd).st_size
+        if size <= self._indexed:
+            return
+        data = os.pread(self._fd, size - self._indexed, self._indexed)
+        # A line still being written by another process waits for the next read
+        end = data.rfind(b"\n") + 1
+        offset = self._indexed
+        for line in data[:end].splitlines(keepends=True):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("caller store: skipping unreadable record at byte %d", offset)
+            else:
+                for key in record_keys(record):
+                    self._index[key_hash(key)] = (offset, len(line) - 1)
+            offset += len(line)
+        self._indexed += end
+
+    def _checkpoint(self):
+        """Write the index atomically; caller holds ``_lock``."""
+        temp = self.index_path.with_name(f"{self.index_path.name}.{os.getpid()}.tmp")
+        with open(temp, "wb") as f:
+            f.write(INDEX_HEADER.pack(INDEX_MAGIC, self._indexed, len(self._index)))
+            f.write(b"".join(INDEX_ENTRY.pack(h, offset, length) for h, (offset, length) in self._index.items()))
+        os.replace(temp, self.index_path)
+        self._since_checkpoint = 0
+
+    def _load_index(self):
+        try:
+            data = self.index_path.read_bytes()
+            magic, covered, count = INDEX_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return
+        size = os.fstat(self._fd).st_size
+        if magic != INDEX_MAGIC or covered > size or len(data) != INDEX_HEADER.size + count * INDEX_ENTRY.size:
+            logger.warning("caller store: index %s does not match the log, rebuilding", self.index_path)
+            return
+        self._index = {h: (offset, length) for h, offset, length in INDEX_ENTRY.iter_unpack(data[INDEX_HEADER.size:])}
+        self._indexed = covered
+
+    def _repair_tail(self):
+        """End a line torn by a crash, so the next append starts a line of its own."""
+        size = os.fstat(self._fd).st_size
+        if size and os.pread(self._fd, 1, size - 1) != b"\n":
+            os.write(self._fd, b"\n")
+
+
+_STORE = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_caller_store():
+    """The process's caller store, opened on first use."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = CallerStore()
+        return _STORE
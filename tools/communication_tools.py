@@ -3,16 +3,20 @@
 from langchain_core.tools import tool
 from datetime import datetime
 
+from tools.caller_store import get_caller_store
+from tools.email_outbox import get_email_outbox
+
 @tool
 def send_email(subject: str, message: str, to_email: str) -> str:
     """Send email to specified recipient."""
-    print(f"\n=== EMAIL SENT ===")
-    print(f"To: {to_email}")
-    print(f"Subject: {subject}")
-    print(f"Message: {message}")
-    print(f"Timestamp: {datetime.now()}")
-    print("==================\n")
-    return "Email sent successfully!"
+    # Header values may not contain line breaks; a model-written subject often does
+    subject = " ".join(subject.split())
+    to_email = to_email.strip()
+    if not to_email or any(char.isspace() for char in to_email):
+        return f"Email not sent: {to_email!r} is not a valid email address."
+    # Delivery happens in the background sender; queuing takes microseconds
+    get_email_outbox().enqueue(to_email, subject, message)
+    return "Email queued for delivery."
 
 @tool
 def collect_caller_info(name: str, email: str, phone: str = "", purpose: str = "") -> str:
@@ -24,6 +28,8 @@ def collect_caller_info(name: str, email: str, phone: str = "", purpose: str = "
         "purpose": purpose,
         "timestamp": datetime.now().isoformat()
     }
+    # Written by the store's background writer; returning callers are looked up at call start
+    get_caller_store().record(name=name, email=email, phone=phone, purpose=purpose)
     return f"Caller information collected: {info}"
 
 # Tool collection
@@ -0,0 +1,364 @@
+"""Durable email outbox with a batching, retrying SMTP sender.
+
+``send_email`` used to do its work inline; real SMTP delivery there would
+hold the voice turn for a TLS handshake and a server round trip per
+message. The tool now only appends the message to an SQLite outbox in WAL
+mode (tens of microseconds), and ``EmailSender`` delivers in the background:
+
+- Due messages are claimed in batches of ``EMAIL_BATCH_SIZE`` and sent over
+  one SMTP connection, which stays open between batches until it has been
+  idle for ``SMTP_IDLE_SECONDS``.
+- A failed delivery is retried after an exponential backoff
+  (``EMAIL_RETRY_BASE_SECONDS`` doubled per attempt, at most
+  ``EMAIL_RETRY_MAX_SECONDS``). Permanent SMTP errors (5xx) and messages
+  that fail ``EMAIL_MAX_ATTEMPTS`` times are dead-lettered: kept in the
+  outbox with status ``dead`` and the last error, never retried.
+- Claims are leased, so several worker processes can share one outbox. A
+  process that dies mid-batch leaves its messages to be picked up again
+  after ``EMAIL_CLAIM_LEASE_SECONDS``.
+
+Without ``SMTP_HOST`` the sender logs each message instead of delivering it,
+as the tool did before. SMTP work runs in a thread, so the event loop never
+waits on the network.
+"""
+
+import asyncio
+import logging
+import os
+import smtplib
+import sqlite3
+import threading
+import time
+from email.message import EmailMessage
+from pathlib import Path
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+EMAIL_OUTBOX_PATH = Path(os.getenv("EMAIL_OUTBOX_PATH", Path.home() / ".cache" / "bs23-frontdesk" / "outbox.sqlite3"))
+
+SMTP_HOST = os.getenv("SMTP_HOST", "")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "587"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "1") == "1"
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", "10"))
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "30"))
+EMAIL_FROM = os.getenv("EMAIL_FROM", "frontdesk@brainstation-23.com")
+
+EMAIL_BATCH_SIZE = int(os.getenv("EMAIL_BATCH_SIZE", "20"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "5"))
+EMAIL_RETRY_BASE_SECONDS = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "2"))
+EMAIL_RETRY_MAX_SECONDS = float(os.getenv("EMAIL_RETRY_MAX_SECONDS", "300"))
+EMAIL_CLAIM_LEASE_SECONDS = float(os.getenv("EMAIL_CLAIM_LEASE_SECONDS", "120"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    to_email TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    body TEXT NOT NULL,
+    created REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt REAL NOT NULL,
+    claimed_until REAL,
+    last_error TEXT,
+    sent REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt);
+"""
+
+
+class PermanentDeliveryError(Exception):
+    """The server refused the message for good; retrying cannot help."""
+
+
+def retry_delay(attempts, base=EMAIL_RETRY_BASE_SECONDS, cap=EMAIL_RETRY_MAX_SECONDS):
+    """Seconds to wait before retrying a message that failed ``attempts`` times."""
+    return min(cap, base * 2 ** (attempts - 1))
+
+
+class EmailOutbox:
+    """SQLite-backed queue of outgoing emails."""
+
+    def __init__(self, path=EMAIL_OUTBOX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Tools run in executor threads; the lock serializes the shared connection
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None, timeout=5.0)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL commits survive a process crash without an fsync per message
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+        self._wakeup = None
+
+    def enqueue(self, to_email, subject, body):
+        """Queue one message for delivery; returns its id."""
+        now = time.time()
+        with self._lock:
+            cursor = self._db.execute(
+                "INSERT INTO outbox (to_email, subject, body, created, next_attempt) VALUES (?, ?, ?, ?, ?)",
+                (to_email, subject, body, now, now),
+            )
+        if self._wakeup is not None:
+            self._wakeup()
+        return cursor.lastrowid
+
+    def claim(self, limit, lease=EMAIL_CLAIM_LEASE_SECONDS):
+        """Lease up to ``limit`` due messages to this process."""
+        now = time.time()
+        with self._lock:
+            return self._db.execute(
+                """
+                UPDATE outbox SET status = 'sending', claimed_until = ?
+                WHERE id IN (
+                    SELECT id FROM outbox
+                    WHERE (status = 'pending' AND next_attempt <= ?) OR (status = 'sending' AND claimed_until < ?)
+                    ORDER BY next_attempt LIMIT ?
+                )
+                RETURNING id, to_email, subject, body, attempts
+                """,
+                (now + lease, now, now, limit),
+            ).fetchall()
+
+    def mark_sent(self, ids):
+        with self._lock:
+            self._db.executemany("UPDATE outbox SET status = 'sent', sent = ? WHERE id = ?", [(time.time(), id_) for id_ in ids])
+
+    def mark_failed(self, message_id, attempts, error, permanent=False, max_attempts=EMAIL_MAX_ATTEMPTS):
+        """Schedule a retry, or dead-letter the message; returns whether it was dead-lettered."""
+        attempts += 1
+        dead = permanent or attempts >= max_attempts
+        with self._lock:
+            self._db.execute(
+                "UPDATE outbox SET status = ?, attempts = ?, next_attempt = ?, last_error = ? WHERE id = ?",
+                ("dead" if dead else "pending", attempts, time.time() + retry_delay(attempts), str(error)[:500], message_id),
+            )
+        return dead
+
+    def due(self):
+        """Messages due now or being sent."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM outbox WHERE (status = 'pending' AND next_attempt <= ?) OR status = 'sending'",
+                (time.time(),),
+            ).fetchone()[0]
+
+    def next_due(self):
+        """Unix time of the earliest pending message, or ``None``."""
+        with self._lock:
+            return self._db.execute("SELECT MIN(next_attempt) FROM outbox WHERE status = 'pending'").fetchone()[0]
+
+    def counts(self):
+        """Messages per status."""
+        with self._lock:
+            return dict(self._db.execute("SELECT status, COUNT(*) FROM outbox GROUP BY status").fetchall())
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class SMTPTransport:
+    """One SMTP connection, reopened when the server drops it."""
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, username=SMTP_USERNAME, password=SMTP_PASSWORD,
+                 starttls=SMTP_STARTTLS, timeout=SMTP_TIMEOUT, sender=EMAIL_FROM):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.sender = sender
+        self._smtp = None
+        self.connections = 0
+
+    def _connect(self):
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        self.connections += 1
+        return smtp
+
+    def send(self, to_email, subject, body):
+        message = EmailMessage()
+        message["From"] = self.sender
+        message["To"] = to_email
+        message["Subject"] = subject
+        message.set_content(body)
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The pooled connection went stale between batches: one fresh try
+            self._smtp = self._connect()
+            self._smtp.send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            codes = [code for code, _ in e.recipients.values()]
+            if all(code >= 500 for code in codes):
+                raise PermanentDeliveryError(e) from e
+            raise
+        except smtplib.SMTPResponseException as e:
+            # smtplib resets the transaction, so the connection stays usable
+            if e.smtp_code >= 500:
+                raise PermanentDeliveryError(e) from e
+            raise
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except smtplib.SMTPException:
+                pass
+            except OSError:
+                pass
+            self._smtp = None
+
+
+class LogTransport:
+    """Development transport: logs each message instead of delivering it."""
+
+    connections = 0
+
+    def send(self, to_email, subject, body):
+        logger.info("email to %s: %s (%d chars)", to_email, subject, len(body))
+
+    def close(self):
+        pass
+
+
+class EmailSender:
+    """Background task delivering the outbox in batches."""
+
+    def __init__(self, outbox, transport=None, batch_size=EMAIL_BATCH_SIZE, idle_seconds=SMTP_IDLE_SECONDS,
+                 max_attempts=EMAIL_MAX_ATTEMPTS):
+        self.outbox = outbox
+        self.transport = transport or (SMTPTransport() if SMTP_HOST else LogTransport())
+        self.batch_size = batch_size
+        self.idle_seconds = idle_seconds
+        self.max_attempts = max_attempts
+        self._event = asyncio.Event()
+        self._task = None
+        self.sent = 0
+        self.retried = 0
+        self.dead = 0
+        self.batches = 0
+
+    def start(self):
+        loop = asyncio.get_running_loop()
+        # Enqueues come from tool executor threads
+        self.outbox._wakeup = lambda: loop.call_soon_threadsafe(self._event.set)
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    async def _run(self):
+        idle_since = time.monotonic()
+        while True:
+            # Cleared before the outbox is read, so an enqueue from here on
+            # sets it again and the wait below returns at once
+            self._event.clear()
+            try:
+                delivered = await asyncio.to_thread(self._deliver_batch)
+                if delivered:
+                    idle_since = time.monotonic()
+                    continue
+                if time.monotonic() - idle_since >= self.idle_seconds:
+                    await asyncio.to_thread(self.transport.close)
+                next_due = self.outbox.next_due()
+                timeout = self.idle_seconds if next_due is None else max(0.0, next_due - time.time())
+            except Exception:
+                # An outbox or transport error must not end delivery for the
+                # rest of the process; leased messages are reclaimed later
+                logger.exception("email sender error; retrying in %g s", EMAIL_RETRY_BASE_SECONDS)
+                timeout = EMAIL_RETRY_BASE_SECONDS
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _deliver_batch(self):
+        """Send one batch of due messages; returns how many were attempted."""
+        batch = self.outbox.claim(self.batch_size)
+        if not batch:
+            return 0
+        self.batches += 1
+        sent = []
+        for message_id, to_email, subject, body, attempts in batch:
+            try:
+                self.transport.send(to_email, subject, body)
+                sent.append(message_id)
+            except PermanentDeliveryError as e:
+                self._failed(message_id, attempts, e, permanent=True)
+            except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused) as e:
+                # A refusal leaves the connection usable
+                self._failed(message_id, attempts, e)
+            except (smtplib.SMTPException, OSError) as e:
+                self._failed(message_id, attempts, e)
+                # The connection is suspect; the next send opens a fresh one
+                self.transport.close()
+            except Exception as e:
+                # A message that cannot be built (say, a header the email
+                # package rejects) fails the same way every time
+                self._failed(message_id, attempts, e, permanent=True)
+        self.outbox.mark_sent(sent)
+        self.sent += len(sent)
+        return len(batch)
+
+    def _failed(self, message_id, attempts, error, permanent=False):
+        if self.outbox.mark_failed(message_id, attempts, error, permanent, self.max_attempts):
+            self.dead += 1
+            logger.warning("email %d dead-lettered after %d attempts: %s", message_id, attempts + 1, error)
+        else:
+            self.retried += 1
+
+    async def drain(self, timeout=None):
+        """Wait until nothing is due; retries scheduled later stay queued."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.outbox.due():
+            if deadline is not None and time.monotonic() > deadline:
+                break
+            self._event.set()
+            await asyncio.sleep(0.01)
+
+    async def aclose(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        self.outbox._wakeup = None
+        await asyncio.to_thread(self.transport.close)
+
+    def stats(self):
+        """Delivery counters and outbox status counts, for logging."""
+        return {
+            "sent": self.sent,
+            "retried": self.retried,
+            "dead": self.dead,
+            "batches": self.batches,
+            "connections": self.transport.connections,
+            "outbox": self.outbox.counts(),
+        }
+
+
+_OUTBOX = None
+_SENDER = None
+
+
+def get_email_outbox():
+    """The process's outbox, opened on first use."""
+    global _OUTBOX
+    if _OUTBOX is None:
+        _OUTBOX = EmailOutbox()
+    return _OUTBOX
+
+
+def start_email_sender():
+    """Start the process's sender on the running loop, once."""
+    global _SENDER
+    if _SENDER is None:
+        _SENDER = EmailSender(get_email_outbox()).start()
+    return _SENDER
@@ -2,22 +2,22 @@
 
 from langchain_core.tools import tool
 
-# Employee data
-EMPLOYEE_DATA = {
-    "john doe": {"name": "John Doe", "title": "Senior Developer", "department": "Engineering", "email": "john.doe@brainstation-23.com"},
-    "jane smith": {"name": "Jane Smith", "title": "Project Manager", "department": "Operations", "email": "jane.smith@brainstation-23.com"},
-    "ahmed hassan": {"name": "Ahmed Hassan", "title": "HR Manager", "department": "Human Resources", "email": "ahmed.hassan@brainstation-23.com"},
-    "David Jhonson": {"name": "John Doe", "title": "Senior Developer", "department": "Engineering", "email": "john.doe@brainstation-23.com"},
-}
+from tools.employee_directory import get_employee_directory
+
 
 @tool
 def search_employee(employee_name: str) -> str:
     """Search for employee information by name."""
-    name_lower = employee_name.lower()
-    for name, info in EMPLOYEE_DATA.items():
-        if name in name_lower or any(part in name_lower for part in name.split()):
-            return f"Found: {info['name']}, {info['title']} in {info['department']}"
-    return "Employee not found in our directory."
+    matches = get_employee_directory().search(employee_name, limit=3)
+    if not matches:
+        return "Employee not found in our directory."
+    best = matches[0]
+    if len(matches) == 1 or best.score > matches[1].score:
+        return f"Found: {best.employee.name}, {best.employee.title} in {best.employee.department}"
+    candidates = [match.employee for match in matches if match.score == best.score]
+    return "Several employees match: " + "; ".join(
+        f"{employee.name}, {employee.title} in {employee.department}" for employee in candidates
+    )
 
 # Tool collection
 employee_info_tools = [search_employee]
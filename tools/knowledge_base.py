@@ -0,0 +1,414 @@
+"""Local knowledge base: a BM25 index over static company facts.
+
+Facts that used to be pasted into specialist prompts live as documents in
+``tools/data/knowledge``: Markdown or text files split into one document per
+paragraph under its heading, or JSON Lines files with one ``{"title",
+"text"}`` document per line. Each specialist turn retrieves the top-k
+snippets for the caller's message instead of carrying every fact.
+
+The index persists one segment per source file (its tokenized documents
+plus the file's size and mtime) under ``KNOWLEDGE_INDEX_DIR``. ``refresh``
+stats the sources and re-tokenizes only files that were added or changed.
+Once the index is loaded, a refresh applies those changes to a copy and
+publishes it in one assignment, so ``start_knowledge_refresh`` can run it
+in a worker thread while calls keep searching the previous version.
+
+Files directly in the knowledge directory form the default knowledge base;
+a subdirectory named after an agent config's ``knowledge_base_id`` forms
+that agent's knowledge base.
+
+The default knowledge base also indexes documents generated from
+``COMPANY_DATA`` and ``JOB_DATA``, the data the company and job tools
+answer from, so those facts have a single source; the Markdown files only
+hold what the tools do not cover. The generated documents are re-tokenized
+whenever the data changes and are not persisted.
+"""
+
+import hashlib
+import asyncio
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+from tools.company_tools import COMPANY_DATA
+from tools.job_tools import JOB_DATA
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+KNOWLEDGE_DIR = Path(os.getenv("KNOWLEDGE_DIR", Path(__file__).resolve().parent / "data" / "knowledge"))
+KNOWLEDGE_INDEX_DIR = Path(os.getenv("KNOWLEDGE_INDEX_DIR", Path.home() / ".cache" / "bs23-frontdesk" / "knowledge-index"))
+
+# Snippets injected per specialist turn
+KNOWLEDGE_TOP_K = int(os.getenv("KNOWLEDGE_TOP_K", "3"))
+
+# Snippets scoring below this fraction of the best one are dropped
+MIN_RELATIVE_SCORE = 0.5
+
+# Longest snippet text sent to the model
+MAX_SNIPPET_CHARS = 500
+
+SOURCE_SUFFIXES = (".md", ".txt", ".jsonl")
+
+# Bump when tokenization or segment layout changes so segments are rebuilt
+INDEX_VERSION = 1
+
+# Terms in more than this fraction of documents add little but cost a full
+# postings scan; they only score documents already matched by rarer terms
+COMMON_TERM_FRACTION = 0.02
+MIN_COMMON_TERM_DOCUMENTS = 500
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+STOPWORDS = {
+    "a", "about", "all", "an", "and", "any", "are", "as", "at", "be", "by", "can", "could", "do",
+    "does", "for", "from", "have", "how", "i", "if", "in", "into", "is", "it", "its", "me", "my",
+    "of", "on", "or", "our", "so", "tell", "that", "the", "their", "then", "there", "this", "to",
+    "us", "was", "we", "what", "when", "where", "which", "who", "will", "with", "would", "you", "your",
+}
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Source name of the documents generated from the tools' data
+DATA_SOURCE = "tools:company_data"
+
+# Document titles of the ``COMPANY_DATA`` entries
+COMPANY_DATA_TITLES = {
+    "services": "Services",
+    "location": "Office and contact",
+    "contact": "Office and contact",
+    "hours": "Office and contact",
+}
+
+
+class Snippet(NamedTuple):
+    """A retrieved document."""
+    title: str
+    text: str
+    source: str
+    score: float
+
+
+def tokenize(text):
+    """Lower-cased word tokens without stopwords, plurals folded."""
+    tokens = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def _chunk_text(text):
+    """(title, paragraph) documents from Markdown/plain text."""
+    title = ""
+    for block in re.split(r"\n\s*\n", text):
+        block = block.strip()
+        if not block:
+            continue
+        lines = block.splitlines()
+        while lines and lines[0].startswith("#"):
+            title = lines.pop(0).lstrip("#").strip()
+        if lines:
+            yield title, " ".join(line.strip() for line in lines)
+
+
+def read_documents(path):
+    """(title, text) documents of one source file."""
+    if path.suffix == ".jsonl":
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    yield record.get("title", ""), record["text"]
+    else:
+        yield from _chunk_text(path.read_text(encoding="utf-8"))
+
+
+def company_data_documents():
+    """(title, text) documents generated from ``COMPANY_DATA`` and ``JOB_DATA``."""
+    documents = [(COMPANY_DATA_TITLES.get(key, key.capitalize()), text) for key, text in COMPANY_DATA.items()]
+    documents.extend(
+        ("Open positions", f"{category.capitalize()} positions: {', '.join(jobs)}.") for category, jobs in JOB_DATA.items()
+    )
+    return documents
+
+
+def _tokenized(documents):
+    return [(title, text, dict(Counter(tokenize(f"{title} {text}")))) for title, text in documents]
+
+
+class KnowledgeIndex:
+    """BM25 index over the documents of one knowledge directory.
+
+    ``data_documents`` returns generated (title, text) documents indexed
+    alongside the files, as ``company_data_documents`` does for the default
+    knowledge base.
+    """
+
+    def __init__(self, source_dir, index_dir, data_documents=None):
+        self.source_dir = Path(source_dir)
+        self.index_dir = Path(index_dir)
+        self.data_documents = data_documents
+        self.documents = {}
+        self.postings = {}
+        self.total_length = 0
+        self._norms = {}
+        # What searches read, replaced as a whole by each refresh
+        self._view = (self.documents, self.postings, self._norms)
+        self._segments = {}
+        self._next_id = 0
+        # Incremented whenever the indexed documents change after the first load
+        self.generation = 0
+        self._loaded = False
+        self._refresh_lock = threading.Lock()
+        # On a staged copy: terms whose postings are no longer shared with the published view
+        self._owned_terms = None
+
+    def __len__(self):
+        return len(self.documents)
+
+    def _segment_path(self, source):
+        key = f"{INDEX_VERSION}:{source.resolve()}".encode("utf-8")
+        return self.index_dir / f"{hashlib.sha1(key).hexdigest()}.json"
+
+    def _add(self, source, signature, documents):
+        ids = []
+        for title, text, terms in documents:
+            doc_id = self._next_id
+            self._next_id += 1
+            self.documents[doc_id] = (title, text, str(source), sum(terms.values()))
+            self.total_length += self.documents[doc_id][3]
+            for term, count in terms.items():
+                postings = self._writable_postings(term)
+                if postings is None:
+                    postings = self.postings[term] = {}
+                    if self._owned_terms is not None:
+                        self._owned_terms.add(term)
+                postings[doc_id] = count
+            ids.append(doc_id)
+        self._segments[source] = (signature, ids)
+
+    def _remove(self, source):
+        _, ids = self._segments.pop(source)
+        for doc_id in ids:
+            title, text, _, length = self.documents.pop(doc_id)
+            self.total_length -= length
+            for term in set(tokenize(f"{title} {text}")):
+                postings = self._writable_postings(term)
+                if postings is not None:
+                    postings.pop(doc_id, None)
+                    if not postings:
+                        del self.postings[term]
+
+    def _writable_postings(self, term):
+        postings = self.postings.get(term)
+        if postings is not None and self._owned_terms is not None and term not in self._owned_terms:
+            # Copied on first write, so searches on the published view never see it change
+            postings = self.postings[term] = dict(postings)
+            self._owned_terms.add(term)
+        return postings
+
+    def _load_segment(self, source, signature):
+        """Tokenized documents from the on-disk segment, or ``None`` if stale."""
+        try:
+            with open(self._segment_path(source), encoding="utf-8") as f:
+                segment = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if segment.get("signature") != list(signature):
+            return None
+        return [(title, text, terms) for title, text, terms in segment["documents"]]
+
+    def _build_segment(self, source, signature):
+        documents = _tokenized(read_documents(source))
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            path = self._segment_path(source)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_text(json.dumps({"signature": list(signature), "documents": documents}), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("could not persist knowledge segment for %s: %s", source, e)
+        return documents
+
+    def refresh(self):
+        """Bring the index up to date with the source files.
+
+        Returns the number of source files (re)indexed or removed. Safe to
+        call from a worker thread while the index is being searched.
+        """
+        with self._refresh_lock:
+            sources = {}
+            if self.source_dir.is_dir():
+                for path in self.source_dir.iterdir():
+                    if path.suffix in SOURCE_SUFFIXES and path.is_file():
+                        stat = path.stat()
+                        sources[path] = (stat.st_size, stat.st_mtime_ns)
+            data = self.data_documents() if self.data_documents is not None else None
+            if data:
+                digest = hashlib.sha1(json.dumps(data).encode("utf-8")).hexdigest()
+                sources[DATA_SOURCE] = (digest,)
+
+            removed = [source for source in self._segments if source not in sources]
+            updated = [
+                (source, signature) for source, signature in sources.items()
+                if source not in self._segments or self._segments[source][0] != signature
+            ]
+            if removed or updated:
+                # The first load has no readers yet; later ones build a copy
+                staged = self._copy() if self._loaded else self
+                staged._apply(removed, updated)
+                staged.generation += self._loaded
+                staged._update_norms()
+                if staged is not self:
+                    self._publish(staged)
+                logger.info(
+                    "knowledge index %s: %d files updated, %d documents",
+                    self.source_dir, len(removed) + len(updated), len(self.documents),
+                )
+            self._loaded = True
+            return len(removed) + len(updated)
+
+    def _apply(self, removed, updated):
+        for source in removed:
+            self._remove(source)
+        for source, signature in updated:
+            current = self._segments.get(source)
+            if current is not None:
+                self._remove(source)
+            if source == DATA_SOURCE:
+                documents = _tokenized(self.data_documents())
+            else:
+                documents = self._load_segment(source, signature) if current is None else None
+                if documents is None:
+                    documents = self._build_segment(source, signature)
+            self._add(source, signature, documents)
+
+    def _copy(self):
+        staged = KnowledgeIndex(self.source_dir, self.index_dir, self.data_documents)
+        staged.documents = dict(self.documents)
+        staged.postings = dict(self.postings)
+        staged._owned_terms = set()
+        staged.total_length = self.total_length
+        staged._segments = dict(self._segments)
+        staged._next_id = self._next_id
+        staged.generation = self.generation
+        return staged
+
+    def _publish(self, staged):
+        self.documents = staged.documents
+        self.postings = staged.postings
+        self.total_length = staged.total_length
+        self._norms = staged._norms
+        self._segments = staged._segments
+        self._next_id = staged._next_id
+        # Searches switch over here, after the view is complete
+        self._view = staged._view
+        self.generation = staged.generation
+
+    def _update_norms(self):
+        """Per-document BM25 length normalization, recomputed after each change."""
+        average_length = self.total_length / len(self.documents) if self.documents else 1.0
+        self._norms = {
+            doc_id: K1 * (1 - B + B * length / (average_length or 1.0))
+            for doc_id, (_, _, _, length) in self.documents.items()
+        }
+        self._view = (self.documents, self.postings, self._norms)
+
+    def search(self, query, k=KNOWLEDGE_TOP_K):
+        """Top-``k`` BM25 snippets for ``query``, best first."""
+        documents, index_postings, norms = self._view
+        if not documents:
+            return []
+        count = len(documents)
+        common = max(MIN_COMMON_TERM_DOCUMENTS, count * COMMON_TERM_FRACTION)
+        scores = {}
+        term_postings = sorted(
+            (postings for postings in map(index_postings.get, set(tokenize(query))) if postings), key=len
+        )
+        for postings in term_postings:
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5)) * (K1 + 1)
+            if scores and len(postings) > common:
+                # A common term only re-ranks documents the rarer terms found
+                for doc_id in scores:
+                    frequency = postings.get(doc_id)
+                    if frequency:
+                        scores[doc_id] += idf * frequency / (frequency + norms[doc_id])
+                continue
+            for doc_id, frequency in postings.items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency / (frequency + norms[doc_id])
+        top = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        if not top:
+            return []
+        cutoff = top[0][1] * MIN_RELATIVE_SCORE
+        snippets = []
+        for doc_id, score in top:
+            if score < cutoff:
+                break
+            title, text, source, _ = documents[doc_id]
+            if len(text) > MAX_SNIPPET_CHARS:
+                text = text[:MAX_SNIPPET_CHARS].rsplit(" ", 1)[0] + " ..."
+            snippets.append(Snippet(title, text, source, score))
+        return snippets
+
+
+_INDEXES = {}
+
+
+def get_knowledge_index(knowledge_base_id=None):
+    """Process-wide index of the default knowledge base or of ``knowledge_base_id``."""
+    index = _INDEXES.get(knowledge_base_id)
+    if index is None:
+        if knowledge_base_id:
+            index = KnowledgeIndex(KNOWLEDGE_DIR / str(knowledge_base_id), KNOWLEDGE_INDEX_DIR)
+        else:
+            index = KnowledgeIndex(KNOWLEDGE_DIR, KNOWLEDGE_INDEX_DIR, company_data_documents)
+        _INDEXES[knowledge_base_id] = index
+        index.refresh()
+    return index
+
+
+def refresh_knowledge_indexes():
+    """Pick up edited knowledge files in every index loaded by this process.
+
+    Unchanged files cost one ``stat`` each; an edited file is re-tokenized.
+    Blocking: from the event loop use ``start_knowledge_refresh``.
+    """
+    return sum(index.refresh() for index in list(_INDEXES.values()))
+
+
+_REFRESH = None
+
+
+def start_knowledge_refresh():
+    """Refresh the loaded indexes in a worker thread, unless a refresh is already running.
+
+    Called at the start of every call without waiting: the call searches the
+    current version, and later calls see the edits once they are indexed.
+    """
+    global _REFRESH
+    if _REFRESH is None or _REFRESH.done():
+        _REFRESH = asyncio.ensure_future(asyncio.to_thread(refresh_knowledge_indexes))
+        _REFRESH.add_done_callback(_log_refresh_error)
+    return _REFRESH
+
+
+def _log_refresh_error(future):
+    if not future.cancelled() and future.exception() is not None:
+        logger.warning("knowledge refresh failed: %s", future.exception())
+
+
+def knowledge_generations():
+    """``(knowledge_base_id, generation)`` of every index edited since it was loaded, for cache invalidation."""
+    return tuple((knowledge_base_id, index.generation) for knowledge_base_id, index in _INDEXES.items() if index.generation)
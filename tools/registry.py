@@ -0,0 +1,24 @@
+"""Which tools each specialist can call."""
+
+import os
+
+from tools.communication_tools import communication_tools
+from tools.company_tools import company_info_tools
+from tools.employee_tools import employee_info_tools
+from tools.job_tools import job_opportunity_tools
+
+# Bind tools to the specialists (1/0); off restores prompt-only specialists
+TOOLS_ENABLED = os.getenv("FRONTDESK_TOOLS", "1") == "1"
+
+# Graph node name -> tools bound to its model
+SPECIALIST_TOOLS = {
+    "employee_specialist": employee_info_tools + communication_tools,
+    "company_specialist": company_info_tools,
+    "project_specialist": communication_tools,
+    "job_specialist": job_opportunity_tools + communication_tools,
+    "admin_specialist": communication_tools,
+    "general_receptionist": company_info_tools,
+}
+
+# Every local tool by name, for agent configs that reference tools by name
+LOCAL_TOOLS = {tool.name: tool for tools in SPECIALIST_TOOLS.values() for tool in tools}
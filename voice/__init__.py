@@ -0,0 +1 @@
+# Voice pipeline package for BS23 Frontdesk Agent
@@ -0,0 +1,114 @@
+"""The frontdesk's livekit ``Agent``: how reply text becomes audio.
+
+``FrontdeskAgent.tts_node`` replaces the default text-to-speech node:
+
+- Replies that arrive as one complete text chunk (as cached replies do) are
+  played from ``audio_cache`` once they have repeated often enough
+  (``voice.audio_cache``).
+- Everything else goes through the sentence chunker
+  (``voice.text_chunker``). Each segment is pushed to the session's
+  streaming TTS and flushed on its own, and the time to each segment's first
+  audio frame is recorded in ``tts_latency`` and, with tracing on, as a
+  ``tts_segment`` span.
+"""
+
+import asyncio
+import time
+
+from livekit.agents import Agent
+
+from subagents.tracing import record_span, tracing_enabled
+from voice.audio_cache import MAX_CACHED_TEXT_CHARS
+from voice.text_chunker import SegmentLatency, chunk_text
+
+
+class FrontdeskAgent(Agent):
+    """Agent whose ``tts_node`` chunks replies for TTS and replays repeated ones from ``audio_cache``."""
+
+    def __init__(self, *, audio_cache=None, session_tts=None, flush_policy=None, **kwargs):
+        super().__init__(**kwargs)
+        self.audio_cache = audio_cache
+        self.session_tts = session_tts
+        self.flush_policy = flush_policy
+        self.tts_latency = SegmentLatency()
+
+    async def tts_node(self, text, model_settings):
+        if self.audio_cache is None or self.session_tts is None:
+            async for frame in self._synthesize(text, model_settings):
+                yield frame
+            return
+
+        chunks = aiter(text)
+        first = await anext(chunks, None)
+        if first is None:
+            return
+        pending = [first]
+        entry = self.audio_cache.get(first, self.session_tts)
+        if entry is not None:
+            # Cached replies arrive whole; anything longer streams through TTS
+            second = await anext(chunks, None)
+            if second is None:
+                async for frame in self.audio_cache.frames(entry):
+                    yield frame
+                return
+            pending.append(second)
+
+        single_chunk = len(pending) == 1 and len(first) <= MAX_CACHED_TEXT_CHARS
+
+        async def text_stream():
+            nonlocal single_chunk
+            for chunk in pending:
+                yield chunk
+            async for chunk in chunks:
+                single_chunk = False
+                yield chunk
+
+        frames = []
+        async for frame in self._synthesize(text_stream(), model_settings):
+            if single_chunk:
+                frames.append(frame)
+            elif frames:
+                frames.clear()
+            yield frame
+        if single_chunk:
+            self.audio_cache.record(first, self.session_tts, frames)
+
+    async def _synthesize(self, text, model_settings):
+        """Audio of streamed reply text, one TTS flush per chunker segment."""
+        tts = self.session_tts
+        if tts is None or not tts.capabilities.streaming:
+            # Non-streaming TTS is wrapped in a sentence adapter by the default node
+            async for frame in Agent.default.tts_node(self, chunk_text(text, self.flush_policy), model_settings):
+                yield frame
+            return
+
+        flushed = []
+        async with tts.stream() as stream:
+            async def forward():
+                async for segment in chunk_text(text, self.flush_policy):
+                    stream.push_text(segment)
+                    stream.flush()
+                    flushed.append(time.perf_counter())
+                stream.end_input()
+
+            forward_task = asyncio.create_task(forward())
+            try:
+                index, waiting, previous_done = 0, True, None
+                async for event in stream:
+                    if waiting and index < len(flushed):
+                        # TTS works through segments in order: a segment can't
+                        # start before it is flushed or before the previous one ends
+                        started = max(flushed[index], previous_done or flushed[index])
+                        latency = time.perf_counter() - started
+                        self.tts_latency.record(index, latency)
+                        if tracing_enabled():
+                            record_span("tts_segment", time.time_ns() - int(latency * 1e9), {
+                                "frontdesk.segment": index, "frontdesk.first_audio_ms": round(latency * 1000, 1),
+                            })
+                        waiting = False
+                    if event.is_final:
+                        index, waiting, previous_done = index + 1, True, time.perf_counter()
+                    yield event.frame
+            finally:
+                forward_task.cancel()
+                await asyncio.gather(forward_task, return_exceptions=True)
@@ -0,0 +1,183 @@
+"""On-disk cache of synthesized speech for fixed and repeated phrases.
+
+The welcome message never changes, and replies served from the response
+cache (``subagents.response_cache``) repeat word for word, yet each one used
+to go through TTS on every call. This cache stores the synthesized audio
+once per text and voice, keyed by ``(text, provider, model, sample rate,
+channels)``. It plays the audio back from a memory-mapped file in 20 ms
+frames.
+
+Entries are mono or stereo 16-bit PCM WAV files written atomically under
+``AUDIO_CACHE_DIR``. Playback maps the file and copies one frame at a time,
+so a long phrase is never loaded whole.
+
+The keys on disk are listed once when the cache is created (in prewarm)
+and kept in memory with the ones this process stores, so a lookup for an
+unknown reply, the common case, never touches the disk. A phrase another
+worker process stores later is synthesized once more here and then stored
+again.
+
+Two ways in:
+
+- ``TTSAudioCache.synthesize`` for known phrases such as the greeting:
+  cached audio if present, otherwise TTS with the frames stored as they
+  stream out.
+- ``FrontdeskAgent.tts_node`` (``voice.agent``) for replies: a reply that
+  arrives as one complete text chunk (as cached replies do) and has been
+  synthesized ``AUDIO_CACHE_MIN_REPEATS`` times is stored, and later plays
+  without TTS. Streamed LLM replies pass through untouched.
+"""
+
+import hashlib
+import logging
+import mmap
+import os
+import time
+import wave
+from collections import Counter
+from pathlib import Path
+
+from livekit import rtc
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+AUDIO_CACHE_ENABLED = os.getenv("FRONTDESK_AUDIO_CACHE", "1") == "1"
+AUDIO_CACHE_DIR = Path(os.getenv("FRONTDESK_AUDIO_CACHE_DIR", Path.home() / ".cache" / "bs23-frontdesk" / "tts-audio"))
+
+# Single-chunk replies are stored once synthesized this many times
+AUDIO_CACHE_MIN_REPEATS = int(os.getenv("FRONTDESK_AUDIO_CACHE_MIN_REPEATS", "2"))
+
+# Longer replies are never stored
+MAX_CACHED_TEXT_CHARS = 600
+
+FRAME_MS = 20
+
+# Size of the header written by the wave module for 16-bit PCM
+WAV_HEADER_BYTES = 44
+
+
+def audio_key(text, tts):
+    """Cache key of ``text`` spoken by ``tts``."""
+    identity = f"{tts.provider}\0{tts.model}\0{tts.sample_rate}\0{tts.num_channels}\0{text.strip()}"
+    return hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class CachedAudio:
+    """One stored phrase."""
+
+    def __init__(self, path, sample_rate, num_channels, duration):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.num_channels = num_channels
+        self.duration = duration
+
+
+class TTSAudioCache:
+    """Synthesized phrases on disk, played back memory-mapped."""
+
+    def __init__(self, cache_dir=AUDIO_CACHE_DIR, min_repeats=AUDIO_CACHE_MIN_REPEATS):
+        self.cache_dir = Path(cache_dir)
+        self.min_repeats = min_repeats
+        self._entries = {}
+        self._keys = self._scan()
+        self._syntheses = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.played_seconds = 0.0
+
+    def _scan(self):
+        """Keys of the phrases stored in ``cache_dir``."""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                return {entry.name[:-4] for entry in entries if entry.name.endswith(".wav")}
+        except OSError:
+            return set()
+
+    def get(self, text, tts):
+        """Stored audio of ``text`` in the voice of ``tts``, or ``None``; only known keys touch the disk."""
+        key = audio_key(text, tts)
+        entry = self._entries.get(key)
+        if entry is None:
+            if key not in self._keys:
+                return None
+            path = self.cache_dir / f"{key}.wav"
+            try:
+                with wave.open(str(path), "rb") as f:
+                    entry = CachedAudio(path, f.getframerate(), f.getnchannels(), f.getnframes() / f.getframerate())
+            except (OSError, EOFError, wave.Error):
+                # Removed or unreadable: not looked up again until stored anew
+                self._keys.discard(key)
+                return None
+            self._entries[key] = entry
+        return entry
+
+    async def frames(self, entry):
+        """Yield ``FRAME_MS`` frames of a stored phrase from a memory-mapped file."""
+        self.hits += 1
+        self.played_seconds += entry.duration
+        samples_per_frame = entry.sample_rate * FRAME_MS // 1000
+        step = samples_per_frame * entry.num_channels * 2
+        with open(entry.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for offset in range(WAV_HEADER_BYTES, len(data), step):
+                chunk = data[offset:offset + step]
+                yield rtc.AudioFrame(chunk, entry.sample_rate, entry.num_channels, len(chunk) // (2 * entry.num_channels))
+
+    def store(self, text, tts, frames):
+        """Write synthesized ``frames`` of ``text``; concurrent writers never leave a partial file."""
+        if not frames:
+            return
+        key = audio_key(text, tts)
+        path = self.cache_dir / f"{key}.wav"
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with wave.open(str(tmp_path), "wb") as f:
+                f.setnchannels(frames[0].num_channels)
+                f.setsampwidth(2)
+                f.setframerate(frames[0].sample_rate)
+                for frame in frames:
+                    f.writeframes(bytes(frame.data.cast("B")))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("could not store TTS audio %s: %s", path, e)
+            return
+        self._entries.pop(key, None)
+        self._keys.add(key)
+        self.stores += 1
+
+    def record(self, text, tts, frames):
+        """Count one synthesis of ``text``; store it once it has repeated often enough."""
+        key = audio_key(text, tts)
+        self._syntheses[key] += 1
+        if self._syntheses[key] >= self.min_repeats:
+            self.store(text, tts, frames)
+            del self._syntheses[key]
+
+    async def synthesize(self, text, tts):
+        """Audio frames of a fixed phrase: from the cache, or from TTS and then stored."""
+        entry = self.get(text, tts)
+        if entry is not None:
+            async for frame in self.frames(entry):
+                yield frame
+            return
+
+        self.misses += 1
+        started = time.perf_counter()
+        frames = []
+        async with tts.synthesize(text) as stream:
+            async for event in stream:
+                frames.append(event.frame)
+                yield event.frame
+        logger.debug("synthesized %r in %.0f ms", text[:40], (time.perf_counter() - started) * 1000)
+        self.store(text, tts, frames)
+
+    def stats(self):
+        """Hits, misses and audio served from disk, for logging."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "played_s": round(self.played_seconds, 1),
+        }
+
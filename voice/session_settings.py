@@ -0,0 +1,90 @@
+"""Turn-taking settings from an agent config, applied to the voice session.
+
+Agent configs carry their persona's endpointing and interruption settings:
+
+- ``wait_time_before_detecting_end_of_speech``: silence (s) after the
+  caller stops before their turn counts as finished. The silence is split
+  between the VAD's end-of-speech detection and the session's endpointing
+  delay. Their sum is the configured wait; a caller who resumes before it
+  elapses keeps the turn.
+- ``enable_user_interruptions``, ``minimum_speech_duration_for_interruptions``
+  and ``minimum_words_before_interruption``: whether, and after how much
+  caller speech, the agent stops talking.
+
+Settings a config leaves out keep the session defaults. VADs are shared per
+process, one per distinct silence setting; each load builds an ONNX session
+(~70 ms), so it happens once per setting rather than per call, in prewarm
+for the process's own agent and in a worker thread (``aget_vad``) for a
+persona whose setting is new.
+"""
+
+import asyncio
+
+from livekit.plugins import silero
+
+# Silero's default end-of-speech silence
+DEFAULT_VAD_MIN_SILENCE = 0.55
+
+# Share of the configured wait spent in the VAD; the rest is endpointing delay
+VAD_SILENCE_SHARE = 0.5
+
+# Session default for how long a possibly unfinished turn may wait
+DEFAULT_MAX_ENDPOINTING_DELAY = 3.0
+
+
+def endpointing_split(wait_time):
+    """``(vad_min_silence, min_endpointing_delay)`` adding up to ``wait_time``."""
+    vad_silence = min(DEFAULT_VAD_MIN_SILENCE, wait_time * VAD_SILENCE_SHARE)
+    return round(vad_silence, 3), round(wait_time - vad_silence, 3)
+
+
+def vad_options(settings):
+    """``silero.VAD.load`` keyword arguments for a config's session settings."""
+    wait_time = (settings or {}).get("wait_time_before_detecting_end_of_speech")
+    if wait_time is None:
+        return {}
+    return {"min_silence_duration": endpointing_split(wait_time)[0]}
+
+
+def turn_handling_options(settings, turn_detection=None):
+    """``AgentSession(turn_handling=...)`` for a config's session settings."""
+    settings = settings or {}
+    options = {}
+    if turn_detection is not None:
+        options["turn_detection"] = turn_detection
+
+    wait_time = settings.get("wait_time_before_detecting_end_of_speech")
+    if wait_time is not None:
+        min_delay = endpointing_split(wait_time)[1]
+        options["endpointing"] = {"min_delay": min_delay, "max_delay": max(DEFAULT_MAX_ENDPOINTING_DELAY, min_delay)}
+
+    interruption = {}
+    if settings.get("enable_user_interruptions") is not None:
+        interruption["enabled"] = bool(settings["enable_user_interruptions"])
+    if settings.get("minimum_speech_duration_for_interruptions") is not None:
+        interruption["min_duration"] = float(settings["minimum_speech_duration_for_interruptions"])
+    if settings.get("minimum_words_before_interruption") is not None:
+        interruption["min_words"] = int(settings["minimum_words_before_interruption"])
+    if interruption:
+        options["interruption"] = interruption
+    return options
+
+
+def get_vad(proc, settings=None):
+    """Process-wide VAD for a config's session settings."""
+    options = vad_options(settings)
+    key = tuple(sorted(options.items()))
+    vads = proc.userdata.setdefault("vads", {})
+    if key not in vads:
+        vads[key] = silero.VAD.load(**options)
+    return vads[key]
+
+
+async def aget_vad(proc, settings=None):
+    """``get_vad`` for the event loop: a VAD not loaded yet is loaded in a worker thread."""
+    options = vad_options(settings)
+    vads = proc.userdata.setdefault("vads", {})
+    vad = vads.get(tuple(sorted(options.items())))
+    if vad is None:
+        vad = await asyncio.to_thread(get_vad, proc, settings)
+    return vad
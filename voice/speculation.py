@@ -0,0 +1,197 @@
+"""Speculative intent analysis on interim STT transcripts.
+
+The graph used to start only once the turn detector decided the caller had
+finished, so ``intent_analyzer`` (an LLM call whenever the local router is
+unsure) sat on the critical path after the endpointing delay. Deepgram emits
+interim transcripts well before that point. ``TurnSpeculator`` watches them
+and runs the graph's own ``intent_analyzer`` node in the background as soon
+as a transcript is stable: a final segment, or an interim unchanged for
+``SPECULATION_STABLE_SECONDS`` (the caller paused). When the turn's graph run reaches
+``intent_analyzer``, a speculation for the same utterance (compared after
+``normalize_utterance``) supplies the intent; anything else runs as before.
+
+A newer stable transcript restarts speculation; stable interims do so at
+most ``SPECULATION_MAX_PER_TURN`` times a turn. Superseded runs are left to
+finish, since the classifier call is a few output tokens, so their usage can
+be counted as wasted.
+
+``FRONTDESK_SPECULATION`` selects the mode:
+
+- ``off``: no speculative intent analysis; the session's preemptive
+  generation stays at livekit-agents' default (currently on).
+- ``intent`` (default): speculative intent analysis only. Preemptive
+  generation is turned off, so no specialist runs before the end of turn.
+- ``full``: speculative intent analysis plus preemptive generation, which
+  runs the whole graph, specialist included, on final transcripts before
+  the end of turn and discards the run if the committed transcript
+  differs. Each discarded run shows up as an extra graph run per turn; its
+  tokens are not counted because a cancelled stream never reports usage.
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+from langchain_core.callbacks import get_usage_metadata_callback
+from langchain_core.messages import HumanMessage
+
+from subagents.response_cache import normalize_utterance
+
+logger = logging.getLogger("bs23-frontdesk-agent")
+
+SPECULATION_MODE = os.getenv("FRONTDESK_SPECULATION", "intent")
+
+# How long an interim transcript must stay unchanged to count as stable
+SPECULATION_STABLE_SECONDS = float(os.getenv("FRONTDESK_SPECULATION_STABLE_MS", "300")) / 1000
+
+# Speculative runs per caller turn; each costs a classifier prompt
+SPECULATION_MAX_PER_TURN = int(os.getenv("FRONTDESK_SPECULATION_MAX_PER_TURN", "3"))
+
+
+class Speculation:
+    """One background ``intent_analyzer`` run."""
+
+    def __init__(self, text):
+        self.text = text
+        self.task = None
+        self.started = time.perf_counter()
+        self.finished = None
+        self.used = False
+
+
+class TurnSpeculator:
+    """Per-call speculative intent analysis fed by STT transcript events."""
+
+    def __init__(self, graph, stable_seconds=SPECULATION_STABLE_SECONDS, max_per_turn=SPECULATION_MAX_PER_TURN):
+        nodes = graph.builder.nodes
+        # Single-pass graphs classify and answer in one call: nothing to speculate on
+        self.intent_node = nodes["intent_analyzer"].runnable if "intent_analyzer" in nodes else None
+        self.stable_seconds = stable_seconds
+        self.max_per_turn = max_per_turn
+        self._finals = []
+        self._stable_timer = None
+        self._speculations = {}
+        self._turn_ended = False
+        self.turns = 0
+        self.graph_runs = 0
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self.wasted_tokens = 0
+        self.saved_seconds = 0.0
+
+    def on_transcript(self, text, is_final):
+        """Feed one STT transcript event of the caller's current turn."""
+        if self.intent_node is None:
+            return
+        if self._turn_ended:
+            self._discard()
+        self._cancel_timer()
+        if is_final:
+            self._finals.append(text)
+            self._speculate(" ".join(self._finals), final=True)
+        else:
+            candidate = " ".join([*self._finals, text])
+            self._stable_timer = asyncio.get_running_loop().call_later(self.stable_seconds, self._speculate, candidate)
+
+    def end_turn(self):
+        """The caller's turn was committed; the next transcript starts a new one."""
+        self.turns += 1
+        self._finals = []
+        self._cancel_timer()
+        self._turn_ended = True
+
+    def _cancel_timer(self):
+        if self._stable_timer is not None:
+            self._stable_timer.cancel()
+            self._stable_timer = None
+
+    def _speculate(self, text, final=False):
+        self._stable_timer = None
+        key = normalize_utterance(text)
+        if not key or key in self._speculations:
+            return
+        # Final segments always speculate: they are what the turn usually commits
+        if not final and len(self._speculations) >= self.max_per_turn:
+            return
+        self.started += 1
+        speculation = self._speculations[key] = Speculation(text)
+        speculation.task = asyncio.create_task(self._classify(speculation))
+
+    async def _classify(self, speculation):
+        with get_usage_metadata_callback() as usage:
+            result = await self.intent_node.ainvoke({"messages": [HumanMessage(content=speculation.text)]}, {})
+        speculation.finished = time.perf_counter()
+        return result["intent"], sum(tokens.get("total_tokens", 0) for tokens in usage.usage_metadata.values())
+
+    def _discard(self):
+        """Count the previous turn's unused speculations as wasted."""
+        for speculation in self._speculations.values():
+            if not speculation.used:
+                self.wasted += 1
+                speculation.task.add_done_callback(self._count_wasted)
+        self._speculations = {}
+        self._turn_ended = False
+
+    def _count_wasted(self, task):
+        if not task.cancelled() and task.exception() is None:
+            self.wasted_tokens += task.result()[1]
+
+    async def resolve(self, state, run):
+        """``intent_analyzer`` result for this turn, from a matching speculation when there is one."""
+        self.graph_runs += 1
+        messages = state["messages"]
+        speculation = self._speculations.get(normalize_utterance(messages[-1].content if messages else ""))
+        if speculation is None:
+            self.misses += 1
+            return await run()
+
+        waited = time.perf_counter()
+        try:
+            intent, _ = await speculation.task
+        except Exception as e:
+            logger.warning("speculative intent analysis failed, running it again: %s", e)
+            self.misses += 1
+            return await run()
+        self.hits += 1
+        speculation.used = True
+        # Classifier time that ran before the turn needed it
+        self.saved_seconds += min(waited, speculation.finished) - speculation.started
+        return {"messages": messages, "intent": intent}
+
+    async def aclose(self):
+        self._cancel_timer()
+        tasks = [speculation.task for speculation in self._speculations.values()]
+        self._discard()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        """Hit rate, wasted runs and tokens, for logging."""
+        return {
+            "turns": self.turns,
+            "graph_runs": self.graph_runs,
+            "speculations": self.started,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / (self.hits + self.misses), 2) if self.hits + self.misses else 0.0,
+            "wasted": self.wasted,
+            "wasted_tokens": self.wasted_tokens,
+            "saved_s": round(self.saved_seconds, 2),
+        }
+
+
+async def speculated_intent(config, state, run):
+    """Run ``intent_analyzer`` through the call's speculator, if the run config carries one."""
+    speculator = config.get("configurable", {}).get("speculator")
+    if speculator is None:
+        return await run()
+    return await speculator.resolve(state, run)
+
+
+def preemptive_generation_options(mode=SPECULATION_MODE):
+    """``turn_handling["preemptive_generation"]`` for a speculation mode; empty keeps livekit's default."""
+    if mode == "off":
+        return {}
+    return {"enabled": mode == "full"}
@@ -0,0 +1,233 @@
+"""Segmentation of streamed reply text into TTS requests.
+
+Deepgram's streaming TTS buffers text until the stream is flushed, so a
+reply pushed as one stream used to be spoken only after the LLM had
+finished the whole paragraph. The chunker sits between the graph's text
+stream and TTS and decides where to flush:
+
+- The first segment is flushed early, at the first clause break (``,``,
+  ``;``, ``:`` or a sentence end) after ``min_clause_words`` words, or after
+  ``first_flush_words`` words at the latest, so audio starts while the LLM
+  is still writing.
+- Later sentences are batched until ``batch_chars`` characters have
+  accumulated and flushed at a sentence end. Fewer, longer requests keep
+  the intonation of whole sentences. The batch is flushed sooner, at the
+  next sentence or clause end, when the audio already flushed (estimated at
+  ``SPEECH_SECONDS_PER_CHAR``) would finish playing within
+  ``min_lead_seconds``, so playback does not stall waiting for text.
+
+Markdown the prompts forbid (emphasis, headings, bullets, code ticks, links)
+is stripped from the incoming stream, before segmenting, so it never
+reaches TTS, where it would be read out or garble the prosody. List and
+heading markers are only recognized at the start of a real line, so "Brain
+Station 23. We open..." keeps its number however the reply is cut, and
+``#`` inside a word ("C#") stays.
+"""
+
+import os
+import re
+import time
+
+TTS_FIRST_FLUSH_WORDS = int(os.getenv("FRONTDESK_TTS_FIRST_FLUSH_WORDS", "8"))
+TTS_MIN_CLAUSE_WORDS = int(os.getenv("FRONTDESK_TTS_MIN_CLAUSE_WORDS", "1"))
+TTS_BATCH_CHARS = int(os.getenv("FRONTDESK_TTS_BATCH_CHARS", "200"))
+TTS_MIN_LEAD_SECONDS = float(os.getenv("FRONTDESK_TTS_MIN_LEAD_MS", "1500")) / 1000
+
+# Speaking time per character of text, about 15 characters a second
+SPEECH_SECONDS_PER_CHAR = 0.065
+
+# Clause or sentence punctuation followed by whitespace
+CLAUSE_BREAK = re.compile(r"[,;:.!?](?=\s)")
+SENTENCE_BREAK = re.compile(r"[.!?](?=\s)")
+
+MARKDOWN_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+# A heading, bullet, numbered-list or quote marker at the start of a line
+LINE_MARKUP = re.compile(r"[ \t]*(?:#{1,6}[ \t]+|[-*+][ \t]+|\d+[.)][ \t]+|>[ \t]*)")
+# Emphasis, code ticks, strike-through, and ``#`` that does not follow a word character
+INLINE_MARKUP = re.compile(r"[*`~]+|__+|(?<![\w#])#+")
+
+# Longest line start held back to see whether it is a list or heading marker
+MAX_LINE_MARKER_CHARS = 12
+# Longest unfinished ``[label](url)`` held back waiting for its end
+MAX_LINK_CHARS = 300
+
+
+class MarkdownFilter:
+    """Strips markdown from streamed text, line by line, as it arrives.
+
+    Text is passed on as soon as it cannot be part of markup: a line's
+    start until its marker (if any) is known, and an open link until it
+    closes, are held back.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._line_start = True
+        # Last character passed on, for ``#`` after a word split across chunks
+        self._previous = "\n"
+
+    def push(self, text):
+        """Add streamed text; return the part that is ready, markup removed."""
+        self._pending += text
+        return self._drain(final=False)
+
+    def flush(self):
+        """The rest of the text, once the stream ends."""
+        return self._drain(final=True)
+
+    def _drain(self, final):
+        out = []
+        while self._pending:
+            if self._line_start:
+                prefix = self._pending.lstrip(" \t")
+                decided = (
+                    final or "\n" in self._pending or len(self._pending) >= MAX_LINE_MARKER_CHARS
+                    or re.match(r"\S+\s", prefix) is not None
+                )
+                if not decided:
+                    break
+                marker = LINE_MARKUP.match(self._pending)
+                if marker:
+                    self._pending = self._pending[marker.end():]
+                self._line_start = False
+                continue
+            newline = self._pending.find("\n")
+            end = newline + 1 if newline >= 0 else len(self._pending)
+            if newline < 0 and not final:
+                end = self._hold_back(self._pending)
+                if end == 0:
+                    break
+            out.append(self._inline(self._pending[:end]))
+            self._pending = self._pending[end:]
+            self._line_start = newline >= 0 and end == newline + 1
+        return "".join(out)
+
+    @staticmethod
+    def _hold_back(text):
+        """How much of an unterminated line can go out without splitting markup."""
+        end = len(text)
+        opening = text.rfind("[")
+        if opening >= 0 and not MARKDOWN_LINK.search(text, opening) and len(text) - opening <= MAX_LINK_CHARS:
+            end = opening
+        # "_" may become "__", and "#" may follow
+        while end and text[end - 1] in "_":
+            end -= 1
+        return end
+
+    def _inline(self, text):
+        if not text:
+            return ""
+        text = MARKDOWN_LINK.sub(r"\1", text)
+        text = INLINE_MARKUP.sub("", self._previous + text)[1:] if self._previous != "#" else INLINE_MARKUP.sub("", text)
+        self._previous = text[-1] if text else self._previous
+        return text
+
+
+def strip_formatting(text):
+    """``text`` without markdown: links keep their label, markup characters go."""
+    markdown = MarkdownFilter()
+    return markdown.push(text) + markdown.flush()
+
+
+class FlushPolicy:
+    """Where the chunker cuts the reply into TTS requests."""
+
+    def __init__(self, first_flush_words=TTS_FIRST_FLUSH_WORDS, min_clause_words=TTS_MIN_CLAUSE_WORDS,
+                 batch_chars=TTS_BATCH_CHARS, min_lead_seconds=TTS_MIN_LEAD_SECONDS):
+        self.first_flush_words = first_flush_words
+        self.min_clause_words = min_clause_words
+        self.batch_chars = batch_chars
+        self.min_lead_seconds = min_lead_seconds
+
+
+class SentenceChunker:
+    """Incremental segmentation of one reply."""
+
+    def __init__(self, policy=None):
+        self.policy = policy or FlushPolicy()
+        self._buffer = ""
+        self._first = True
+        # When the audio flushed so far is expected to finish playing
+        self._audio_ends = None
+
+    def push(self, text):
+        """Add streamed text; return the segments ready to flush."""
+        self._buffer += text
+        segments = []
+        while (cut := self._cut()) is not None:
+            segment, self._buffer = self._buffer[:cut].strip(), self._buffer[cut:]
+            self._first = False
+            if segment:
+                segments.append(segment)
+                self._audio_ends = max(self._audio_ends or 0.0, time.monotonic()) + len(segment) * SPEECH_SECONDS_PER_CHAR
+        return segments
+
+    def flush(self):
+        """The rest of the reply, once the text stream ends."""
+        segment, self._buffer = self._buffer.strip(), ""
+        return segment
+
+    def _cut(self):
+        if self._first:
+            for match in CLAUSE_BREAK.finditer(self._buffer):
+                if len(self._buffer[:match.end()].split()) >= self.policy.min_clause_words:
+                    return match.end()
+            words = list(re.finditer(r"\S+\s", self._buffer))
+            if len(words) >= self.policy.first_flush_words:
+                return words[self.policy.first_flush_words - 1].end()
+            return None
+        ends = [match.end() for match in SENTENCE_BREAK.finditer(self._buffer)]
+        if len(self._buffer) >= self.policy.batch_chars and ends:
+            return ends[-1]
+        if self._audio_ends is not None and self._audio_ends - time.monotonic() < self.policy.min_lead_seconds:
+            # Playback is about to run dry: flush what is complete
+            clauses = [match.end() for match in CLAUSE_BREAK.finditer(self._buffer)]
+            return (ends or clauses or [None])[-1]
+        return None
+
+
+async def chunk_text(text, policy=None):
+    """Yield TTS segments of a streamed reply, markdown stripped before segmenting."""
+    markdown = MarkdownFilter()
+    chunker = SentenceChunker(policy)
+    async for chunk in text:
+        for segment in chunker.push(markdown.push(chunk)):
+            yield segment
+    for segment in chunker.push(markdown.flush()):
+        yield segment
+    if segment := chunker.flush():
+        yield segment
+
+
+class SegmentLatency:
+    """Time from flushing a segment to its first audio frame, first segments and later ones apart."""
+
+    def __init__(self):
+        self.replies = 0
+        self.segments = 0
+        self.first_total = 0.0
+        self.first_max = 0.0
+        self.later_total = 0.0
+        self.later_max = 0.0
+
+    def record(self, index, seconds):
+        self.segments += 1
+        if index == 0:
+            self.replies += 1
+            self.first_total += seconds
+            self.first_max = max(self.first_max, seconds)
+        else:
+            self.later_total += seconds
+            self.later_max = max(self.later_max, seconds)
+
+    def stats(self):
+        """Segments per reply and TTS latency, for logging."""
+        later = self.segments - self.replies
+        return {
+            "replies": self.replies,
+            "segments_per_reply": round(self.segments / self.replies, 1) if self.replies else 0.0,
+            "first_avg_ms": round(self.first_total / self.replies * 1000) if self.replies else None,
+            "first_max_ms": round(self.first_max * 1000),
+            "later_avg_ms": round(self.later_total / later * 1000) if later else None,
+            "later_max_ms": round(self.later_max * 1000),
+        }